@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of labfloat's slotted layout and trusted constructor.
+
+Compares the public constructor with labfloat._new, the arithmetic methods with the
+same calculation done through the public constructor (as the operators used to do),
+and the memory of a slotted labfloat with an object carrying an instance __dict__.
+
+Run from the repository root with:
+    python -m benchmarks.bench_slots
+"""
+import timeit
+import tracemalloc
+
+from labfis import labfloat
+
+N = 100000
+
+
+class dictfloat:
+    """labfloat's previous memory layout, with an instance __dict__."""
+
+    def __init__(self, mean, uncertainty):
+        self._mean = mean
+        self._uncertainty = abs(uncertainty)
+
+
+def per_op(stmt, setup_globals, number=N):
+    return (
+        min(timeit.repeat(stmt, globals=setup_globals, number=number, repeat=5))
+        / number
+    )
+
+
+def per_object(factory, number=N):
+    tracemalloc.start()
+    objs = [factory(float(i), 0.5) for i in range(number)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size / number
+
+
+def main():
+    a, b = labfloat(1.5, 0.1), labfloat(2.5, 0.2)
+    env = {"labfloat": labfloat, "a": a, "b": b}
+
+    rows = [
+        ("labfloat(m, u)", per_op("labfloat(1.5, 0.1)", env)),
+        ("labfloat._new(m, u)", per_op("labfloat._new(1.5, 0.1)", env)),
+        (
+            "a + b (public constructor)",
+            per_op(
+                "labfloat(a.mean + b.mean, (a.uncertainty ** 2 + b.uncertainty ** 2) ** 0.5)",
+                env,
+            ),
+        ),
+        ("a + b", per_op("a + b", env)),
+        ("a * b", per_op("a * b", env)),
+        ("a / b", per_op("a / b", env)),
+        ("a ** 2", per_op("a ** 2", env)),
+        ("a.sin()", per_op("a.sin()", env)),
+    ]
+    for name, t in rows:
+        print("{:<32}{:>10.1f} ns/op".format(name, t * 1e9))
+
+    print("{:<32}{:>10.1f} B/object".format("__dict__ layout", per_object(dictfloat)))
+    print("{:<32}{:>10.1f} B/object".format("labfloat", per_object(labfloat._new)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""Benchmark suite of labfis' hot paths.
+
+Each scenario times a scalar operation or a bulk workload (10^6 additions, 10^5
+strings, 10^6 pairs converted to labfloats, ...) and reports the best time per
+element over some repeats. The results can be saved as JSON and compared against a
+saved baseline, failing when a scenario got slower than the allowed ratio.
+
+Run from the repository root with:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 1.25
+    python -m benchmarks.suite --scale 0.1 --filter round
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+
+import numpy as np
+
+import labfis
+from labfis import labfloat, labarray, u
+
+SCENARIOS = {}
+"""dict: Scenarios by name, functions of the scale returning (workload, elements)."""
+
+
+def scenario(name):
+    def register(setup):
+        SCENARIOS[name] = setup
+        return setup
+
+    return register
+
+
+def _pairs(n):
+    rng = random.Random(0)
+    means = [rng.uniform(-100, 100) for _ in range(n)]
+    errors = [rng.uniform(0.001, 1) for _ in range(n)]
+    return means, errors
+
+
+@scenario("construct.scalar")
+def _construct_scalar(scale):
+    n = int(1000000 * scale)
+    means, errors = _pairs(n)
+
+    def run():
+        for m, e in zip(means, errors):
+            labfloat(m, e)
+
+    return run, n
+
+
+@scenario("construct.list")
+def _construct_list(scale):
+    n = int(1000000 * scale)
+    means, errors = _pairs(n)
+    return lambda: labfloat.list([means, errors]), n
+
+
+@scenario("construct.labarray")
+def _construct_labarray(scale):
+    n = int(1000000 * scale)
+    means, errors = _pairs(n)
+    return lambda: labarray(means, errors), n
+
+
+@scenario("construct.infix")
+def _construct_infix(scale):
+    n = int(100000 * scale)
+    means, errors = _pairs(n)
+
+    def run():
+        for m, e in zip(means, errors):
+            m | u | e
+
+    return run, n
+
+
+@scenario("arithmetic.add")
+def _arithmetic_add(scale):
+    n = int(1000000 * scale)
+    a, b = labfloat(1.5, 0.1), labfloat(2.5, 0.2)
+
+    def run():
+        for _ in range(n):
+            a + b
+
+    return run, n
+
+
+@scenario("arithmetic.mixed")
+def _arithmetic_mixed(scale):
+    n = int(100000 * scale)
+    a, b = labfloat(1.5, 0.1), labfloat(2.5, 0.2)
+
+    def run():
+        for _ in range(n):
+            (a * b - 2) / (a ** 2 + b)
+
+    return run, n
+
+
+@scenario("arithmetic.sum")
+def _arithmetic_sum(scale):
+    n = int(1000000 * scale)
+    values = labfloat.list(list(_pairs(n)))
+    return lambda: sum(values), n
+
+
+@scenario("arithmetic.labarray")
+def _arithmetic_labarray(scale):
+    n = int(1000000 * scale)
+    a = labarray(*_pairs(n))
+    b = labfloat(2.5, 0.2)
+    return lambda: (a * b - 2) / (a ** 2 + b), n
+
+
+@scenario("function.sin")
+def _function_sin(scale):
+    n = int(100000 * scale)
+    a = labfloat(0.5, 0.01)
+
+    def run():
+        for _ in range(n):
+            a.sin()
+
+    return run, n
+
+
+@scenario("round")
+def _round(scale):
+    n = int(100000 * scale)
+    values = labfloat.list(list(_pairs(n)))
+
+    def run():
+        for x in values:
+            round(x)
+
+    return run, n
+
+
+@scenario("format.split")
+def _format_split(scale):
+    n = int(100000 * scale)
+    values = labfloat.list(list(_pairs(n)))
+
+    def run():
+        for x in values:
+            x.split()
+
+    return run, n
+
+
+@scenario("format.str")
+def _format_str(scale):
+    n = int(100000 * scale)
+    values = labfloat.list(list(_pairs(n)))
+
+    def run():
+        for x in values:
+            str(x)
+
+    return run, n
+
+
+@scenario("format.many")
+def _format_many(scale):
+    n = int(100000 * scale)
+    means, errors = _pairs(n)
+    return lambda: labfis.format_many(means, errors), n
+
+
+@scenario("format.tex")
+def _format_tex(scale):
+    n = int(100000 * scale)
+    values = labfloat.list(list(_pairs(n)))
+
+    def run():
+        for x in values:
+            x.tex()
+
+    return run, n
+
+
+def measure(names, scale, repeat):
+    """Time the scenarios, returning the best seconds per element of each one."""
+    results = {}
+    for name in names:
+        run, n = SCENARIOS[name](scale)
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+        results[name] = best / max(n, 1)
+        print("{:<24}{:>12.1f} ns/element".format(name, results[name] * 1e9))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the ratios to the baseline, returning the names of the regressions."""
+    regressions = []
+    print()
+    print("{:<24}{:>12}{:>12}{:>10}".format("scenario", "baseline", "current", "ratio"))
+    for name, t in results.items():
+        if name not in baseline:
+            continue
+        ratio = t / baseline[name]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            "{:<24}{:>12.1f}{:>12.1f}{:>10.2f}{}".format(
+                name, baseline[name] * 1e9, t * 1e9, ratio, flag
+            )
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="run only scenarios containing it")
+    parser.add_argument("--scale", type=float, default=1.0, help="workload size factor")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="repeats of each scenario"
+    )
+    parser.add_argument("--save", help="save the results as JSON to this path")
+    parser.add_argument("--compare", help="JSON results to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25, help="maximum allowed time ratio"
+    )
+    args = parser.parse_args(argv)
+
+    names = [name for name in SCENARIOS if args.filter in name]
+    results = measure(names, args.scale, args.repeat)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "scale": args.scale,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                "\n{} regression(s): {}".format(
+                    len(regressions), ", ".join(regressions)
+                )
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
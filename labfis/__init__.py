@@ -7,5 +7,21 @@ __version__ = "1.2.1"
 
 # Local imports
 from labfis.uncertainty import labfloat, Infix
+from labfis.array import labarray, measure
+from labfis.rounding import round_many, format_many
+from labfis.latex import textable
+from labfis.correlation import corrfloat
+from labfis.autodiff import propagate
+from labfis.montecarlo import montecarlo
+from labfis.stats import lsum, lmean, weighted_mean, sample_mean, accumulator
+from labfis.fit import linear_fit, polyfit, curve_fit
+from labfis.io import read_chunks, read_rows, save, load, pack, unpack
+from labfis.compare import compatibility_matrix, compatible_pairs, group_compatible
+from labfis.budget import budget
+from labfis.covariance import propagate_covariance
+from labfis.lazy import lazy
+from labfis.reverse import tape
+from labfis.table import labtable
+from labfis.parallel import parallel_map
 
-u = Infix(lambda x, y: labfloat(x, y))
+u = Infix(measure)
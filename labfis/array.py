@@ -0,0 +1,587 @@
+from __future__ import annotations
+import logging
+import operator
+from collections.abc import Iterable, Callable
+from typing import Union, Tuple
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.rounding import format_many
+
+logger = logging.getLogger(__name__)
+
+
+_means = np.frompyfunc(lambda x: x.mean if isinstance(x, labfloat) else x, 1, 1)
+"""np.ufunc: Means of an object array of labfloats and numbers."""
+
+_errors = np.frompyfunc(
+    lambda x: x.uncertainty if isinstance(x, labfloat) else 0.0, 1, 1
+)
+"""np.ufunc: Errors of an object array of labfloats and numbers, zero for numbers."""
+
+
+class labarray:
+    """Represents an array of gaussian distributions.
+
+    A labarray object stores the means and standard deviations of many measures as two
+    contiguous float64 arrays. All arithmetic is done over the whole arrays at once,
+    using the same propagation formulas as labfloat, so that bulk data does not need
+    one labfloat object per element. A labfloat or a number used in an operation with a
+    labarray is broadcasted over all elements, and indexing a single element returns a
+    labfloat. The comparison operators apply labfloat's statistical tests element-wise
+    and return boolean arrays. The numpy ufuncs and functions with a known propagation
+    rule, like np.sin, np.sqrt, np.add or np.sum, work over labarrays as well.
+
+    Raises:
+        LabFloatError: Means and uncertainties does not have the same shape.
+
+    Examples:
+        >>> labarray([1,2,3,4],[0.1,0.1,0.2,0.2])
+        >>> labarray([1,2,3,4],0.1)
+        >>> labarray([labfloat(1,0.1),labfloat(2,0.1)])
+
+    """
+
+    __slots__ = ("_mean", "_uncertainty")
+
+    def __init__(self, mean: Iterable, uncertainty: Union[Iterable, Number] = None):
+        """Create an instance of labarray.
+
+        If only one argument is passed it may be a sequence of labfloats, a labarray or
+        a sequence of numbers, in witch case the uncertainties will be zero. A scalar
+        uncertainty is broadcasted to all the means.
+
+        Args:
+            mean (Iterable): The means or a sequence of labfloats.
+            uncertainty (Union[Iterable, Number], optional): The uncertainties. Defaults to None.
+
+        Raises:
+            LabFloatError: Means and uncertainties does not have the same shape.
+
+        """
+        if uncertainty is None:
+            if isinstance(mean, labarray):
+                mean, uncertainty = mean.mean, mean.uncertainty
+            elif isinstance(mean, labfloat):
+                mean, uncertainty = mean.mean, mean.uncertainty
+            elif isinstance(mean, np.ndarray) and mean.dtype != object:
+                uncertainty = 0.0
+            else:
+                values = np.array(
+                    list(mean) if not isinstance(mean, np.ndarray) else mean,
+                    dtype=object,
+                )
+                mean, uncertainty = _means(values), _errors(values)
+
+        mean = np.asarray(mean, dtype=np.float64)
+        uncertainty = np.abs(np.asarray(uncertainty, dtype=np.float64))
+
+        if uncertainty.shape != mean.shape:
+            try:
+                uncertainty = np.broadcast_to(uncertainty, mean.shape)
+            except ValueError:
+                raise LabFloatError(2, mean, uncertainty)
+
+        self._mean = mean
+        self._uncertainty = uncertainty
+
+    @classmethod
+    def _new(cls, mean: np.ndarray, uncertainty: np.ndarray) -> labarray:
+        """Create a labarray from float64 arrays without checking the arguments."""
+        obj = object.__new__(cls)
+        obj._mean = mean
+        obj._uncertainty = uncertainty
+        return obj
+
+    def __reduce__(self) -> tuple:
+        return labarray._new, (self._mean, self._uncertainty)
+
+    def __copy__(self) -> labarray:
+        return labarray._new(self._mean.copy(), self._uncertainty.copy())
+
+    def __deepcopy__(self, memo: dict) -> labarray:
+        return self.__copy__()
+
+    @property
+    def mean(self) -> np.ndarray:
+        """np.ndarray: labarray's means."""
+        return self._mean
+
+    @property
+    def uncertainty(self) -> np.ndarray:
+        """np.ndarray: labarray's errors."""
+        return self._uncertainty
+
+    @property
+    def shape(self) -> Tuple[int]:
+        """Tuple[int]: labarray's shape."""
+        return self._mean.shape
+
+    @property
+    def size(self) -> int:
+        """int: labarray's number of elements."""
+        return self._mean.size
+
+    def __len__(self) -> int:
+        if not self._mean.ndim:
+            raise TypeError("len() of a 0-d labarray.")
+        return len(self._mean)
+
+    def __getitem__(self, idx) -> Union[labfloat, labarray]:
+        """Index the labarray.
+
+        An integer index returns the labfloat at that position, while slices, masks
+        and index arrays return a new labarray.
+
+        Args:
+            idx: Any numpy index.
+
+        Returns:
+            Union[labfloat, labarray]: The selected element or elements.
+
+        """
+        m = self._mean[idx]
+        if isinstance(m, np.ndarray):
+            return labarray._new(m, self._uncertainty[idx])
+        return labfloat._new(float(m), float(self._uncertainty[idx]))
+
+    def __iter__(self):
+        if not self._mean.ndim:
+            raise TypeError("Iteration over a 0-d labarray.")
+        if self._mean.ndim > 1:
+            for i in range(len(self._mean)):
+                yield self[i]
+            return
+        for m, u in zip(self._mean.tolist(), self._uncertainty.tolist()):
+            yield labfloat._new(m, u)
+
+    def tolist(self) -> list:
+        """Convert labarray to a (nested) list of labfloats.
+
+        Returns:
+            list: List of labfloats with the same shape as labarray, or a labfloat if it is 0-d.
+
+        """
+        if not self._mean.ndim:
+            return self[()]
+        if self._mean.ndim > 1:
+            return [row.tolist() for row in self]
+        return list(self)
+
+    def __str__(self) -> str:
+        if not self._mean.ndim:
+            return str(self[()])
+        if self._mean.ndim > 1:
+            return "[{0}]".format(", ".join(str(x) for x in self))
+        return "[{0}]".format(", ".join(format_many(self)))
+
+    def __repr__(self) -> str:
+        return "labarray({0})".format(self.__str__())
+
+    @staticmethod
+    def parts(value: Union[labarray, labfloat, Number, np.ndarray]) -> Tuple[object]:
+        """Get the means and errors of a labarray, labfloat, number or numpy array.
+
+        Numbers and numpy arrays of numbers are constants, with zero error, while the
+        elements of object arrays may be labfloats.
+
+        Args:
+            value (Union[labarray, labfloat, Number, np.ndarray]): The value.
+
+        Returns:
+            Tuple[object]: The means and errors, or (None, None) if the type is not supported.
+
+        """
+        if isinstance(value, (labarray, labfloat)):
+            return value.mean, value.uncertainty
+        if isinstance(value, np.ndarray) and value.dtype == object:
+            value = labarray(value)
+            return value.mean, value.uncertainty
+        if isinstance(value, (Number, np.ndarray)):
+            return value, 0
+        return None, None
+
+    def __array_ufunc__(
+        self, ufunc: np.ufunc, method: str, *inputs, **kwargs
+    ) -> object:
+        """Apply numpy ufuncs with error propagation, see _ufunc."""
+        return _ufunc(ufunc, method, inputs, kwargs)
+
+    def __array_function__(self, func, types, args, kwargs) -> object:
+        """Apply the numpy functions in _functions, other functions are not supported."""
+        if func not in _functions or not all(
+            issubclass(t, (labarray, np.ndarray)) for t in types
+        ):
+            return NotImplemented
+        return _functions[func](*args, **kwargs)
+
+    def __eq__(self, other: Union[labarray, labfloat, Number]) -> np.ndarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return np.abs(self._mean - m) < 2 * (self._uncertainty + u)
+
+    def __ne__(self, other: Union[labarray, labfloat, Number]) -> np.ndarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return np.abs(self._mean - m) > 3 * (self._uncertainty + u)
+
+    def __lt__(self, other: Union[labarray, labfloat, Number]) -> np.ndarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return self._mean + self._uncertainty < m - u
+
+    def __gt__(self, other: Union[labarray, labfloat, Number]) -> np.ndarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return self._mean - self._uncertainty > m + u
+
+    def __le__(self, other: Union[labarray, labfloat, Number]) -> np.ndarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return self._mean + self._uncertainty <= m + u
+
+    def __ge__(self, other: Union[labarray, labfloat, Number]) -> np.ndarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return self._mean - self._uncertainty >= m - u
+
+    __hash__ = None
+
+    def __pos__(self) -> labarray:
+        return self
+
+    def __neg__(self) -> labarray:
+        return labarray._new(-self._mean, self._uncertainty)
+
+    def __abs__(self) -> labarray:
+        return labarray._new(np.abs(self._mean), self._uncertainty)
+
+    def __add__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return labarray._new(self._mean + m, np.hypot(self._uncertainty, u))
+
+    def __radd__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        return self.__add__(other)
+
+    def __sub__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return labarray._new(self._mean - m, np.hypot(self._uncertainty, u))
+
+    def __rsub__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return labarray._new(m - self._mean, np.hypot(u, self._uncertainty))
+
+    def __mul__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return labarray._new(
+            self._mean * m, np.hypot(m * self._uncertainty, self._mean * u)
+        )
+
+    def __rmul__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        return self.__mul__(other)
+
+    def __truediv__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return labarray._new(
+            self._mean / m,
+            np.hypot(self._uncertainty / m, self._mean * u / m ** 2),
+        )
+
+    def __rtruediv__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        return labarray._new(
+            m / self._mean,
+            np.hypot(u / self._mean, m * self._uncertainty / self._mean ** 2),
+        )
+
+    def __pow__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        power = self._mean ** m
+        if np.any(u):
+            eu = power * np.log(np.abs(self._mean)) * u
+        else:
+            eu = 0
+        return labarray._new(
+            power, np.hypot(m * self._mean ** (m - 1) * self._uncertainty, eu)
+        )
+
+    def __rpow__(self, other: Union[labarray, labfloat, Number]) -> labarray:
+        m, u = self.parts(other)
+        if m is None:
+            return NotImplemented
+        power = m ** self._mean
+        if np.any(u):
+            eu = self._mean * m ** (self._mean - 1) * u
+        else:
+            eu = 0
+        return labarray._new(
+            power, np.hypot(eu, power * np.log(np.abs(m)) * self._uncertainty)
+        )
+
+    def sqrt(self) -> labarray:
+        return self.__pow__(0.5)
+
+    def cos(self) -> labarray:
+        return labarray._new(
+            np.cos(self._mean), np.abs(np.sin(self._mean) * self._uncertainty)
+        )
+
+    def sin(self) -> labarray:
+        return labarray._new(
+            np.sin(self._mean), np.abs(np.cos(self._mean) * self._uncertainty)
+        )
+
+    def tan(self) -> labarray:
+        return labarray._new(
+            np.tan(self._mean), self._uncertainty / np.cos(self._mean) ** 2
+        )
+
+    def arcsin(self) -> labarray:
+        return labarray._new(
+            np.arcsin(self._mean), self._uncertainty / (1 - self._mean ** 2) ** 0.5
+        )
+
+    def arccos(self) -> labarray:
+        return labarray._new(
+            np.arccos(self._mean), self._uncertainty / (1 - self._mean ** 2) ** 0.5
+        )
+
+    def arctan(self) -> labarray:
+        return labarray._new(
+            np.arctan(self._mean), self._uncertainty / (1 + self._mean ** 2)
+        )
+
+
+_unary = {
+    np.positive: "__pos__",
+    np.negative: "__neg__",
+    np.absolute: "__abs__",
+    np.sqrt: "sqrt",
+    np.cos: "cos",
+    np.sin: "sin",
+    np.tan: "tan",
+    np.arcsin: "arcsin",
+    np.arccos: "arccos",
+    np.arctan: "arctan",
+}
+"""dict: labarray's method applied by each unary ufunc."""
+
+_binary = {
+    np.add: "__add__",
+    np.subtract: "__sub__",
+    np.multiply: "__mul__",
+    np.true_divide: "__truediv__",
+    np.power: "__pow__",
+    np.equal: "__eq__",
+    np.not_equal: "__ne__",
+    np.less: "__lt__",
+    np.greater: "__gt__",
+    np.less_equal: "__le__",
+    np.greater_equal: "__ge__",
+}
+"""dict: labarray's method applied by each binary ufunc."""
+
+
+def _asarray(value: object) -> labarray:
+    """Convert a ufunc input to labarray, numbers and arrays of numbers are constants."""
+    if isinstance(value, labarray):
+        return value
+    if isinstance(value, np.ndarray) and value.dtype == object:
+        return labarray(value)
+    if isinstance(value, labfloat):
+        return labarray._new(
+            np.asarray(value.mean, dtype=np.float64),
+            np.asarray(value.uncertainty, dtype=np.float64),
+        )
+    value = np.asarray(value, dtype=np.float64)
+    return labarray._new(value, np.zeros_like(value))
+
+
+def _derived(inputs: tuple) -> bool:
+    """If the inputs are scalars and any is of a labfloat subclass, like corrfloat."""
+    return any(
+        isinstance(x, labfloat) and type(x) is not labfloat for x in inputs
+    ) and not any(isinstance(x, (labarray, np.ndarray)) for x in inputs)
+
+
+def _keep(ufunc: np.ufunc, inputs: tuple, functions: dict) -> object:
+    """Apply a ufunc with the operators and methods of labfloat subclasses.
+
+    Subclasses like corrfloat carry more than the mean and error, so instead of
+    converting them to labarray the ufunc is dispatched to their own operators, or to
+    the functions of labfis.umath, and the result keeps their type.
+
+    """
+    inputs = [x.item() if isinstance(x, np.generic) else x for x in inputs]
+    if ufunc in functions:
+        return functions[ufunc](*inputs)
+    if ufunc in _unary and len(inputs) == 1:
+        return getattr(inputs[0], _unary[ufunc])()
+    if ufunc in _binary and len(inputs) == 2:
+        return getattr(operator, _binary[ufunc])(*inputs)
+    if ufunc is np.square:
+        return inputs[0] ** 2
+    if ufunc is np.reciprocal:
+        return 1 / inputs[0]
+    return NotImplemented
+
+
+def _ufunc(ufunc: np.ufunc, method: str, inputs: tuple, kwargs: dict) -> object:
+    """Apply a numpy ufunc to labarrays, labfloats and numbers.
+
+    The supported ufuncs are dispatched to the labarray's arithmetic, comparison and
+    function methods, that propagate the errors over whole arrays, and np.add.reduce
+    (np.sum) adds the variances. If no input is an array the result is a labfloat.
+
+    Returns:
+        object: The result, or NotImplemented for other ufuncs, methods or arguments.
+
+    """
+    # NOTE: imported here because labfis.umath depends on this module.
+    from labfis.umath import _ufuncs
+
+    if method == "__call__" and not kwargs and _derived(inputs):
+        return _keep(ufunc, inputs, _ufuncs)
+    if method == "__call__" and not kwargs:
+        if ufunc in _ufuncs:
+            result = _ufuncs[ufunc](*[_asarray(x) for x in inputs])
+        elif ufunc in _unary and len(inputs) == 1:
+            result = getattr(_asarray(inputs[0]), _unary[ufunc])()
+        elif ufunc in _binary and len(inputs) == 2:
+            result = getattr(_asarray(inputs[0]), _binary[ufunc])(inputs[1])
+        elif ufunc is np.square:
+            result = _asarray(inputs[0]) ** 2
+        elif ufunc is np.reciprocal:
+            result = 1 / _asarray(inputs[0])
+        else:
+            return NotImplemented
+    elif method == "reduce" and ufunc is np.add:
+        if kwargs.get("out") is not None or kwargs.get("where", True) is not True:
+            return NotImplemented
+        result = _sum(inputs[0], kwargs.get("axis", 0), kwargs.get("keepdims", False))
+    else:
+        return NotImplemented
+
+    if isinstance(result, labarray) and not result.shape:
+        if not any(isinstance(x, (labarray, np.ndarray)) for x in inputs):
+            return labfloat._new(float(result.mean), float(result.uncertainty))
+    if isinstance(result, np.ndarray) and not result.shape:
+        return bool(result)
+    return result
+
+
+def _sum(
+    values: labarray, axis: Union[int, Tuple[int]] = None, keepdims: bool = False, **_
+) -> Union[labarray, labfloat]:
+    values = _asarray(values)
+    result = labarray._new(
+        np.sum(values.mean, axis=axis, keepdims=keepdims),
+        np.sqrt(np.sum(values.uncertainty ** 2, axis=axis, keepdims=keepdims)),
+    )
+    return result if result.shape else result[()]
+
+
+def _average(
+    values: labarray, axis: Union[int, Tuple[int]] = None, keepdims: bool = False, **_
+) -> Union[labarray, labfloat]:
+    values = _asarray(values)
+    total = _sum(values, axis, keepdims)
+    return total / (values.size // np.size(total.mean))
+
+
+def _join(function: Callable) -> Callable:
+    def join(arrays: Iterable, *args, **kwargs) -> labarray:
+        arrays = [_asarray(x) for x in arrays]
+        return labarray._new(
+            function([x.mean for x in arrays], *args, **kwargs),
+            function([x.uncertainty for x in arrays], *args, **kwargs),
+        )
+
+    return join
+
+
+def _each(function: Callable) -> Callable:
+    def each(values: labarray, *args, **kwargs) -> labarray:
+        values = _asarray(values)
+        return labarray._new(
+            function(values.mean, *args, **kwargs),
+            function(values.uncertainty, *args, **kwargs),
+        )
+
+    return each
+
+
+_functions = {
+    np.sum: _sum,
+    np.mean: _average,
+    np.concatenate: _join(np.concatenate),
+    np.stack: _join(np.stack),
+    np.reshape: _each(np.reshape),
+    np.ravel: _each(np.ravel),
+    np.transpose: _each(np.transpose),
+    np.copy: _each(np.copy),
+    np.broadcast_to: _each(np.broadcast_to),
+    np.shape: lambda values: values.shape,
+    np.ndim: lambda values: values.mean.ndim,
+    np.size: lambda values: values.size,
+}
+"""dict: Implementation of the numpy functions supported by labarray."""
+
+
+def measure(
+    mean: Union[Iterable, Number], uncertainty: Union[Iterable, Number] = 0.0
+) -> Union[labfloat, labarray]:
+    """Create a labfloat from numbers, or a labarray if any argument is a sequence.
+
+    Used by the infix operator u, so that x |u| e builds a single labarray from
+    sequences or numpy arrays of means and errors, broadcasting a scalar on either side.
+
+    Args:
+        mean (Union[Iterable, Number]): The mean or means.
+        uncertainty (Union[Iterable, Number], optional): The error or errors. Defaults to 0.0.
+
+    Raises:
+        LabFloatError: Means and uncertainties can not be broadcasted together.
+
+    Returns:
+        Union[labfloat, labarray]: A labfloat, or a labarray for sequences.
+
+    Examples:
+        >>> [1, 2, 3] |u| 0.1
+        >>> np.linspace(0, 1, 100) |u| errors
+
+    """
+    if isinstance(mean, Number) and isinstance(uncertainty, Number):
+        return labfloat(mean, uncertainty)
+    if isinstance(mean, labarray):
+        mean = mean.mean
+    mean = np.asarray(mean, dtype=np.float64)
+    uncertainty = np.abs(np.asarray(uncertainty, dtype=np.float64))
+    if uncertainty.shape != mean.shape:
+        try:
+            mean, uncertainty = np.broadcast_arrays(mean, uncertainty)
+        except ValueError:
+            raise LabFloatError(2, mean, uncertainty)
+    return labarray._new(mean, uncertainty)
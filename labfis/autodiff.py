@@ -0,0 +1,315 @@
+from __future__ import annotations
+import logging
+from collections.abc import Callable
+from typing import Union, Tuple, List
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat
+from labfis.array import labarray
+from labfis.umath import _unary as _table
+
+logger = logging.getLogger(__name__)
+
+_unary = {
+    name: (vf, lambda x, fx, df=df: df(x, fx, np))
+    for name, (_, vf, df) in _table.items()
+}
+"""dict: Function and derivative, as a function of x and f(x), of the unary functions, from labfis.umath."""
+
+
+class dual:
+    """Represents a dual number used in forward-mode automatic differentiation.
+
+    A dual stores a value and its gradient with respect to the inputs of a calculation.
+    The value may be a number or a numpy array, in witch case the gradient has one row
+    for each input with the value's shape. All operations apply the chain rule exactly,
+    so evaluating a function once with duals gives its value and all its derivatives.
+
+    Functions written with the labfloat methods (sqrt, sin, cos, ...) or with the
+    functions of this module can be evaluated with duals.
+
+    """
+
+    __slots__ = ("value", "grad")
+
+    __array_ufunc__ = None
+    """None: Make numpy arrays defer the arithmetic operators to dual."""
+
+    def __init__(self, value: object, grad: np.ndarray):
+        self.value = value
+        self.grad = grad
+
+    def __repr__(self) -> str:
+        return "dual({0}, {1})".format(self.value, self.grad)
+
+    @staticmethod
+    def _split(other: Union[dual, Number, np.ndarray]) -> Tuple[object]:
+        """Get the value and gradient of an operand, the gradient of constants is zero."""
+        if isinstance(other, dual):
+            return other.value, other.grad
+        if isinstance(other, (Number, np.ndarray)):
+            return other, 0
+        return None, None
+
+    def _apply(self, name: str) -> dual:
+        """Apply one of the unary functions."""
+        f, df = _unary[name]
+        value = f(self.value)
+        return dual(value, self.grad * df(self.value, value))
+
+    def __pos__(self) -> dual:
+        return self
+
+    def __neg__(self) -> dual:
+        return dual(-self.value, -self.grad)
+
+    def __abs__(self) -> dual:
+        return dual(abs(self.value), self.grad * np.sign(self.value))
+
+    def __add__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        v, g = self._split(other)
+        if v is None:
+            return NotImplemented
+        return dual(self.value + v, self.grad + g)
+
+    def __radd__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        return self.__add__(other)
+
+    def __sub__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        v, g = self._split(other)
+        if v is None:
+            return NotImplemented
+        return dual(self.value - v, self.grad - g)
+
+    def __rsub__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        v, g = self._split(other)
+        if v is None:
+            return NotImplemented
+        return dual(v - self.value, g - self.grad)
+
+    def __mul__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        v, g = self._split(other)
+        if v is None:
+            return NotImplemented
+        return dual(self.value * v, self.grad * v + g * self.value)
+
+    def __rmul__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        return self.__mul__(other)
+
+    def __truediv__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        v, g = self._split(other)
+        if v is None:
+            return NotImplemented
+        value = self.value / v
+        return dual(value, (self.grad - g * value) / v)
+
+    def __rtruediv__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        v, g = self._split(other)
+        if v is None:
+            return NotImplemented
+        value = v / self.value
+        return dual(value, (g - self.grad * value) / self.value)
+
+    def __pow__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        v, g = self._split(other)
+        if v is None:
+            return NotImplemented
+        value = self.value ** v
+        grad = self.grad * (v * self.value ** (v - 1))
+        if isinstance(other, dual):
+            grad = grad + g * (value * np.log(np.abs(self.value)))
+        return dual(value, grad)
+
+    def __rpow__(self, other: Union[dual, Number, np.ndarray]) -> dual:
+        v, g = self._split(other)
+        if v is None:
+            return NotImplemented
+        value = v ** self.value
+        return dual(value, self.grad * (value * np.log(np.abs(v))))
+
+    def __lt__(self, other: Union[dual, Number, np.ndarray]) -> object:
+        return self.value < self._split(other)[0]
+
+    def __le__(self, other: Union[dual, Number, np.ndarray]) -> object:
+        return self.value <= self._split(other)[0]
+
+    def __gt__(self, other: Union[dual, Number, np.ndarray]) -> object:
+        return self.value > self._split(other)[0]
+
+    def __ge__(self, other: Union[dual, Number, np.ndarray]) -> object:
+        return self.value >= self._split(other)[0]
+
+    def sqrt(self) -> dual:
+        return self._apply("sqrt")
+
+    def exp(self) -> dual:
+        return self._apply("exp")
+
+    def log(self) -> dual:
+        return self._apply("log")
+
+    def log10(self) -> dual:
+        return self._apply("log10")
+
+    def cos(self) -> dual:
+        return self._apply("cos")
+
+    def sin(self) -> dual:
+        return self._apply("sin")
+
+    def tan(self) -> dual:
+        return self._apply("tan")
+
+    def arcsin(self) -> dual:
+        return self._apply("arcsin")
+
+    def arccos(self) -> dual:
+        return self._apply("arccos")
+
+    def arctan(self) -> dual:
+        return self._apply("arctan")
+
+    def sinh(self) -> dual:
+        return self._apply("sinh")
+
+    def cosh(self) -> dual:
+        return self._apply("cosh")
+
+    def tanh(self) -> dual:
+        return self._apply("tanh")
+
+    def erf(self) -> dual:
+        return self._apply("erf")
+
+
+def _function(name: str) -> Callable:
+    f = _unary[name][0]
+
+    def function(x: Union[dual, Number, np.ndarray]) -> Union[dual, Number, np.ndarray]:
+        if isinstance(x, dual):
+            return x._apply(name)
+        return f(x)
+
+    function.__name__ = name
+    function.__doc__ = "{0} of a dual or a number.".format(name)
+    return function
+
+
+sqrt = _function("sqrt")
+exp = _function("exp")
+log = _function("log")
+log10 = _function("log10")
+cos = _function("cos")
+sin = _function("sin")
+tan = _function("tan")
+arcsin = _function("arcsin")
+arccos = _function("arccos")
+arctan = _function("arctan")
+sinh = _function("sinh")
+cosh = _function("cosh")
+tanh = _function("tanh")
+erf = _function("erf")
+
+
+def hypot(x: Union[dual, Number], y: Union[dual, Number]) -> Union[dual, Number]:
+    """Euclidean norm sqrt(x**2 + y**2) of duals or numbers."""
+    if not isinstance(x, dual) and not isinstance(y, dual):
+        return np.hypot(x, y)
+    xv, xg = dual._split(x)
+    yv, yg = dual._split(y)
+    value = np.hypot(xv, yv)
+    return dual(value, (xg * xv + yg * yv) / value)
+
+
+def arctan2(y: Union[dual, Number], x: Union[dual, Number]) -> Union[dual, Number]:
+    """Arc tangent of y/x in the correct quadrant, of duals or numbers."""
+    if not isinstance(x, dual) and not isinstance(y, dual):
+        return np.arctan2(y, x)
+    xv, xg = dual._split(x)
+    yv, yg = dual._split(y)
+    return dual(np.arctan2(yv, xv), (yg * xv - xg * yv) / (xv ** 2 + yv ** 2))
+
+
+def _duals(
+    args: Tuple[Union[labfloat, labarray, Number]]
+) -> Tuple[List[dual], np.ndarray]:
+    """Create one dual for each argument, with unitary gradients, and the arguments' errors."""
+    vectorized = any(isinstance(x, labarray) for x in args)
+    means, errors = zip(*[labarray.parts(x) for x in args]) if args else ((), ())
+    if vectorized:
+        means = np.broadcast_arrays(*[np.asarray(m, dtype=np.float64) for m in means])
+        errors = np.broadcast_arrays(*[np.asarray(e, dtype=np.float64) for e in errors])
+    errors = np.array(errors, dtype=np.float64)
+
+    identity = np.eye(len(args))
+    if vectorized:
+        shape = (len(args),) + (1,) * means[0].ndim
+        return [
+            dual(m, identity[i].reshape(shape)) for i, m in enumerate(means)
+        ], errors
+    return [dual(m, identity[i]) for i, m in enumerate(means)], errors
+
+
+def gradient(f: Callable, *args: Union[labfloat, labarray, Number]) -> Tuple[object]:
+    """Evaluate a function and its gradient with respect to each argument.
+
+    Args:
+        f (Callable): The function, of as many arguments as passed.
+        *args (Union[labfloat, labarray, Number]): The function's arguments, only their means are used.
+
+    Returns:
+        Tuple[object]: The function's value and the gradient, with one row for each argument.
+
+    """
+    duals, _ = _duals(args)
+    result = f(*duals)
+    if isinstance(result, dual):
+        value, grad = result.value, result.grad
+    else:
+        value, grad = result, 0.0
+    return value, np.broadcast_to(grad, (len(args),) + np.shape(value))
+
+
+def _result(result: object, errors: np.ndarray) -> Union[labfloat, labarray]:
+    """Convert a dual result to labfloat or labarray, using the arguments' errors."""
+    if isinstance(result, (tuple, list)):
+        return type(result)(_result(r, errors) for r in result)
+    if not isinstance(result, dual):
+        if isinstance(result, np.ndarray):
+            return labarray(result, 0)
+        return labfloat(result)
+    uncertainty = np.sqrt(np.sum((result.grad * errors) ** 2, axis=0))
+    if np.ndim(result.value):
+        return labarray._new(
+            result.value, np.broadcast_to(uncertainty, result.value.shape)
+        )
+    return labfloat._new(float(result.value), float(uncertainty))
+
+
+def propagate(
+    f: Callable, *args: Union[labfloat, labarray, Number]
+) -> Union[labfloat, labarray, tuple, list]:
+    """Propagate the errors of the arguments through any function.
+
+    The function is evaluated only once with dual numbers, giving the exact derivatives
+    with respect to all arguments. It must be written with the arithmetic operators,
+    the labfloat methods (sqrt, sin, cos, ...) or the functions of this module. If any
+    argument is a labarray the function is evaluated over whole arrays, the other
+    arguments are broadcasted.
+
+    Args:
+        f (Callable): The function, of as many arguments as passed.
+        *args (Union[labfloat, labarray, Number]): The function's arguments, numbers are constants.
+
+    Returns:
+        Union[labfloat, labarray, tuple, list]: The result, or a tuple or list of results if f returns many values.
+
+    Examples:
+        >>> propagate(lambda x, y: exp(-x) * hypot(x, y), labfloat(1, 0.1), labfloat(2, 0.2))
+        >>> propagate(lambda v, t: v * t + 0.5 * 9.8 * t ** 2, labarray(v, dv), labfloat(2, 0.1))
+
+    """
+    duals, errors = _duals(args)
+    return _result(f(*duals), errors)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+import inspect
+import logging
+from collections.abc import Callable
+from typing import Union, List, NamedTuple
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.array import labarray
+from labfis.correlation import corrfloat
+from labfis.autodiff import gradient
+
+logger = logging.getLogger(__name__)
+
+
+class budgetresult(NamedTuple):
+    """Uncertainty budget of a result."""
+
+    value: Union[labfloat, labarray]
+    """Union[labfloat, labarray]: The result."""
+    inputs: List[object]
+    """List[object]: The independent inputs, names or corrfloat sources."""
+    variances: np.ndarray
+    """np.ndarray: Variance contributed by each input, one row for each input with the result's shape."""
+
+    @property
+    def fractions(self) -> np.ndarray:
+        """np.ndarray: Fraction of the result's variance contributed by each input."""
+        total = self.variances.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, self.variances / total, 0.0)
+
+    def __str__(self) -> str:
+        if np.ndim(self.variances) != 1:
+            return "budgetresult({0}, {1})".format(self.value, self.inputs)
+        rows = ["{:<16}{:>14}{:>10}".format("input", "variance", "%")]
+        for name, variance, fraction in zip(
+            self.inputs, self.variances, self.fractions
+        ):
+            rows.append(
+                "{:<16}{:>14.6g}{:>10.2f}".format(str(name), variance, 100 * fraction)
+            )
+        return "\n".join(rows)
+
+
+def _names(f: Callable, count: int) -> List[str]:
+    """Names of the function's positional parameters, or x0, x1, ... if not available."""
+    try:
+        parameters = [
+            p.name
+            for p in inspect.signature(f).parameters.values()
+            if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+        ]
+    except (TypeError, ValueError):
+        parameters = []
+    if len(parameters) < count:
+        return ["x{0}".format(i) for i in range(count)]
+    return parameters[:count]
+
+
+def budget(
+    value: Union[corrfloat, Callable], *args: Union[labfloat, labarray, Number]
+) -> budgetresult:
+    """Calculate the variance contributed by each independent input to a result.
+
+    The result may be a corrfloat, whose partial derivatives with respect to each
+    measure it depends on were tracked while it was calculated, or a function and its
+    arguments, that is evaluated once with dual numbers as in propagate, working over
+    whole labarrays. In both cases the contribution of an input is (df/dx * σx)**2 and
+    their sum is the result's variance, so no calculation is repeated for each input.
+
+    Args:
+        value (Union[corrfloat, Callable]): A corrfloat, or a function of as many arguments as passed.
+        *args (Union[labfloat, labarray, Number]): The function's arguments, numbers are constants.
+
+    Raises:
+        LabFloatError: The value is not a corrfloat or a function.
+
+    Returns:
+        budgetresult: The result, the inputs and their variances.
+
+    Examples:
+        >>> x, y = corrfloat(10, 1, name="x"), corrfloat(2, 0.1, name="y")
+        >>> print(budget(x * y + x))
+        >>> budget(lambda v, t: v * t, labarray(v, dv), labfloat(2, 0.1)).fractions
+
+    """
+    if isinstance(value, corrfloat):
+        inputs = list(value.derivatives)
+        variances = np.array(
+            [(d * s.uncertainty) ** 2 for s, d in value.derivatives.items()],
+            dtype=np.float64,
+        )
+        return budgetresult(value, inputs, variances)
+
+    if not callable(value):
+        raise LabFloatError("Can't calculate the uncertainty budget of: %s", value)
+
+    mean, grad = gradient(value, *args)
+    errors = [labarray.parts(x)[1] for x in args]
+    shape = np.shape(mean)
+    variances = np.array(
+        [(g * np.broadcast_to(e, shape)) ** 2 for g, e in zip(grad, errors)],
+        dtype=np.float64,
+    ).reshape((len(args),) + shape)
+    uncertainty = np.sqrt(variances.sum(axis=0))
+    if shape:
+        result = labarray._new(np.asarray(mean, dtype=np.float64), uncertainty)
+    else:
+        result = labfloat._new(float(mean), float(uncertainty))
+    return budgetresult(result, _names(value, len(args)), variances)
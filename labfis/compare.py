@@ -0,0 +1,230 @@
+from __future__ import annotations
+import logging
+from collections.abc import Iterable
+from typing import Union, Tuple, NamedTuple
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.array import labarray
+
+logger = logging.getLogger(__name__)
+
+
+def _array(values: Union[labarray, labfloat, Iterable, Number]) -> labarray:
+    """Convert the operand to labarray."""
+    if isinstance(values, labarray):
+        return values
+    if isinstance(values, Number):
+        return labarray(values, 0.0)
+    return labarray(values)
+
+
+def equal(
+    a: Union[labarray, labfloat, Iterable], b: Union[labarray, labfloat, Iterable]
+) -> np.ndarray:
+    """Test element-wise if the values are equal, |a - b| < 2(σa + σb).
+
+    Args:
+        a (Union[labarray, labfloat, Iterable]): labarray, labfloat, labfloats or numbers.
+        b (Union[labarray, labfloat, Iterable]): labarray, labfloat, labfloats or numbers.
+
+    Returns:
+        np.ndarray: Boolean mask with the broadcasted shape of the operands.
+
+    """
+    return _array(a) == _array(b)
+
+
+def different(
+    a: Union[labarray, labfloat, Iterable], b: Union[labarray, labfloat, Iterable]
+) -> np.ndarray:
+    """Test element-wise if the values are different, |a - b| > 3(σa + σb).
+
+    Args:
+        a (Union[labarray, labfloat, Iterable]): labarray, labfloat, labfloats or numbers.
+        b (Union[labarray, labfloat, Iterable]): labarray, labfloat, labfloats or numbers.
+
+    Returns:
+        np.ndarray: Boolean mask with the broadcasted shape of the operands.
+
+    """
+    return _array(a) != _array(b)
+
+
+def less(
+    a: Union[labarray, labfloat, Iterable], b: Union[labarray, labfloat, Iterable]
+) -> np.ndarray:
+    """Test element-wise if a is less than b, a + σa < b - σb.
+
+    Args:
+        a (Union[labarray, labfloat, Iterable]): labarray, labfloat, labfloats or numbers.
+        b (Union[labarray, labfloat, Iterable]): labarray, labfloat, labfloats or numbers.
+
+    Returns:
+        np.ndarray: Boolean mask with the broadcasted shape of the operands.
+
+    """
+    return _array(a) < _array(b)
+
+
+def greater(
+    a: Union[labarray, labfloat, Iterable], b: Union[labarray, labfloat, Iterable]
+) -> np.ndarray:
+    """Test element-wise if a is greater than b, a - σa > b + σb.
+
+    Args:
+        a (Union[labarray, labfloat, Iterable]): labarray, labfloat, labfloats or numbers.
+        b (Union[labarray, labfloat, Iterable]): labarray, labfloat, labfloats or numbers.
+
+    Returns:
+        np.ndarray: Boolean mask with the broadcasted shape of the operands.
+
+    """
+    return _array(a) > _array(b)
+
+
+def _flat(values: Union[labarray, Iterable]) -> Tuple[np.ndarray]:
+    values = _array(values)
+    if values.mean.ndim != 1:
+        raise LabFloatError("Compatibility of a labarray with shape %s", values.shape)
+    return values.mean, values.uncertainty
+
+
+def compatibility_matrix(
+    a: Union[labarray, Iterable],
+    b: Union[labarray, Iterable] = None,
+    sigmas: float = 2,
+    block: int = 1024,
+) -> np.ndarray:
+    """Test the compatibility of every pair of values, |a[i] - b[j]| < sigmas(σa[i] + σb[j]).
+
+    The matrix is filled by square blocks, so the temporary arrays have at most
+    block**2 elements whatever the size of the data. For large data sets where few
+    pairs are compatible use compatible_pairs, whose result does not grow with N².
+
+    Args:
+        a (Union[labarray, Iterable]): One dimensional labarray, labfloats or numbers.
+        b (Union[labarray, Iterable], optional): The values compared with a. Defaults to a.
+        sigmas (float, optional): Number of standard deviations, 2 as in labfloat's ==. Defaults to 2.
+        block (int, optional): Size of the blocks. Defaults to 1024.
+
+    Returns:
+        np.ndarray: Boolean (len(a), len(b)) matrix.
+
+    """
+    am, au = _flat(a)
+    bm, bu = (am, au) if b is None else _flat(b)
+    result = np.empty((am.size, bm.size), dtype=bool)
+    for i in range(0, am.size, block):
+        rm, ru = am[i : i + block, np.newaxis], au[i : i + block, np.newaxis]
+        for j in range(0, bm.size, block):
+            cm, cu = bm[j : j + block], bu[j : j + block]
+            result[i : i + block, j : j + block] = np.abs(rm - cm) < sigmas * (ru + cu)
+    return result
+
+
+def compatible_pairs(
+    values: Union[labarray, Iterable], sigmas: float = 2, block: int = 1024
+) -> Tuple[np.ndarray]:
+    """Find all the pairs of compatible values, |x[i] - x[j]| < sigmas(σ[i] + σ[j]).
+
+    The values are sorted by mean, so that for each block of values only the
+    following values closer than sigmas * (σ[i] + max σ) are tested. The memory used
+    is bounded by block**2 plus the number of compatible pairs, and far apart values are
+    never compared.
+
+    Args:
+        values (Union[labarray, Iterable]): One dimensional labarray, labfloats or numbers.
+        sigmas (float, optional): Number of standard deviations, 2 as in labfloat's ==. Defaults to 2.
+        block (int, optional): Size of the blocks. Defaults to 1024.
+
+    Returns:
+        Tuple[np.ndarray]: The indices i and j, with i < j, of each compatible pair.
+
+    Example:
+        >>> i, j = compatible_pairs(x)
+        >>> scipy.sparse.coo_matrix((np.ones(i.size, bool), (i, j)), (len(x), len(x)))
+
+    """
+    mean, error = _flat(values)
+    order = np.argsort(mean, kind="stable")
+    mean, error = mean[order], error[order]
+    reach = sigmas * (error + (error.max() if error.size else 0))
+    ends = np.searchsorted(mean, mean + reach, side="left")
+
+    first, second = [], []
+    for i in range(0, mean.size, block):
+        rm, ru = mean[i : i + block, np.newaxis], error[i : i + block, np.newaxis]
+        for j in range(i, int(ends[i : i + block].max()), block):
+            cm, cu = mean[j : j + block], error[j : j + block]
+            r, c = np.nonzero(np.abs(rm - cm) < sigmas * (ru + cu))
+            r, c = r + i, c + j
+            upper = c > r
+            first.append(r[upper])
+            second.append(c[upper])
+
+    if not first:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    first, second = order[np.concatenate(first)], order[np.concatenate(second)]
+    return np.minimum(first, second), np.maximum(first, second)
+
+
+class grouping(NamedTuple):
+    """Result of grouping compatible values."""
+
+    labels: np.ndarray
+    """np.ndarray: The group of each value, groups are numbered by increasing lower bound."""
+    values: labarray
+    """labarray: The inverse-variance weighted mean of each group."""
+    counts: np.ndarray
+    """np.ndarray: The number of values in each group."""
+
+
+def group_compatible(values: Union[labarray, Iterable], sigmas: float = 2) -> grouping:
+    """Group values whose intervals mean ± sigmas*σ overlap, and combine each group.
+
+    Two intervals overlap exactly when |x[i] - x[j]| < sigmas(σ[i] + σ[j]), the test
+    of labfloat's == for sigmas=2. The intervals are sorted by their lower bound and
+    swept once, a new group starting when an interval begins after all the previous
+    ones end, so it takes O(N log N). A group is a chain of overlapping intervals, its
+    ends may not be compatible with each other. Each group is combined by its
+    inverse-variance weighted mean, as in labfis.stats.weighted_mean.
+
+    Args:
+        values (Union[labarray, Iterable]): One dimensional labarray, labfloats or numbers.
+        sigmas (float, optional): Number of standard deviations, 2 as in labfloat's ==. Defaults to 2.
+
+    Raises:
+        LabFloatError: A value has zero uncertainty.
+
+    Returns:
+        grouping: The group of each value, each group's weighted mean and size.
+
+    Example:
+        >>> labels, combined, counts = group_compatible(runs)
+
+    """
+    mean, error = _flat(values)
+    if not error.all():
+        raise LabFloatError(
+            "Weighted mean of a value with zero uncertainty: %s",
+            labfloat(mean[error == 0][0]),
+        )
+    low, high = mean - sigmas * error, mean + sigmas * error
+    order = np.argsort(low, kind="stable")
+    low, high = low[order], high[order]
+
+    starts = np.ones(mean.size, dtype=bool)
+    starts[1:] = low[1:] >= np.maximum.accumulate(high)[:-1]
+    labels = np.empty(mean.size, dtype=np.intp)
+    labels[order] = np.cumsum(starts) - 1
+
+    first = np.flatnonzero(starts)
+    weights = error[order] ** -2.0
+    w = np.add.reduceat(weights, first) if first.size else weights
+    wm = np.add.reduceat(weights * mean[order], first) if first.size else weights
+    return grouping(
+        labels, labarray._new(wm / w, w ** -0.5), np.diff(first, append=mean.size)
+    )
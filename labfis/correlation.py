@@ -0,0 +1,296 @@
+from __future__ import annotations
+import logging
+from typing import Union, Dict
+from math import fsum, log, cos, sin, tan, asin, acos, atan
+from numbers import Number
+
+from labfis.uncertainty import labfloat
+from labfis.array import labarray
+
+logger = logging.getLogger(__name__)
+
+
+class source:
+    """An independent measure that corrfloats depend on.
+
+    Sources are compared by identity, they are the keys of the corrfloat's partial
+    derivatives map.
+    """
+
+    __slots__ = ("mean", "uncertainty", "name")
+
+    def __init__(self, mean: object, uncertainty: object, name: str = None):
+        self.mean = mean
+        self.uncertainty = uncertainty
+        self.name = name
+
+    def __repr__(self) -> str:
+        if self.name is not None:
+            return self.name
+        return "source({0}, {1})".format(self.mean, self.uncertainty)
+
+
+class corrfloat(labfloat):
+    """A labfloat that tracks its correlations.
+
+    A corrfloat stores, besides its mean and uncertainty, a sparse map with its partial
+    derivatives with respect to the independent measures it was calculated from. The
+    arithmetic methods combine these maps, so an expression that uses the same measure
+    more than once propagates the error correctly, e.g. x - x has zero uncertainty. The
+    memory used is proportional to the number of measures each value depends on.
+
+    Plain labfloats and numbers used in operations with a corrfloat are treated as
+    independent measures and constants, respectively.
+
+    Examples:
+        >>> x = corrfloat(10, 1, name="x")
+        >>> x - x
+        (0 ± 0.1)
+        >>> y = x * 2 + x
+        >>> y.derivatives
+        {x: 3.0}
+
+    """
+
+    __slots__ = ("_derivatives",)
+
+    def __init__(self, *args, **kwargs):
+        """Create an independent corrfloat.
+
+        The arguments are the same of labfloat's, with an optional name to identify the
+        measure.
+
+        Args:
+            name (str, optional): The measure's name. Defaults to None.
+
+        """
+        name = kwargs.pop("name", None)
+        super().__init__(*args, **kwargs)
+        if self._uncertainty:
+            self._derivatives = {source(self._mean, self._uncertainty, name): 1.0}
+        else:
+            self._derivatives = {}
+
+    @classmethod
+    def _new(cls, mean: object, derivatives: Dict[source, float]) -> corrfloat:
+        """Create a corrfloat from its mean and partial derivatives without parsing the arguments."""
+        obj = object.__new__(cls)
+        obj._mean = mean
+        obj._uncertainty = (
+            fsum([(d * s.uncertainty) ** 2 for s, d in derivatives.items()]) ** 0.5
+        )
+        obj._derivatives = derivatives
+        return obj
+
+    @classmethod
+    def fromlabfloat(cls, value: labfloat, name: str = None) -> corrfloat:
+        """Create an independent corrfloat with the mean and error of a labfloat.
+
+        Args:
+            value (labfloat): The labfloat to be converted.
+            name (str, optional): The measure's name. Defaults to None.
+
+        Returns:
+            corrfloat: The new corrfloat.
+
+        """
+        return cls(value.mean, value.uncertainty, name=name)
+
+    @property
+    def derivatives(self) -> Dict[source, float]:
+        """Dict[source, float]: partial derivatives with respect to the independent measures."""
+        return self._derivatives
+
+    @staticmethod
+    def _map(other: Union[labfloat, Number]) -> Union[Dict[source, float], None]:
+        """Get the derivatives map of an operand, returning None if not supported."""
+        if isinstance(other, corrfloat):
+            return other._derivatives
+        if isinstance(other, labfloat):
+            if other.uncertainty:
+                return {source(other.mean, other.uncertainty): 1.0}
+            return {}
+        if isinstance(other, Number):
+            return {}
+        return None
+
+    @staticmethod
+    def _combine(
+        a: Dict[source, float], da: float, b: Dict[source, float], db: float
+    ) -> Dict[source, float]:
+        """Chain rule of a function of two values, given its partial derivatives da and db."""
+        derivatives = {s: d * da for s, d in a.items()}
+        for s, d in b.items():
+            derivatives[s] = derivatives.get(s, 0.0) + d * db
+        return derivatives
+
+    def _chain(self, mean: object, derivative: float) -> corrfloat:
+        """Chain rule of a function of this value, given its derivative."""
+        return corrfloat._new(
+            mean, {s: d * derivative for s, d in self._derivatives.items()}
+        )
+
+    def __pos__(self) -> corrfloat:
+        return self
+
+    def __neg__(self) -> corrfloat:
+        return self._chain(-self._mean, -1.0)
+
+    def __abs__(self) -> corrfloat:
+        return self._chain(abs(self._mean), -1.0 if self._mean < 0 else 1.0)
+
+    def __add__(self, other: Union[labfloat, Number]) -> corrfloat:
+        derivatives = self._map(other)
+        if derivatives is None:
+            return NotImplemented
+        return corrfloat._new(
+            self._mean + labarray.parts(other)[0],
+            self._combine(self._derivatives, 1.0, derivatives, 1.0),
+        )
+
+    def __radd__(self, other: Union[labfloat, Number]) -> corrfloat:
+        return self.__add__(other)
+
+    def __sub__(self, other: Union[labfloat, Number]) -> corrfloat:
+        derivatives = self._map(other)
+        if derivatives is None:
+            return NotImplemented
+        return corrfloat._new(
+            self._mean - labarray.parts(other)[0],
+            self._combine(self._derivatives, 1.0, derivatives, -1.0),
+        )
+
+    def __rsub__(self, other: Union[labfloat, Number]) -> corrfloat:
+        derivatives = self._map(other)
+        if derivatives is None:
+            return NotImplemented
+        return corrfloat._new(
+            labarray.parts(other)[0] - self._mean,
+            self._combine(self._derivatives, -1.0, derivatives, 1.0),
+        )
+
+    def __mul__(self, other: Union[labfloat, Number]) -> corrfloat:
+        derivatives = self._map(other)
+        if derivatives is None:
+            return NotImplemented
+        m = labarray.parts(other)[0]
+        return corrfloat._new(
+            self._mean * m, self._combine(self._derivatives, m, derivatives, self._mean)
+        )
+
+    def __rmul__(self, other: Union[labfloat, Number]) -> corrfloat:
+        return self.__mul__(other)
+
+    def __div__(self, other: Union[labfloat, Number]) -> corrfloat:
+        derivatives = self._map(other)
+        if derivatives is None:
+            return NotImplemented
+        m = labarray.parts(other)[0]
+        return corrfloat._new(
+            self._mean / m,
+            self._combine(self._derivatives, 1 / m, derivatives, -self._mean / m ** 2),
+        )
+
+    def __rdiv__(self, other: Union[labfloat, Number]) -> corrfloat:
+        derivatives = self._map(other)
+        if derivatives is None:
+            return NotImplemented
+        m = labarray.parts(other)[0]
+        return corrfloat._new(
+            m / self._mean,
+            self._combine(
+                self._derivatives, -m / self._mean ** 2, derivatives, 1 / self._mean
+            ),
+        )
+
+    def __truediv__(self, other: Union[labfloat, Number]) -> corrfloat:
+        return self.__div__(other)
+
+    def __rtruediv__(self, other: Union[labfloat, Number]) -> corrfloat:
+        return self.__rdiv__(other)
+
+    def __pow__(self, other: Union[labfloat, Number]) -> corrfloat:
+        derivatives = self._map(other)
+        if derivatives is None:
+            return NotImplemented
+        m = labarray.parts(other)[0]
+        power = self._mean ** m
+        return corrfloat._new(
+            power,
+            self._combine(
+                self._derivatives,
+                m * self._mean ** (m - 1),
+                derivatives,
+                power * log(abs(self._mean)) if derivatives else 0.0,
+            ),
+        )
+
+    def __rpow__(self, other: Union[labfloat, Number]) -> corrfloat:
+        derivatives = self._map(other)
+        if derivatives is None:
+            return NotImplemented
+        m = labarray.parts(other)[0]
+        power = m ** self._mean
+        return corrfloat._new(
+            power,
+            self._combine(
+                self._derivatives,
+                power * log(abs(m)),
+                derivatives,
+                self._mean * m ** (self._mean - 1) if derivatives else 0.0,
+            ),
+        )
+
+    def sqrt(self) -> corrfloat:
+        return self.__pow__(0.5)
+
+    def cos(self) -> corrfloat:
+        return self._chain(cos(self._mean), -sin(self._mean))
+
+    def sin(self) -> corrfloat:
+        return self._chain(sin(self._mean), cos(self._mean))
+
+    def tan(self) -> corrfloat:
+        return self._chain(tan(self._mean), cos(self._mean) ** -2)
+
+    def arcsin(self) -> corrfloat:
+        return self._chain(asin(self._mean), (1 - self._mean ** 2) ** -0.5)
+
+    def arccos(self) -> corrfloat:
+        return self._chain(acos(self._mean), -((1 - self._mean ** 2) ** -0.5))
+
+    def arctan(self) -> corrfloat:
+        return self._chain(atan(self._mean), 1 / (1 + self._mean ** 2))
+
+
+def covariance(a: corrfloat, b: corrfloat) -> float:
+    """Calculate the covariance between two corrfloats.
+
+    Args:
+        a (corrfloat): First value.
+        b (corrfloat): Second value.
+
+    Returns:
+        float: The covariance.
+
+    """
+    if len(b.derivatives) < len(a.derivatives):
+        a, b = b, a
+    bd = b.derivatives
+    return fsum(
+        [d * bd[s] * s.uncertainty ** 2 for s, d in a.derivatives.items() if s in bd]
+    )
+
+
+def correlation(a: corrfloat, b: corrfloat) -> float:
+    """Calculate the correlation coefficient between two corrfloats.
+
+    Args:
+        a (corrfloat): First value.
+        b (corrfloat): Second value.
+
+    Returns:
+        float: The correlation coefficient, between -1 and 1.
+
+    """
+    return covariance(a, b) / (a.uncertainty * b.uncertainty)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import logging
+from collections.abc import Callable, Iterable
+from typing import Tuple, NamedTuple
+
+import numpy as np
+
+from labfis.uncertainty import LabFloatError
+from labfis.array import labarray
+from labfis.autodiff import dual
+
+logger = logging.getLogger(__name__)
+
+
+class covresult(NamedTuple):
+    """Result of a covariance propagation."""
+
+    mean: np.ndarray
+    """np.ndarray: The outputs' means, with shape (..., m)."""
+    covariance: np.ndarray
+    """np.ndarray: The outputs' covariance matrices, with shape (..., m, m)."""
+    jacobian: np.ndarray
+    """np.ndarray: The jacobian of the function, with shape (..., m, n)."""
+
+    @property
+    def uncertainty(self) -> np.ndarray:
+        """np.ndarray: The outputs' standard deviations."""
+        return np.sqrt(np.diagonal(self.covariance, axis1=-2, axis2=-1))
+
+    @property
+    def correlation(self) -> np.ndarray:
+        """np.ndarray: The outputs' correlation matrices."""
+        u = self.uncertainty
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.covariance / (u[..., :, np.newaxis] * u[..., np.newaxis, :])
+
+    @property
+    def values(self) -> labarray:
+        """labarray: The outputs' means and standard deviations, without correlations."""
+        return labarray._new(self.mean, self.uncertainty)
+
+
+def jacobian(f: Callable, means: Iterable) -> Tuple[np.ndarray]:
+    """Evaluate a vector function and its jacobian with dual numbers.
+
+    The function takes n arguments and returns one value or a sequence of m values.
+    With a (batch, n) array of means the function is evaluated once over whole arrays
+    of shape (batch,), giving the jacobian of every system at once.
+
+    Args:
+        f (Callable): The function, of n arguments.
+        means (Iterable): The (n,) or (..., n) arguments.
+
+    Returns:
+        Tuple[np.ndarray]: The (..., m) values and the (..., m, n) jacobian.
+
+    """
+    means = np.asarray(means, dtype=np.float64)
+    n = means.shape[-1]
+    shape = means.shape[:-1]
+    identity = np.eye(n)
+    if shape:
+        grad = (n,) + (1,) * len(shape)
+        args = [dual(means[..., i], identity[i].reshape(grad)) for i in range(n)]
+    else:
+        args = [dual(float(means[i]), identity[i]) for i in range(n)]
+
+    result = f(*args)
+    outputs = result if isinstance(result, (tuple, list)) else (result,)
+    values = np.stack(
+        [np.broadcast_to(getattr(y, "value", y), shape) for y in outputs], axis=-1
+    )
+    grads = np.stack(
+        [np.broadcast_to(getattr(y, "grad", 0.0), (n,) + shape) for y in outputs]
+    )
+    return values, np.moveaxis(grads, (0, 1), (-2, -1))
+
+
+def propagate_covariance(
+    f: Callable, values: Iterable, covariance: np.ndarray = None
+) -> covresult:
+    """Propagate the covariance of the arguments through a vector function, J Σ Jᵀ.
+
+    The arguments are either labfloats or a labarray, whose errors are independent, or
+    their means and covariance matrix. Many independent systems are propagated at once
+    by passing (batch, n) means with a (n, n) or (batch, n, n) covariance: the
+    function and its jacobian are evaluated over whole arrays and the products are
+    done as a single stacked matrix multiplication. The function must be written with
+    the arithmetic operators and the functions of labfis.autodiff or labfis.umath.
+
+    Args:
+        f (Callable): The function, of n arguments, returning m values.
+        values (Iterable): labfloats or a (..., n) labarray, or the (..., n) means if covariance is passed.
+        covariance (np.ndarray, optional): The (n, n) or (..., n, n) covariance. Defaults to the errors squared.
+
+    Raises:
+        LabFloatError: The covariance's shape does not match the means.
+
+    Returns:
+        covresult: The outputs' means, covariance and the jacobian.
+
+    Example:
+        >>> polar = labarray(np.column_stack([r, theta]), np.column_stack([dr, dtheta]))
+        >>> propagate_covariance(lambda r, t: (r * cos(t), r * sin(t)), polar).covariance
+
+    """
+    if covariance is None:
+        if not isinstance(values, labarray):
+            values = labarray(values)
+        means, errors = values.mean, values.uncertainty
+        covariance = (
+            errors[..., np.newaxis]
+            * np.eye(errors.shape[-1])
+            * errors[..., np.newaxis, :]
+        )
+    else:
+        means = np.asarray(
+            values.mean if isinstance(values, labarray) else values, dtype=np.float64
+        )
+        covariance = np.asarray(covariance, dtype=np.float64)
+    n = means.shape[-1]
+    if covariance.shape[-2:] != (n, n):
+        raise LabFloatError(2, means, covariance)
+
+    mean, jac = jacobian(f, means)
+    return covresult(mean, jac @ covariance @ np.swapaxes(jac, -1, -2), jac)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+import logging
+from collections.abc import Iterable, Callable
+from typing import Tuple, NamedTuple
+
+import numpy as np
+
+from labfis.uncertainty import LabFloatError
+from labfis.array import labarray
+from labfis.autodiff import dual
+
+logger = logging.getLogger(__name__)
+
+
+class fitresult(NamedTuple):
+    """Result of a least squares fit."""
+
+    parameters: labarray
+    """labarray: The fitted parameters, each indexed as a labfloat."""
+    covariance: np.ndarray
+    """np.ndarray: The parameters' covariance matrix."""
+    chi2: float
+    """float: The chi-square of the fit."""
+    ndof: int
+    """int: The number of degrees of freedom."""
+    residuals: np.ndarray
+    """np.ndarray: The data minus the fitted model."""
+
+
+def _data(values: Iterable) -> Tuple[np.ndarray]:
+    """Get the means and errors of a labarray, labfloats or numbers as float arrays."""
+    if not isinstance(values, labarray):
+        values = labarray(values)
+    return values.mean.ravel(), values.uncertainty.ravel()
+
+
+def _sigma(yerr: np.ndarray) -> Tuple[np.ndarray, bool]:
+    """Get the errors used as weights, unitary if the data has no errors.
+
+    Raises:
+        LabFloatError: Only some of the values have zero uncertainty.
+
+    Returns:
+        Tuple[np.ndarray, bool]: The errors and if the covariance must be scaled by the residuals.
+
+    """
+    if not yerr.any():
+        return np.ones_like(yerr), True
+    if not yerr.all():
+        raise LabFloatError("Can't fit data with some values with zero uncertainty.")
+    return yerr, False
+
+
+def _result(
+    parameters: np.ndarray,
+    covariance: np.ndarray,
+    residuals: np.ndarray,
+    sigma: np.ndarray,
+    scale: bool,
+) -> fitresult:
+    """Pack the fit result, scaling the covariance by the reduced chi-square if needed."""
+    chi2 = float(np.sum((residuals / sigma) ** 2))
+    ndof = residuals.size - parameters.size
+    if scale and ndof > 0:
+        covariance = covariance * chi2 / ndof
+    return fitresult(
+        labarray(parameters, np.sqrt(np.diag(covariance))),
+        covariance,
+        chi2,
+        ndof,
+        residuals,
+    )
+
+
+def polyfit(
+    x: Iterable, y: Iterable, degree: int = 1, iterations: int = 5
+) -> fitresult:
+    """Fit a polynomial to data by weighted least squares.
+
+    The parameters are in ascending order, y = p[0] + p[1]*x + p[2]*x**2 + ... The
+    whole fit is done with numpy over the arrays of data. If x has uncertainties, the
+    effective variance method is used, where the x errors are projected in y by the
+    model's slope, sigma**2 = ey**2 + (dy/dx * ex)**2, and the fit is repeated.
+
+    Args:
+        x (Iterable): Independent variable, labarray, labfloats or numbers.
+        y (Iterable): Dependent variable, labarray, labfloats or numbers.
+        degree (int, optional): The polynomial's degree. Defaults to 1.
+        iterations (int, optional): Maximum number of effective variance iterations. Defaults to 5.
+
+    Returns:
+        fitresult: The parameters, their covariance, the chi-square and the residuals.
+
+    Example:
+        >>> (a, b), cov, chi2, ndof, residuals = polyfit(x, y)
+
+    """
+    xm, xe = _data(x)
+    ym, ye = _data(y)
+    if xm.shape != ym.shape:
+        raise LabFloatError(2, xm, ym)
+
+    design = np.vander(xm, degree + 1, increasing=True)
+    sigma, scale = _sigma(ye)
+
+    parameters = None
+    for _ in range(iterations if xe.any() else 1):
+        weighted = design / sigma[:, np.newaxis]
+        previous = parameters
+        parameters = np.linalg.lstsq(weighted, ym / sigma, rcond=None)[0]
+        if xe.any():
+            slope = np.polynomial.polynomial.polyval(
+                xm, np.polynomial.polynomial.polyder(parameters)
+            )
+            sigma = np.sqrt(ye ** 2 + (slope * xe) ** 2)
+            scale = False
+        if previous is not None and np.allclose(parameters, previous, rtol=1e-10):
+            break
+
+    weighted = design / sigma[:, np.newaxis]
+    covariance = np.linalg.inv(weighted.T @ weighted)
+    residuals = ym - design @ parameters
+    return _result(parameters, covariance, residuals, sigma, scale)
+
+
+def linear_fit(x: Iterable, y: Iterable) -> fitresult:
+    """Fit a line y = a + b*x to data by weighted least squares.
+
+    Args:
+        x (Iterable): Independent variable, labarray, labfloats or numbers.
+        y (Iterable): Dependent variable, labarray, labfloats or numbers.
+
+    Returns:
+        fitresult: The parameters (a, b), their covariance, the chi-square and the residuals.
+
+    """
+    return polyfit(x, y, 1)
+
+
+def _jacobian(f: Callable, x: np.ndarray, parameters: np.ndarray) -> Tuple[np.ndarray]:
+    """Evaluate the model and its jacobian with respect to the parameters.
+
+    The jacobian is calculated exactly with duals, or by central differences if the
+    model can not be evaluated with duals.
+
+    Returns:
+        Tuple[np.ndarray]: The model's values and the (points, parameters) jacobian.
+
+    """
+    k = parameters.size
+    identity = np.eye(k)
+    try:
+        result = f(
+            x, *[dual(p, identity[i].reshape(k, 1)) for i, p in enumerate(parameters)]
+        )
+    except TypeError:
+        result = None
+    if isinstance(result, dual):
+        value = np.broadcast_to(result.value, x.shape)
+        return value, np.broadcast_to(result.grad, (k,) + x.shape).T
+
+    value = np.broadcast_to(f(x, *parameters), x.shape)
+    jacobian = np.empty(x.shape + (k,))
+    for i in range(k):
+        step = 1e-6 * max(abs(parameters[i]), 1.0)
+        up, down = parameters.copy(), parameters.copy()
+        up[i] += step
+        down[i] -= step
+        jacobian[:, i] = (f(x, *up) - f(x, *down)) / (2 * step)
+    return value, jacobian
+
+
+def curve_fit(
+    f: Callable,
+    x: Iterable,
+    y: Iterable,
+    p0: Iterable,
+    maxiter: int = 100,
+    tol: float = 1e-10,
+) -> fitresult:
+    """Fit a nonlinear model to data using the Levenberg-Marquardt algorithm.
+
+    The model f(x, *parameters) is evaluated over the whole array of x at once, and its
+    jacobian is calculated exactly with dual numbers when the model is written with the
+    arithmetic operators and the labfis.autodiff functions, or else by central
+    differences. If x has uncertainties, the effective variance method is used.
+
+    Args:
+        f (Callable): The model, f(x, *parameters).
+        x (Iterable): Independent variable, labarray, labfloats or numbers.
+        y (Iterable): Dependent variable, labarray, labfloats or numbers.
+        p0 (Iterable): The parameters' initial guess.
+        maxiter (int, optional): Maximum number of iterations. Defaults to 100.
+        tol (float, optional): Relative chi-square change to stop. Defaults to 1e-10.
+
+    Returns:
+        fitresult: The parameters, their covariance, the chi-square and the residuals.
+
+    Example:
+        >>> curve_fit(lambda t, a, k: a * exp(-k * t), t, y, [1, 0.1])
+
+    """
+    xm, xe = _data(x)
+    ym, ye = _data(y)
+    if xm.shape != ym.shape:
+        raise LabFloatError(2, xm, ym)
+    sigma, scale = _sigma(ye)
+    parameters = np.array(p0, dtype=np.float64)
+
+    value, jacobian = _jacobian(f, xm, parameters)
+    chi2 = np.sum(((ym - value) / sigma) ** 2)
+    damping = 1e-3
+    for _ in range(maxiter):
+        if xe.any():
+            step = 1e-6 * np.maximum(np.abs(xm), 1.0)
+            slope = (f(xm + step, *parameters) - f(xm - step, *parameters)) / (2 * step)
+            sigma = np.sqrt(ye ** 2 + (slope * xe) ** 2)
+            scale = False
+            chi2 = np.sum(((ym - value) / sigma) ** 2)
+
+        weighted = jacobian / sigma[:, np.newaxis]
+        alpha = weighted.T @ weighted
+        beta = weighted.T @ ((ym - value) / sigma)
+        while True:
+            delta = np.linalg.solve(alpha + damping * np.diag(np.diag(alpha)), beta)
+            trial = parameters + delta
+            trial_value = np.broadcast_to(f(xm, *trial), xm.shape)
+            trial_chi2 = np.sum(((ym - trial_value) / sigma) ** 2)
+            if trial_chi2 <= chi2 or damping > 1e10:
+                break
+            damping *= 10
+        if trial_chi2 > chi2:
+            break
+
+        done = chi2 - trial_chi2 <= tol * chi2
+        parameters, chi2 = trial, trial_chi2
+        damping = max(damping / 10, 1e-12)
+        value, jacobian = _jacobian(f, xm, parameters)
+        if done:
+            break
+
+    weighted = jacobian / sigma[:, np.newaxis]
+    covariance = np.linalg.inv(weighted.T @ weighted)
+    return _result(parameters, covariance, ym - value, sigma, scale)
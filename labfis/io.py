@@ -0,0 +1,400 @@
+from __future__ import annotations
+import csv
+import json
+import logging
+import os
+import re
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from itertools import islice
+from typing import Union, Tuple, List, Dict, TextIO, BinaryIO, NamedTuple
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.array import labarray
+
+logger = logging.getLogger(__name__)
+
+_separators = ("±", "+/-", "+-")
+"""tuple: Separators of mean and error accepted in a single cell."""
+
+_cells = re.compile(r"\([^)]*\)|[^\s(]+")
+"""re.Pattern: Cells of a whitespace delimited line, a cell in parenthesis may have spaces."""
+
+
+def parse(cell: str) -> Tuple[float]:
+    """Parse a mean and error from a string.
+
+    Accepts labfloat's string representation "(mean ± error)", the same without
+    parenthesis or with "+/-" or "+-" as separator, and plain numbers, whose error is
+    zero.
+
+    Args:
+        cell (str): The string to be parsed.
+
+    Raises:
+        LabFloatError: The string is not a number or a mean and error pair.
+
+    Returns:
+        Tuple[float]: The mean and the error.
+
+    """
+    try:
+        return float(cell), 0.0
+    except ValueError:
+        pass
+    text = cell.strip().lstrip("(").rstrip(")")
+    for separator in _separators:
+        mean, found, error = text.partition(separator)
+        if found:
+            try:
+                return float(mean), abs(float(error))
+            except ValueError:
+                break
+    raise LabFloatError("Can't parse a labfloat from: '%s'", cell)
+
+
+@contextmanager
+def _open(file: Union[str, TextIO, BinaryIO], mode: str = "r") -> Iterator[TextIO]:
+    """Open a path, or use an already opened file object."""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, mode, encoding=None if "b" in mode else "utf-8") as f:
+            yield f
+    else:
+        yield file
+
+
+def _indices(columns: Iterable, names: List[str]) -> List[Tuple[int]]:
+    """Convert the column specification to (mean, error) indices, error is None for single cells."""
+
+    def index(column: Union[int, str]) -> int:
+        if isinstance(column, int):
+            return column
+        try:
+            return names.index(column)
+        except ValueError:
+            raise LabFloatError("Column '%s' not found in header: %s", column, names)
+
+    indices = []
+    for column in columns:
+        if isinstance(column, (tuple, list)):
+            indices.append((index(column[0]), index(column[1])))
+        else:
+            indices.append((index(column), None))
+    return indices
+
+
+def _data(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """The numbered lines without comments, from # to the end of the line, and blank lines."""
+    for number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0]
+        if line.strip():
+            yield number, line
+
+
+def _split(lines: List[str], delimiter: Union[str, None]) -> Iterator[List[str]]:
+    if delimiter is None:
+        return (_cells.findall(line) for line in lines)
+    return csv.reader(lines, delimiter=delimiter)
+
+
+def _block(
+    rows: List[Tuple[int, str]],
+    indices: List[Tuple[int]],
+    delimiter: Union[str, None],
+) -> Tuple[labarray]:
+    """Parse a chunk of numbered lines to one labarray for each column."""
+    numbers, lines = zip(*rows)
+    usecols = sorted({i for pair in indices for i in pair if i is not None})
+    # numpy splits "(mean ± error)" cells at their spaces, shifting the columns after them
+    if delimiter is not None or not any("(" in line for line in lines):
+        try:
+            # fast path, all the used cells are plain numbers
+            data = np.loadtxt(
+                lines, delimiter=delimiter, usecols=usecols, ndmin=2, comments=None
+            )
+            position = {c: k for k, c in enumerate(usecols)}
+            return tuple(
+                labarray._new(
+                    data[:, position[m]],
+                    np.abs(data[:, position[e]])
+                    if e is not None
+                    else np.zeros(len(lines)),
+                )
+                for m, e in indices
+            )
+        except ValueError:
+            pass
+
+    means = [[] for _ in indices]
+    errors = [[] for _ in indices]
+    needed = usecols[-1] + 1 if usecols else 0
+    for number, cells in zip(numbers, _split(lines, delimiter)):
+        if len(cells) < needed:
+            raise LabFloatError(
+                "Line %s has %s cells, expected at least %s.",
+                number,
+                len(cells),
+                needed,
+            )
+        for k, (m, e) in enumerate(indices):
+            if e is None:
+                mean, error = parse(cells[m])
+            else:
+                mean, error = float(cells[m]), float(cells[e])
+            means[k].append(mean)
+            errors[k].append(error)
+    return tuple(labarray(m, e) for m, e in zip(means, errors))
+
+
+def read_chunks(
+    file: Union[str, TextIO],
+    columns: Iterable = None,
+    delimiter: Union[str, None] = ",",
+    header: bool = True,
+    chunksize: int = 100000,
+) -> Iterator[Tuple[labarray]]:
+    """Read a delimited text file in chunks of labarrays.
+
+    Each column is either a single column whose cells are numbers or "mean ± error"
+    strings, or a (mean, error) pair of columns. Text from # to the end of a line is a
+    comment and blank lines are skipped, also before the header. With whitespace as
+    delimiter the "mean ± error" cells must be in parenthesis, as labfloat prints them.
+    Only chunksize lines are kept in memory at a time, so the memory used does not
+    depend on the file's size. Chunks of plain numbers are parsed by numpy.
+
+    Args:
+        file (Union[str, TextIO]): Path or file object.
+        columns (Iterable, optional): Column names or indices, or pairs of them for mean and error. Defaults to all single columns.
+        delimiter (Union[str, None], optional): The cells' delimiter, None for whitespace. Defaults to ",".
+        header (bool, optional): If the first line has the columns' names. Defaults to True.
+        chunksize (int, optional): Number of lines in each chunk. Defaults to 100000.
+
+    Raises:
+        LabFloatError: A column is not in the header, or a line has too few cells or a cell can't be parsed.
+
+    Yields:
+        Tuple[labarray]: One labarray for each column.
+
+    Example:
+        >>> for x, y in read_chunks("data.csv", [("x", "dx"), "y"]):
+        ...     process(x, y)
+
+    """
+    with _open(file) as f:
+        data = _data(f)
+        names = []
+        if header:
+            for _, first in islice(data, 1):
+                names = [n.strip() for n in next(_split([first], delimiter))]
+        rows = list(islice(data, chunksize))
+        if columns is None:
+            first = [line for _, line in rows[:1]]
+            count = len(names) or len(next(_split(first, delimiter), []))
+            columns = range(count)
+        indices = _indices(columns, names)
+        while rows:
+            yield _block(rows, indices, delimiter)
+            rows = list(islice(data, chunksize))
+
+
+def read_rows(
+    file: Union[str, TextIO],
+    columns: Iterable = None,
+    delimiter: Union[str, None] = ",",
+    header: bool = True,
+    chunksize: int = 100000,
+) -> Iterator[Tuple[labfloat]]:
+    """Read a delimited text file row by row.
+
+    The same as read_chunks, but yielding one tuple of labfloats for each line.
+
+    Args:
+        file (Union[str, TextIO]): Path or file object.
+        columns (Iterable, optional): Column names or indices, or pairs of them for mean and error. Defaults to all single columns.
+        delimiter (Union[str, None], optional): The cells' delimiter, None for whitespace. Defaults to ",".
+        header (bool, optional): If the first line has the columns' names. Defaults to True.
+        chunksize (int, optional): Number of lines parsed at a time. Defaults to 100000.
+
+    Yields:
+        Tuple[labfloat]: One labfloat for each column.
+
+    """
+    for block in read_chunks(file, columns, delimiter, header, chunksize):
+        yield from zip(*block)
+
+
+_magic = b"LABFIS\x00\x01"
+"""bytes: First bytes of a labfis binary file, with the format's version."""
+
+_align = 64
+"""int: Alignment in bytes of the binary file's data blocks."""
+
+
+class labdata(NamedTuple):
+    """Content of a labfis binary file."""
+
+    columns: Dict[str, labarray]
+    """Dict[str, labarray]: The columns by name, in the order they were saved."""
+    metadata: dict
+    """dict: The metadata saved with the columns."""
+
+
+def save(file: Union[str, BinaryIO], columns: Dict[str, object], metadata: dict = None):
+    """Save labarrays to a binary file.
+
+    The file has a small JSON header, with the columns' names, shapes and positions and
+    the metadata, followed by one little endian float64 block for each column, with its
+    means and then its uncertainties. Each column's block starts at a 64 bytes aligned
+    position, and the arrays are written directly from their memory, without copies
+    unless they are not contiguous little endian float64. It can be opened with load
+    without reading the data, see load.
+
+    Args:
+        file (Union[str, BinaryIO]): Path or binary file object.
+        columns (Dict[str, object]): Columns by name, labarrays or anything that labarray accepts.
+        metadata (dict, optional): JSON serializable metadata. Defaults to None.
+
+    Example:
+        >>> save("data.lab", {"t": t, "v": v}, {"unit": "m/s"})
+
+    """
+    arrays = {
+        name: array if isinstance(array, labarray) else labarray(array)
+        for name, array in columns.items()
+    }
+
+    entries = []
+    offset = 0
+    for name, array in arrays.items():
+        entries.append({"name": name, "shape": list(array.shape), "offset": offset})
+        offset += -(-2 * array.size * 8 // _align) * _align
+    header = json.dumps({"columns": entries, "metadata": metadata or {}}).encode()
+    start = -(-(len(_magic) + 8 + len(header)) // _align) * _align
+
+    with _open(file, "wb") as f:
+        f.write(_magic)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        written = len(_magic) + 8 + len(header)
+        for entry, array in zip(entries, arrays.values()):
+            f.write(b"\x00" * (start + entry["offset"] - written))
+            written = start + entry["offset"]
+            for data in (array.mean, array.uncertainty):
+                f.write(memoryview(np.ascontiguousarray(data, dtype="<f8")))
+                written += data.size * 8
+
+
+def load(file: Union[str, BinaryIO], mmap: bool = True) -> labdata:
+    """Load labarrays from a binary file written by save.
+
+    By default the columns are memory mapped, only the header is read and the data is
+    read from the disk as each part is used, so slices of huge datasets can be used
+    without loading the whole file in memory. Memory mapping needs a path or a file
+    object of a file on disk, the columns of other file objects, like io.BytesIO, are
+    read to memory.
+
+    Args:
+        file (Union[str, BinaryIO]): Path or binary file object.
+        mmap (bool, optional): If the columns are memory mapped, or else read to memory. Defaults to True.
+
+    Raises:
+        LabFloatError: The file is not a labfis binary file, or it is truncated.
+
+    Returns:
+        labdata: The columns by name and the metadata.
+
+    Example:
+        >>> t, v = load("data.lab").columns.values()
+        >>> propagate(lambda t, v: v * t, t[:1000], v[:1000])
+
+    """
+    with _open(file, "rb") as f:
+        if f.read(len(_magic)) != _magic:
+            raise LabFloatError("Not a labfis binary file: '%s'", file)
+        size = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(size).decode())
+        start = -(-(len(_magic) + 8 + size) // _align) * _align
+        if mmap and not isinstance(file, (str, os.PathLike)):
+            try:
+                f.fileno()
+            except (AttributeError, OSError):
+                mmap = False
+
+        columns = {}
+        for entry in header["columns"]:
+            shape = tuple(entry["shape"])
+            count = int(np.prod(shape, dtype=np.int64))
+            offset = start + entry["offset"]
+            if mmap and count:
+                data = np.memmap(
+                    f, dtype="<f8", mode="r", offset=offset, shape=(2, count)
+                )
+            else:
+                data = np.empty((2, count), dtype="<f8")
+                f.seek(offset)
+                if f.readinto(data) != data.nbytes:
+                    raise LabFloatError("Truncated labfis binary file: '%s'", file)
+            columns[entry["name"]] = labarray._new(
+                data[0].reshape(shape), data[1].reshape(shape)
+            )
+    return labdata(columns, header["metadata"])
+
+
+_packed = b"LABFISP\x01"
+"""bytes: First bytes of a buffer written by pack, with the format's version."""
+
+
+def pack(values: Union[labarray, Iterable]) -> bytes:
+    """Pack labfloats in a single bytes buffer.
+
+    The buffer has the number of values followed by all the means and then all the
+    errors as little endian float64, so it is much smaller and faster to write and read
+    than a pickle of the labfloats, e.g. for caches or to send results to other
+    processes. The means and errors are converted to float64.
+
+    Args:
+        values (Union[labarray, Iterable]): labfloats or a labarray, which is flattened.
+
+    Returns:
+        bytes: The packed values.
+
+    Example:
+        >>> unpack(pack([labfloat(1, 0.1), labfloat(2, 0.2)]))
+
+    """
+    if not isinstance(values, labarray):
+        values = labarray(list(values))
+    return b"".join(
+        [
+            _packed,
+            values.size.to_bytes(8, "little"),
+            np.ascontiguousarray(values.mean, dtype="<f8").tobytes(),
+            np.ascontiguousarray(values.uncertainty, dtype="<f8").tobytes(),
+        ]
+    )
+
+
+def unpack(data: bytes, array: bool = False) -> Union[List[labfloat], labarray]:
+    """Unpack labfloats from a buffer written by pack.
+
+    Args:
+        data (bytes): The packed values.
+        array (bool, optional): If the values are returned as a labarray, viewing the buffer. Defaults to False.
+
+    Raises:
+        LabFloatError: The buffer was not written by pack.
+
+    Returns:
+        Union[List[labfloat], labarray]: The values, as a list of labfloats or a labarray.
+
+    """
+    if bytes(data[: len(_packed)]) != _packed:
+        raise LabFloatError("Not a buffer of packed labfloats.")
+    count = int.from_bytes(data[len(_packed) : len(_packed) + 8], "little")
+    values = np.frombuffer(data, dtype="<f8", count=2 * count, offset=len(_packed) + 8)
+    values = values.reshape(2, count)
+    if array:
+        return labarray._new(values[0], values[1])
+    return labarray._new(values[0], values[1]).tolist()
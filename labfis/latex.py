@@ -0,0 +1,147 @@
+from __future__ import annotations
+import logging
+from collections.abc import Iterable, Iterator
+from itertools import starmap
+from typing import Union, Tuple, Callable, TextIO
+
+from labfis.uncertainty import LabFloatError
+from labfis.rounding import round_pair
+
+logger = logging.getLogger(__name__)
+
+
+def _power(number: str) -> str:
+    """Convert the exponent of a formated number to LaTex's power of ten."""
+    mantissa, e, exponent = number.partition("e")
+    if e:
+        return mantissa + r"\cdot 10^{" + exponent + "}"
+    return mantissa
+
+
+def texformatter(
+    precision: Union[Tuple[int], int] = None, round_p: int = 0
+) -> Callable[[object, object], str]:
+    """Create a function that converts a mean and error to LaTex format.
+
+    The format strings are built only once, so the returned function can be used to
+    convert a whole column of values. The precision is the number of decimal places
+    used in the scientific notation, and when it is passed the values are rounded at
+    round_p decimal places before formatting. If no precision is passed, the values
+    are rounded at the error's most significant figure, the same as labfloat's str.
+
+    Args:
+        precision (Union[Tuple[int], int], optional): A tuple containing the mean's and error's precision or only one for both precisions. Defaults to None.
+        round_p (int, optional): Number of decimals to use when rounding. Defaults to 0.
+
+    Raises:
+        LabFloatError: Error in parsing arguments, where the number of precision tuple is greater than 2.
+
+    Returns:
+        Callable[[object, object], str]: Function of the mean and error returning the LaTex string.
+
+    """
+    if isinstance(precision, tuple):
+        if len(precision) > 2:
+            raise LabFloatError(4, precision)
+        mfmt = "{{:.{0}e}}".format(int(precision[0])).format
+        ufmt = "{{:.{0}e}}".format(int(precision[-1])).format
+    elif precision is not None:
+        mfmt = ufmt = "{{:.{0}e}}".format(int(precision)).format
+    else:
+        mfmt = ufmt = "{:g}".format
+
+    def tex(mean: object, uncertainty: object) -> str:
+        if uncertainty == 0:
+            if precision is None:
+                mean = round_pair(mean, uncertainty)[0]
+            return _power(mfmt(mean))
+
+        if precision is None:
+            mean, uncertainty = round_pair(mean, uncertainty)
+        else:
+            mean, uncertainty = round_pair(mean, uncertainty, round_p)
+        return r"({0}\, \pm \,{1})".format(
+            _power(mfmt(mean)), _power(ufmt(uncertainty))
+        )
+
+    return tex
+
+
+def _pairs(column: Iterable) -> Iterator[Tuple[object]]:
+    """Iterate over the means and errors of a labarray, labfloats or numbers."""
+    if hasattr(column, "mean") and hasattr(column, "uncertainty"):
+        return zip(column.mean.tolist(), column.uncertainty.tolist())
+    return (
+        (x.mean, x.uncertainty) if hasattr(x, "uncertainty") else (x, 0) for x in column
+    )
+
+
+def texrows(
+    *columns: Iterable, precision: Union[list, Tuple[int], int] = None, round_p: int = 0
+) -> Iterator[str]:
+    """Generate the rows of a LaTex table from columns of labfloats.
+
+    Args:
+        *columns (Iterable): labarrays or sequences of labfloats or numbers.
+        precision (Union[list, Tuple[int], int], optional): Precision used in all columns, or a list with each column's precision. Defaults to None.
+        round_p (int, optional): Number of decimals to use when rounding. Defaults to 0.
+
+    Raises:
+        LabFloatError: The list of precisions does not have one precision for each column.
+
+    Yields:
+        str: A table row, with the cells separated by "&" and ending with a line break.
+
+    """
+    if not isinstance(precision, list):
+        precision = [precision] * len(columns)
+    elif len(precision) != len(columns):
+        raise LabFloatError(
+            "Expected %s precisions, one for each column, got: %s",
+            len(columns),
+            precision,
+        )
+    formatters = [texformatter(p, round_p) for p in precision]
+
+    cells = [starmap(tex, _pairs(column)) for tex, column in zip(formatters, columns)]
+    for row in zip(*cells):
+        yield " & ".join(row) + r" \\" + "\n"
+
+
+def textable(
+    file: TextIO,
+    *columns: Iterable,
+    header: Iterable[str] = None,
+    precision: Union[list, Tuple[int], int] = None,
+    round_p: int = 0,
+    align: str = None,
+) -> None:
+    """Write a LaTex tabular of columns of labfloats to a file object.
+
+    The rows are written as they are formatted, so the table is never entirely kept
+    in memory.
+
+    Args:
+        file (TextIO): File object where the table will be written.
+        *columns (Iterable): labarrays or sequences of labfloats or numbers.
+        header (Iterable[str], optional): The columns' titles. Defaults to None.
+        precision (Union[list, Tuple[int], int], optional): Precision used in all columns, or a list with each column's precision. Defaults to None.
+        round_p (int, optional): Number of decimals to use when rounding. Defaults to 0.
+        align (str, optional): tabular's column specification. Defaults to all columns centered.
+
+    Example:
+        >>> with open("table.tex", "w") as f:
+        ...     textable(f, x, y, header=["$x$ (m)", "$y$ (m)"])
+
+    """
+    if align is None:
+        align = "c" * len(columns)
+
+    file.write(r"\begin{tabular}{" + align + "}\n")
+    file.write(r"\hline" + "\n")
+    if header is not None:
+        file.write(" & ".join(header) + r" \\" + "\n")
+        file.write(r"\hline" + "\n")
+    file.writelines(texrows(*columns, precision=precision, round_p=round_p))
+    file.write(r"\hline" + "\n")
+    file.write(r"\end{tabular}" + "\n")
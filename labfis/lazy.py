@@ -0,0 +1,348 @@
+from __future__ import annotations
+import logging
+import math
+from collections.abc import Iterable, Callable
+from typing import Union, Tuple, List
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.array import labarray
+from labfis.umath import _unary
+
+logger = logging.getLogger(__name__)
+
+_templates = {
+    "add": ("{a} + {b}", "{g}", "{g}"),
+    "sub": ("{a} - {b}", "{g}", "-{g}"),
+    "mul": ("{a} * {b}", "{g} * {b}", "{g} * {a}"),
+    "div": ("{a} / {b}", "{g} / {b}", "-{g} * {x} / {b}"),
+    "pow": ("{a} ** {b}", "{g} * {b} * {a} ** ({b} - 1)", "{g} * {x} * log(abs({a}))"),
+}
+"""dict: Code of the binary operations and of the adjoint of each operand, given the
+operands a and b, the result x and the result's adjoint g."""
+
+
+class node:
+    """A node of a lazy expression graph.
+
+    Operations with nodes do not calculate anything, they record the operation and its
+    operands. The graph is compiled once to a Python function, see graph, that
+    evaluates it over plain floats or numpy arrays without any intermediate labfloat,
+    with a single backward pass for the derivatives of the result with respect to each
+    input. The uncertainty is the square root of the summed variances, taken once at the
+    end. The compiled graph is cached and can be evaluated again with new inputs.
+
+    As the derivatives are exact, an input used many times is correlated with itself,
+    e.g. x - x has zero uncertainty, unlike the same expression with labfloats.
+
+    Examples:
+        >>> a, b = lazy(labfloat(2, 0.1), "a"), lazy(labfloat(3, 0.2), "b")
+        >>> y = (a * b + a / b) ** 2
+        >>> y.evaluate()
+        >>> y.evaluate(a=labfloat(4, 0.1))
+
+    """
+
+    __slots__ = ("op", "args", "value", "name", "_graph")
+
+    __array_ufunc__ = None
+    """None: Make numpy arrays defer the arithmetic operators to node."""
+
+    def __init__(
+        self, op: str, args: Tuple[node] = (), value: object = None, name: str = None
+    ):
+        self.op = op
+        self.args = args
+        self.value = value
+        self.name = name
+        self._graph = None
+
+    def __repr__(self) -> str:
+        if self.op == "var":
+            return self.name or "var({0})".format(self.value)
+        if self.op == "const":
+            return repr(self.value)
+        return "{0}({1})".format(self.op, ", ".join(repr(a) for a in self.args))
+
+    @staticmethod
+    def _wrap(other: object) -> Union[node, None]:
+        """Convert an operand to node, labfloats are new inputs and numbers constants."""
+        if isinstance(other, node):
+            return other
+        if isinstance(other, (labfloat, labarray)):
+            return node("var", value=other)
+        if isinstance(other, (Number, np.ndarray)):
+            return node("const", value=other)
+        return None
+
+    def _binary(self, op: str, other: object, reflected: bool = False) -> node:
+        other = self._wrap(other)
+        if other is None:
+            return NotImplemented
+        return node(op, (other, self) if reflected else (self, other))
+
+    def __pos__(self) -> node:
+        return self
+
+    def __neg__(self) -> node:
+        return node("mul", (self, node("const", value=-1.0)))
+
+    def __add__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("add", other)
+
+    def __radd__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("add", other, True)
+
+    def __sub__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("sub", other)
+
+    def __rsub__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("sub", other, True)
+
+    def __mul__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("mul", other)
+
+    def __rmul__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("mul", other, True)
+
+    def __truediv__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("div", other)
+
+    def __rtruediv__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("div", other, True)
+
+    def __pow__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("pow", other)
+
+    def __rpow__(self, other: Union[node, labfloat, labarray, Number]) -> node:
+        return self._binary("pow", other, True)
+
+    def sqrt(self) -> node:
+        return node("sqrt", (self,))
+
+    def exp(self) -> node:
+        return node("exp", (self,))
+
+    def log(self) -> node:
+        return node("log", (self,))
+
+    def log10(self) -> node:
+        return node("log10", (self,))
+
+    def cos(self) -> node:
+        return node("cos", (self,))
+
+    def sin(self) -> node:
+        return node("sin", (self,))
+
+    def tan(self) -> node:
+        return node("tan", (self,))
+
+    def arcsin(self) -> node:
+        return node("arcsin", (self,))
+
+    def arccos(self) -> node:
+        return node("arccos", (self,))
+
+    def arctan(self) -> node:
+        return node("arctan", (self,))
+
+    def sinh(self) -> node:
+        return node("sinh", (self,))
+
+    def cosh(self) -> node:
+        return node("cosh", (self,))
+
+    def tanh(self) -> node:
+        return node("tanh", (self,))
+
+    def erf(self) -> node:
+        return node("erf", (self,))
+
+    def compile(self) -> graph:
+        """Compile the expression, the graph is cached in the node.
+
+        Returns:
+            graph: The compiled expression.
+
+        """
+        if self._graph is None:
+            self._graph = graph(self)
+        return self._graph
+
+    def evaluate(self, *values, **named) -> Union[labfloat, labarray]:
+        """Evaluate the expression, see graph.__call__."""
+        return self.compile()(*values, **named)
+
+
+class graph:
+    """A compiled expression.
+
+    The graph is sorted topologically and translated to the code of a single Python
+    function, that evaluates every node once, in straight-line code over local
+    variables, followed by the backward pass that accumulates the adjoint of each node
+    and the sum of the inputs' variances. The function is compiled once for numbers,
+    with the math module, and once for numpy arrays. Compile with node.compile, or
+    directly with many outputs that share their inputs.
+    """
+
+    __slots__ = ("_source", "_constants", "_functions", "variables")
+
+    def __init__(self, *outputs: node):
+        order, index = [], {}
+        stack = [(output, False) for output in reversed(outputs)]
+        while stack:
+            n, expanded = stack.pop()
+            if id(n) in index:
+                continue
+            if expanded or not n.args:
+                index[id(n)] = len(order)
+                order.append(n)
+                continue
+            stack.append((n, True))
+            stack.extend((a, False) for a in reversed(n.args) if id(a) not in index)
+
+        self.variables = [n for n in order if n.op == "var"]
+        """List[node]: The expression's inputs, in the order used by positional arguments."""
+        self._constants = {
+            "x{0}".format(i): n.value for i, n in enumerate(order) if n.op == "const"
+        }
+        self._functions = {}
+
+        inputs = [i for i, n in enumerate(order) if n.op == "var"]
+        active = []
+        for n in order:
+            active.append(n.op == "var" or any(active[index[id(a)]] for a in n.args))
+
+        code = [
+            "def program({0}):".format(
+                ", ".join("x{0}, s{0}".format(i) for i in inputs)
+            )
+        ]
+        for i, n in enumerate(order):
+            if not n.args:
+                continue
+            args = ["x{0}".format(index[id(a)]) for a in n.args]
+            if n.op in _templates:
+                value = _templates[n.op][0].format(a=args[0], b=args[1])
+            else:
+                value = "f_{0}({1})".format(n.op, args[0])
+            code.append("    x{0} = {1}".format(i, value))
+
+        results = []
+        for output in outputs:
+            o = index[id(output)]
+            adjoints = {o}
+            code.append("    g{0} = 1.0".format(o))
+            for i in range(o, -1, -1):
+                n = order[i]
+                if i not in adjoints or not n.args:
+                    continue
+                names = dict(g="g{0}".format(i), x="x{0}".format(i))
+                names.update(zip("ab", ("x{0}".format(index[id(a)]) for a in n.args)))
+                if n.op in _templates:
+                    terms = _templates[n.op][1:]
+                else:
+                    terms = ["{g} * d_%s({a}, {x}, m)" % n.op]
+                for a, term in zip(n.args, terms):
+                    a = index[id(a)]
+                    if not active[a]:
+                        continue
+                    term = term.format(**names)
+                    if a in adjoints:
+                        code.append("    g{0} = g{0} + {1}".format(a, term))
+                    else:
+                        code.append("    g{0} = {1}".format(a, term))
+                        adjoints.add(a)
+            # NOTE: one statement for each input, as a single long sum overflows the
+            # compiler's recursion limit with thousands of inputs.
+            v = "v{0}".format(len(results))
+            code.append("    {0} = 0.0".format(v))
+            code.extend(
+                "    {0} = {0} + (g{1} * s{1}) ** 2".format(v, i)
+                for i in inputs
+                if i in adjoints
+            )
+            results.append("(x{0}, v{1})".format(o, len(results)))
+        code.append("    return {0},".format(", ".join(results)))
+        self._source = "\n".join(code)
+
+    def _program(self, vectorized: bool) -> Callable:
+        """The compiled function, for numbers or numpy arrays."""
+        if vectorized not in self._functions:
+            m = np if vectorized else math
+            namespace = {"m": m, "log": m.log}
+            for name, (f, vf, df) in _unary.items():
+                namespace["f_" + name] = vf if vectorized else f
+                namespace["d_" + name] = df
+            namespace.update(self._constants)
+            exec(compile(self._source, "<labfis.lazy>", "exec"), namespace)
+            self._functions[vectorized] = namespace["program"]
+        return self._functions[vectorized]
+
+    def _arguments(self, values: tuple, named: dict) -> List[object]:
+        """The inputs' values, from the arguments or the values stored in the variables."""
+        inputs = [v.value for v in self.variables]
+        if len(values) > len(inputs):
+            raise LabFloatError(1, values)
+        inputs[: len(values)] = values
+        for i, v in enumerate(self.variables):
+            if v.name in named:
+                inputs[i] = named.pop(v.name)
+        if named:
+            raise LabFloatError("Unknown inputs: %s", list(named))
+        return inputs
+
+    def __call__(self, *values, **named) -> Union[labfloat, labarray, tuple]:
+        """Evaluate the expression.
+
+        The inputs can be replaced by new values, positionally in the order of
+        graph.variables or by their names, else the values the expression was built
+        with are used.
+
+        Args:
+            *values: New values of the inputs, labfloats, labarrays or numbers.
+            **named: New values of the inputs by name.
+
+        Returns:
+            Union[labfloat, labarray, tuple]: The result, or a tuple of results for many outputs.
+
+        """
+        arguments = []
+        vectorized = False
+        for x in self._arguments(values, named):
+            mean, uncertainty = labarray.parts(x)
+            arguments += (mean, uncertainty)
+            vectorized = vectorized or isinstance(mean, np.ndarray)
+        vectorized = vectorized or any(
+            isinstance(c, np.ndarray) for c in self._constants.values()
+        )
+
+        results = []
+        for mean, variance in self._program(vectorized)(*arguments):
+            if vectorized:
+                mean = np.asarray(mean, dtype=np.float64)
+                results.append(
+                    labarray._new(mean, np.broadcast_to(np.sqrt(variance), mean.shape))
+                )
+            else:
+                results.append(labfloat._new(mean, variance ** 0.5))
+        return results[0] if len(results) == 1 else tuple(results)
+
+
+def lazy(value: Union[labfloat, labarray, Number, Iterable], name: str = None) -> node:
+    """Create an input of a lazy expression.
+
+    Args:
+        value (Union[labfloat, labarray, Number, Iterable]): The input's value, sequences are converted to labarray.
+        name (str, optional): Name used to pass new values when evaluating. Defaults to None.
+
+    Returns:
+        node: The input node.
+
+    """
+    if not isinstance(value, (labfloat, labarray, Number)):
+        value = labarray(value)
+    return node("var", value=value, name=name)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+import logging
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union, Tuple, Dict, NamedTuple
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat
+from labfis.array import labarray
+
+logger = logging.getLogger(__name__)
+
+
+class mcresult(NamedTuple):
+    """Result of a Monte Carlo propagation."""
+
+    value: labfloat
+    """labfloat: The samples' mean and standard deviation."""
+    percentiles: Dict[float, float]
+    """Dict[float, float]: The requested percentiles of the samples."""
+    samples: int
+    """int: The number of samples evaluated."""
+
+
+def _chunk(
+    f: Callable,
+    means: Tuple[object],
+    errors: Tuple[object],
+    size: int,
+    seed: np.random.SeedSequence,
+    keep: int,
+) -> Tuple[object]:
+    """Evaluate the function over one chunk of gaussian samples.
+
+    Args:
+        f (Callable): The function.
+        means (Tuple[object]): The arguments' means.
+        errors (Tuple[object]): The arguments' standard deviations.
+        size (int): Number of samples.
+        seed (np.random.SeedSequence): The chunk's seed.
+        keep (int): Number of samples returned for the percentiles.
+
+    Returns:
+        Tuple[object]: Samples count, mean, sum of squared deviations and the kept samples.
+
+    """
+    rng = np.random.default_rng(seed)
+    args = [rng.normal(m, e, size) if e else m for m, e in zip(means, errors)]
+    values = np.broadcast_to(np.asarray(f(*args), dtype=np.float64), (size,))
+    mean = values.mean()
+    return size, mean, ((values - mean) ** 2).sum(), np.array(values[:keep])
+
+
+def montecarlo(
+    f: Callable,
+    *args: Union[labfloat, Number],
+    samples: int = 1000000,
+    chunksize: int = 100000,
+    percentiles: Tuple[float] = (2.5, 50, 97.5),
+    seed: int = None,
+    processes: int = None,
+    keep: int = 100000,
+) -> mcresult:
+    """Propagate the errors of the arguments by Monte Carlo sampling.
+
+    Gaussian samples are drawn from each labfloat's mean and uncertainty and the
+    function is evaluated over whole arrays of samples, so it must be written with numpy
+    functions or the arithmetic operators. The samples are processed in chunks of fixed
+    size, therefore the memory used does not depend on the number of samples. Each
+    chunk has its own seed spawned from seed, so the result is the same whether the
+    chunks are evaluated in this process or across a process pool. The percentiles are
+    estimated from at most keep samples, evenly taken from all chunks.
+
+    Args:
+        f (Callable): The function, of as many arguments as passed. Must be picklable if processes is used.
+        *args (Union[labfloat, Number]): The function's arguments, numbers are constants.
+        samples (int, optional): Total number of samples. Defaults to 1000000.
+        chunksize (int, optional): Number of samples in each chunk. Defaults to 100000.
+        percentiles (Tuple[float], optional): Percentiles to be calculated. Defaults to (2.5, 50, 97.5).
+        seed (int, optional): Seed for reproducible results. Defaults to None.
+        processes (int, optional): Number of worker processes, if None the chunks are evaluated in this process. Defaults to None.
+        keep (int, optional): Maximum number of samples kept for the percentiles. Defaults to 100000.
+
+    Returns:
+        mcresult: The result's labfloat, percentiles and number of samples.
+
+    Example:
+        >>> montecarlo(np.arcsin, labfloat(0.9, 0.05), seed=42)
+
+    """
+    means, errors = zip(*[labarray.parts(x) for x in args])
+
+    sizes = [chunksize] * (samples // chunksize)
+    if samples % chunksize:
+        sizes.append(samples % chunksize)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    keeps = [-(-keep * size // samples) for size in sizes]
+
+    n = len(sizes)
+    jobs = ([f] * n, [means] * n, [errors] * n, sizes, seeds, keeps)
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            chunks = list(executor.map(_chunk, *jobs))
+    else:
+        chunks = list(map(_chunk, *jobs))
+
+    # Chan's parallel algorithm to merge the chunks' means and variances
+    count, mean, m2 = 0, 0.0, 0.0
+    for size, chunk_mean, chunk_m2, _ in chunks:
+        delta = chunk_mean - mean
+        total = count + size
+        mean += delta * size / total
+        m2 += chunk_m2 + delta ** 2 * count * size / total
+        count = total
+
+    kept = np.concatenate([chunk[3] for chunk in chunks])
+    return mcresult(
+        labfloat(float(mean), float((m2 / (count - 1)) ** 0.5)),
+        dict(zip(percentiles, np.percentile(kept, percentiles).tolist())),
+        count,
+    )
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import logging
+import os
+from collections.abc import Callable
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Union, Tuple, List
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.array import labarray
+
+logger = logging.getLogger(__name__)
+
+_worker = {}
+"""dict: The function and the shared memory views of a pool's worker process."""
+
+
+def _layout(shapes: List[Tuple[int]]) -> Tuple[List[Tuple[int]], int]:
+    """Offsets, in float64s, of the (2, *shape) blocks of means and errors, and the total size."""
+    layout, offset = [], 0
+    for shape in shapes:
+        layout.append((offset, shape))
+        offset += 2 * int(np.prod(shape))
+    return layout, offset
+
+
+def _views(buffer: memoryview, layout: List[Tuple[int]]) -> List[np.ndarray]:
+    """Views of the (2, *shape) blocks of a shared memory buffer, without copying."""
+    return [
+        np.ndarray((2,) + shape, dtype=np.float64, buffer=buffer, offset=8 * offset)
+        for offset, shape in layout
+    ]
+
+
+def _attach(
+    function: Callable,
+    constants: dict,
+    name: str,
+    inputs: List[Tuple[int]],
+    outputs: List[Tuple[int]],
+):
+    """Pool initializer, attach the worker to the shared memory."""
+    memory = SharedMemory(name)
+    _worker.update(
+        function=function,
+        constants=constants,
+        memory=memory,
+        inputs=_views(memory.buf, inputs),
+        outputs=_views(memory.buf, outputs),
+    )
+
+
+def _run(
+    function: Callable,
+    constants: dict,
+    inputs: List[np.ndarray],
+    outputs: List[np.ndarray],
+    start: int,
+    stop: int,
+):
+    """Apply the function to the rows start:stop and write the results."""
+    args = [labarray._new(x[0, start:stop], x[1, start:stop]) for x in inputs]
+    for i, value in constants.items():
+        args.insert(i, value)
+    results = function(*args)
+    if not isinstance(results, tuple):
+        results = (results,)
+    for out, result in zip(outputs, results):
+        if isinstance(result, (labarray, labfloat)):
+            out[0, start:stop] = result.mean
+            out[1, start:stop] = result.uncertainty
+        else:
+            out[0, start:stop] = result
+            out[1, start:stop] = 0.0
+
+
+def _task(bounds: Tuple[int]):
+    w = _worker
+    _run(w["function"], w["constants"], w["inputs"], w["outputs"], *bounds)
+
+
+def parallel_map(
+    function: Callable,
+    *args: Union[labarray, labfloat, Number],
+    processes: int = None,
+    chunksize: int = None,
+) -> Union[labarray, Tuple[labarray]]:
+    """Apply a function to chunks of labarrays in a pool of processes.
+
+    The means and errors of the labarrays are copied once to a block of shared memory,
+    that the workers attach to, so each chunk is a labarray of views of that memory
+    and no labfloat is pickled. The function is applied to the rows start:stop of
+    every labarray, and must return one value, or a tuple of values, for each row: its
+    results are written by the workers directly to the shared memory and gathered as
+    labarrays. Use labarray operations, or the functions of labfis.umath, in the
+    function. labfloats and numbers are passed as they are to every call.
+
+    The function must be picklable, e.g. defined at module level, unless processes
+    are started by forking. With processes=1 it is called in this process, without a
+    pool.
+
+    Args:
+        function (Callable): Function of as many arguments as passed.
+        *args (Union[labarray, labfloat, Number]): The arguments, labarrays have the same length and are split in rows.
+        processes (int, optional): Number of worker processes. Defaults to os.cpu_count().
+        chunksize (int, optional): Rows of each call. Defaults to a quarter of each process' share.
+
+    Raises:
+        LabFloatError: No labarray was passed, or their lengths differ.
+
+    Returns:
+        Union[labarray, Tuple[labarray]]: The results, or a tuple of results if the function returns a tuple.
+
+    Example:
+        >>> def model(x, y, k):
+        ...     return (x * k).sin() / y
+        >>> parallel_map(model, labarray(x, dx), labarray(y, dy), labfloat(2, 0.1))
+
+    """
+    arrays = [x for x in args if isinstance(x, labarray)]
+    constants = {i: x for i, x in enumerate(args) if not isinstance(x, labarray)}
+    if not arrays:
+        raise LabFloatError("parallel_map needs at least one labarray argument.")
+    rows = len(arrays[0])
+    if any(len(x) != rows for x in arrays):
+        raise LabFloatError(2, *[x.shape for x in arrays])
+
+    # The outputs' number and shapes are taken from the function applied to one row.
+    probe = function(*[x[:1] if isinstance(x, labarray) else x for x in args])
+    probes = probe if isinstance(probe, tuple) else (probe,)
+    shapes = [(rows,) + np.shape(getattr(p, "mean", p))[1:] for p in probes]
+
+    inputs, size = _layout([x.shape for x in arrays])
+    outputs, total = _layout(shapes)
+    outputs = [(offset + size, shape) for offset, shape in outputs]
+
+    processes = processes or os.cpu_count() or 1
+    chunksize = chunksize or max(1, -(-rows // (4 * processes)))
+    bounds = [(i, min(i + chunksize, rows)) for i in range(0, rows, chunksize)]
+
+    memory = SharedMemory(create=True, size=max(8, 8 * (size + total)))
+    try:
+        views = _views(memory.buf, inputs)
+        for view, x in zip(views, arrays):
+            view[0] = x.mean
+            view[1] = x.uncertainty
+        results = _views(memory.buf, outputs)
+
+        if processes == 1:
+            for start, stop in bounds:
+                _run(function, constants, views, results, start, stop)
+        else:
+            with Pool(
+                processes,
+                _attach,
+                (function, constants, memory.name, inputs, outputs),
+            ) as pool:
+                for _ in pool.imap_unordered(_task, bounds):
+                    pass
+
+        gathered = tuple(labarray._new(r[0].copy(), r[1].copy()) for r in results)
+        del views, results
+    finally:
+        memory.unlink()
+        try:
+            memory.close()
+        except BufferError:
+            # NOTE: views still referenced by an exception's traceback, the memory is
+            # released when they are collected.
+            pass
+    return gathered if isinstance(probe, tuple) else gathered[0]
@@ -0,0 +1,391 @@
+from __future__ import annotations
+import logging
+import math
+from math import fsum
+from typing import Union, Tuple
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.correlation import source
+from labfis.umath import _unary, _binary
+
+logger = logging.getLogger(__name__)
+
+_object_new = object.__new__
+
+
+class tape:
+    """A record of the operations done with tracked values, for reverse-mode propagation.
+
+    Each operation with a tracked value appends one entry to the tape, with the indices
+    of its operands and the partial derivatives with respect to them, at a cost that does
+    not depend on the number of inputs. The derivatives of a result with respect to all
+    inputs are then calculated in a single backward sweep over the tape, so reducing
+    thousands of measures to a few results costs one sweep for each result, instead of
+    carrying the derivatives with respect to every input through every operation as
+    corrfloat does.
+
+    The tape grows with the number of operations. For very long calculations, set a
+    limit and checkpoint the values still in use: checkpoint collapses the tape to one
+    entry for each value, holding its derivatives with respect to the inputs.
+
+    Examples:
+        >>> t = tape()
+        >>> x = [t.input(m, s) for m, s in zip(means, errors)]
+        >>> y = sum(xi.sin() * xi for xi in x)
+        >>> y.uncertainty
+        >>> t.gradient(y)
+
+    """
+
+    __slots__ = ("inputs", "limit", "_parents", "_partials", "_generation")
+
+    def __init__(self, limit: int = None):
+        """Create an empty tape.
+
+        Args:
+            limit (int, optional): Maximum number of recorded operations. Defaults to None, no limit.
+
+        """
+        self.inputs = []
+        """List[source]: The independent measures, in the order of the gradients."""
+        self.limit = limit
+        self._parents = []
+        self._partials = []
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def __repr__(self) -> str:
+        return "tape({0} inputs, {1} operations)".format(len(self.inputs), len(self))
+
+    def input(self, *args, name: str = None) -> tracked:
+        """Create a tracked independent measure.
+
+        Args:
+            *args: A labfloat, or the mean and uncertainty as passed to labfloat.
+            name (str, optional): The measure's name. Defaults to None.
+
+        Returns:
+            tracked: The new input.
+
+        """
+        if len(args) == 1 and isinstance(args[0], labfloat):
+            value = args[0]
+        else:
+            value = labfloat(*args)
+        self.inputs.append(source(value.mean, value.uncertainty, name))
+        return tracked._new(self, value.mean, ~(len(self.inputs) - 1))
+
+    def _push(self, parents: Tuple[int], partials: Tuple[float]) -> int:
+        """Record an operation, returning its index."""
+        if self.limit is not None and len(self._parents) >= self.limit:
+            raise LabFloatError(
+                "The tape is full (%s operations), checkpoint the values in use.",
+                self.limit,
+            )
+        self._parents.append(parents)
+        self._partials.append(partials)
+        return len(self._parents) - 1
+
+    def _check(self, value: tracked) -> None:
+        if value._tape is not self:
+            raise LabFloatError("The value was not recorded in this tape: %s", value)
+        if value._index >= 0 and value._generation != self._generation:
+            raise LabFloatError(
+                "The value was discarded by a checkpoint: %s", value._mean
+            )
+
+    def gradient(self, value: tracked) -> np.ndarray:
+        """Calculate the derivatives of a value with respect to all inputs in one backward sweep.
+
+        Args:
+            value (tracked): The value, recorded in this tape.
+
+        Raises:
+            LabFloatError: The value belongs to another tape or was discarded by a checkpoint.
+
+        Returns:
+            np.ndarray: The derivatives, in the order of tape.inputs.
+
+        """
+        self._check(value)
+        grad = [0.0] * len(self.inputs)
+        if value._index < 0:
+            grad[~value._index] = 1.0
+            return np.array(grad)
+
+        adjoints = [0.0] * (value._index + 1)
+        adjoints[value._index] = 1.0
+        parents, partials = self._parents, self._partials
+        for i in range(value._index, -1, -1):
+            a = adjoints[i]
+            if not a:
+                continue
+            for p, d in zip(parents[i], partials[i]):
+                if p < 0:
+                    grad[~p] += a * d
+                else:
+                    adjoints[p] += a * d
+        return np.array(grad)
+
+    def covariance(self, *values: tracked) -> np.ndarray:
+        """Calculate the covariance matrix of values recorded in this tape.
+
+        Returns:
+            np.ndarray: The (n, n) covariance of the n values.
+
+        """
+        errors = np.array([s.uncertainty for s in self.inputs], dtype=np.float64)
+        weighted = np.array([self.gradient(v) * errors for v in values]).reshape(
+            len(values), len(errors)
+        )
+        return weighted @ weighted.T
+
+    def checkpoint(self, *values: tracked) -> Union[tracked, Tuple[tracked]]:
+        """Collapse the tape, keeping only the inputs and the values still in use.
+
+        The recorded operations are replaced by one entry for each value, with its
+        derivatives with respect to the inputs, and the memory they used is released.
+        Values that were not passed, other than the inputs, can't be used afterwards.
+
+        Returns:
+            Union[tracked, Tuple[tracked]]: The values, recorded in the collapsed tape.
+
+        """
+        grads = [self.gradient(v) for v in values]
+        self._parents = []
+        self._partials = []
+        self._generation += 1
+
+        result = []
+        for value, grad in zip(values, grads):
+            if value._index < 0:
+                result.append(value)
+                continue
+            nonzero = np.flatnonzero(grad)
+            result.append(
+                tracked._new(
+                    self,
+                    value._mean,
+                    self._push(
+                        tuple(~i for i in nonzero.tolist()),
+                        tuple(grad[nonzero].tolist()),
+                    ),
+                )
+            )
+        return result[0] if len(result) == 1 else tuple(result)
+
+
+class tracked(labfloat):
+    """A labfloat whose operations are recorded in a tape, see tape.
+
+    The mean is calculated at once, the uncertainty only when requested, with a backward
+    sweep over the tape. Plain labfloats and numbers used in operations with a tracked
+    value are recorded as new inputs and constants, respectively.
+
+    """
+
+    __slots__ = ("_tape", "_index", "_generation", "_cache")
+
+    @classmethod
+    def _new(cls, tape: tape, mean: object, index: int) -> tracked:
+        """Create a tracked value from its mean and its index in the tape."""
+        obj = _object_new(cls)
+        obj._mean = mean
+        obj._tape = tape
+        obj._index = index
+        obj._generation = tape._generation
+        obj._cache = None
+        return obj
+
+    @property
+    def _uncertainty(self) -> float:
+        if self._cache is None:
+            t = self._tape
+            grad = t.gradient(self)
+            self._cache = (
+                fsum([(d * s.uncertainty) ** 2 for s, d in zip(t.inputs, grad) if d])
+                ** 0.5
+            )
+        return self._cache
+
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        """Pickle as a plain labfloat with the current uncertainty, the tape is not pickled."""
+        return labfloat._new(self._mean, self._uncertainty).__reduce_ex__(protocol)
+
+    def _operand(self, other: Union[labfloat, Number]) -> Tuple[object]:
+        """Get the mean and index of an operand, the index of constants is None."""
+        if isinstance(other, tracked):
+            self._tape._check(other)
+            return other._mean, other._index
+        if isinstance(other, labfloat):
+            if other.uncertainty:
+                return other.mean, self._tape.input(other)._index
+            return other.mean, None
+        if isinstance(other, Number):
+            return other, None
+        return None, None
+
+    def _record(
+        self, mean: object, da: float, b: int = None, db: float = 0.0
+    ) -> tracked:
+        """Record a function of this value and an operand, given the partial derivatives."""
+        t = self._tape
+        t._check(self)
+        if b is None:
+            index = t._push((self._index,), (da,))
+        else:
+            index = t._push((self._index, b), (da, db))
+        return tracked._new(t, mean, index)
+
+    def _apply(self, name: str) -> tracked:
+        """Apply one of the unary functions of labfis.umath."""
+        f, _, df = _unary[name]
+        fx = f(self._mean)
+        return self._record(fx, df(self._mean, fx, math))
+
+    def _function(
+        self, name: str, other: Union[labfloat, Number], reflected: bool = False
+    ) -> tracked:
+        """Apply one of the binary functions of labfis.umath, reflected if other is the first argument."""
+        f, _, df = _binary[name]
+        m, b = self._operand(other)
+        if m is None:
+            raise LabFloatError(
+                "%s of %s is not supported.", name, type(other).__name__
+            )
+        x, y = (m, self._mean) if reflected else (self._mean, m)
+        fxy = f(x, y)
+        dx, dy = df(x, y, fxy)
+        if reflected:
+            return self._record(fxy, dy, b, dx)
+        return self._record(fxy, dx, b, dy)
+
+    def __pos__(self) -> tracked:
+        return self
+
+    def __neg__(self) -> tracked:
+        return self._record(-self._mean, -1.0)
+
+    def __abs__(self) -> tracked:
+        return self._record(abs(self._mean), -1.0 if self._mean < 0 else 1.0)
+
+    def __add__(self, other: Union[labfloat, Number]) -> tracked:
+        m, b = self._operand(other)
+        if m is None:
+            return NotImplemented
+        return self._record(self._mean + m, 1.0, b, 1.0)
+
+    def __radd__(self, other: Union[labfloat, Number]) -> tracked:
+        return self.__add__(other)
+
+    def __sub__(self, other: Union[labfloat, Number]) -> tracked:
+        m, b = self._operand(other)
+        if m is None:
+            return NotImplemented
+        return self._record(self._mean - m, 1.0, b, -1.0)
+
+    def __rsub__(self, other: Union[labfloat, Number]) -> tracked:
+        m, b = self._operand(other)
+        if m is None:
+            return NotImplemented
+        return self._record(m - self._mean, -1.0, b, 1.0)
+
+    def __mul__(self, other: Union[labfloat, Number]) -> tracked:
+        m, b = self._operand(other)
+        if m is None:
+            return NotImplemented
+        return self._record(self._mean * m, m, b, self._mean)
+
+    def __rmul__(self, other: Union[labfloat, Number]) -> tracked:
+        return self.__mul__(other)
+
+    def __div__(self, other: Union[labfloat, Number]) -> tracked:
+        m, b = self._operand(other)
+        if m is None:
+            return NotImplemented
+        value = self._mean / m
+        return self._record(value, 1 / m, b, -value / m)
+
+    def __rdiv__(self, other: Union[labfloat, Number]) -> tracked:
+        m, b = self._operand(other)
+        if m is None:
+            return NotImplemented
+        value = m / self._mean
+        return self._record(value, -value / self._mean, b, 1 / self._mean)
+
+    def __truediv__(self, other: Union[labfloat, Number]) -> tracked:
+        return self.__div__(other)
+
+    def __rtruediv__(self, other: Union[labfloat, Number]) -> tracked:
+        return self.__rdiv__(other)
+
+    def __pow__(self, other: Union[labfloat, Number]) -> tracked:
+        m, b = self._operand(other)
+        if m is None:
+            return NotImplemented
+        power = self._mean ** m
+        return self._record(
+            power,
+            m * self._mean ** (m - 1),
+            b,
+            power * math.log(abs(self._mean)) if b is not None else 0.0,
+        )
+
+    def __rpow__(self, other: Union[labfloat, Number]) -> tracked:
+        m, b = self._operand(other)
+        if m is None:
+            return NotImplemented
+        power = m ** self._mean
+        return self._record(
+            power,
+            power * math.log(abs(m)),
+            b,
+            self._mean * m ** (self._mean - 1) if b is not None else 0.0,
+        )
+
+    def sqrt(self) -> tracked:
+        return self._apply("sqrt")
+
+    def exp(self) -> tracked:
+        return self._apply("exp")
+
+    def log(self) -> tracked:
+        return self._apply("log")
+
+    def log10(self) -> tracked:
+        return self._apply("log10")
+
+    def cos(self) -> tracked:
+        return self._apply("cos")
+
+    def sin(self) -> tracked:
+        return self._apply("sin")
+
+    def tan(self) -> tracked:
+        return self._apply("tan")
+
+    def arcsin(self) -> tracked:
+        return self._apply("arcsin")
+
+    def arccos(self) -> tracked:
+        return self._apply("arccos")
+
+    def arctan(self) -> tracked:
+        return self._apply("arctan")
+
+    def sinh(self) -> tracked:
+        return self._apply("sinh")
+
+    def cosh(self) -> tracked:
+        return self._apply("cosh")
+
+    def tanh(self) -> tracked:
+        return self._apply("tanh")
+
+    def erf(self) -> tracked:
+        return self._apply("erf")
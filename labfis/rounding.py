@@ -0,0 +1,326 @@
+from __future__ import annotations
+import logging
+from collections.abc import Iterable
+from typing import Union, Tuple, List
+from math import copysign, isfinite
+from decimal import Decimal, Context, ROUND_HALF_UP
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+context = Context(rounding=ROUND_HALF_UP)
+"""Context: ROUND_HALF_UP context used when rounding types other than int and float."""
+
+_limit = 22
+"""int: Largest power of ten exactly representable as a float, the limit of the vectorized rounding."""
+
+_powers = np.array([float("1e{0}".format(k)) for k in range(-_limit - 1, _limit + 2)])
+"""np.ndarray: The floats nearest to 1e-23,...,1e23, _powers[k + _limit + 1] is 10**k."""
+
+
+def _digits(x: object) -> Union[Tuple[int, int], None]:
+    """Decompose an int or finite float in the signed coefficient and exponent Decimal(str(x)) would have.
+
+    Args:
+        x (object): Number to be decomposed.
+
+    Returns:
+        Union[Tuple[int, int], None]: The coefficient and exponent, or None if x is not an int or finite float.
+
+    """
+    if type(x) is not float and (
+        not isinstance(x, (int, float)) or isinstance(x, bool)
+    ):
+        return None
+    mantissa, _, exponent = str(x).partition("e")
+    integer, _, fraction = mantissa.partition(".")
+    try:
+        coefficient = int(integer + fraction)
+    except ValueError:
+        # inf and nan
+        return None
+    if exponent:
+        return coefficient, int(exponent) - len(fraction)
+    return coefficient, -len(fraction)
+
+
+def _adjusted(coefficient: int, exponent: int) -> int:
+    """Exponent of the most significant digit, the same as Decimal.adjusted()."""
+    return exponent + len(str(abs(coefficient))) - 1
+
+
+def _quantize(coefficient: int, exponent: int, r: int) -> int:
+    """Round the coefficient half away from zero to the exponent -r."""
+    shift = exponent + r
+    if shift >= 0:
+        return coefficient * 10 ** shift
+    scale = 10 ** -shift
+    if coefficient < 0:
+        coefficient, rest = divmod(-coefficient, scale)
+        return -coefficient - (2 * rest >= scale)
+    coefficient, rest = divmod(coefficient, scale)
+    return coefficient + (2 * rest >= scale)
+
+
+def _compose(x: object, coefficient: int, exponent: int) -> object:
+    """Build a number with the type of x from its coefficient and exponent."""
+    if isinstance(x, float):
+        if not coefficient:
+            return type(x)(copysign(0.0, x))
+        return type(x)("{0}e{1}".format(coefficient, exponent))
+    if exponent < 0:
+        # int(Decimal) truncates towards zero
+        if coefficient < 0:
+            return type(x)(-(-coefficient // 10 ** -exponent))
+        return type(x)(coefficient // 10 ** -exponent)
+    return type(x)(coefficient * 10 ** exponent)
+
+
+def _round_float(mean: float, uncertainty: float, p: int) -> Tuple[float]:
+    """Round two floats, the same steps of round_pair written inline for speed."""
+    mantissa, _, exponent = repr(uncertainty).partition("e")
+    integer, _, fraction = mantissa.partition(".")
+    ucoef = int(integer + fraction)
+    uexp = int(exponent) - len(fraction) if exponent else -len(fraction)
+    digits = len(str(ucoef))
+
+    r = p or 1 - uexp - digits
+    shift = uexp + r
+    if shift < 0:
+        scale = 10 ** -shift
+        ucoef, rest = divmod(ucoef, scale)
+        if 2 * rest >= scale:
+            ucoef += 1
+            if not p and ucoef == 10:
+                ucoef, r = 1, r - 1
+    else:
+        ucoef *= 10 ** shift
+    if not ucoef:
+        ucoef = 1
+
+    mantissa, _, exponent = repr(mean).partition("e")
+    integer, _, fraction = mantissa.partition(".")
+    mcoef = int(integer + fraction)
+    shift = (int(exponent) - len(fraction) if exponent else -len(fraction)) + r
+    if shift < 0:
+        scale = 10 ** -shift
+        if mcoef < 0:
+            mcoef, rest = divmod(-mcoef, scale)
+            mcoef = -mcoef - (2 * rest >= scale)
+        else:
+            mcoef, rest = divmod(mcoef, scale)
+            mcoef += 2 * rest >= scale
+    else:
+        mcoef *= 10 ** shift
+
+    # int / int is correctly rounded, the same as float(Decimal)
+    if r > 0:
+        scale = 10 ** r
+        m, u = mcoef / scale, ucoef / scale
+    else:
+        scale = 10 ** -r
+        m, u = float(mcoef * scale), float(ucoef * scale)
+    if not mcoef:
+        return copysign(0.0, mean), u
+    return m, u
+
+
+def _round_decimal(mean: object, uncertainty: object, p: int) -> Tuple[object]:
+    """Round using Decimal, with the module's context and without changing the global one."""
+    u = Decimal(str(uncertainty))
+    m = Decimal(str(mean))
+
+    r = p - u.adjusted() * (not p)
+
+    u = context.quantize(u, Decimal("1e{}".format(-r)))
+
+    r = p - u.adjusted() * (not p)
+
+    if not u:
+        u = context.add(u, Decimal("1e{}".format(-r)))
+
+    m = context.quantize(m, Decimal("1e{}".format(-r)))
+
+    return type(mean)(m), type(uncertainty)(u)
+
+
+def round_pair(mean: object, uncertainty: object, p: int = 0) -> Tuple[object]:
+    """Round a mean and an uncertainty at p decimal places.
+
+    When p=0, the mean and uncertainty will round at the uncertainty most significant
+    figure to nearest with ties going away from zero (ROUND_HALF_UP), the same as
+    rounding the str() of the values as Decimals. If p is greater than the error's most
+    significant figure decimal place, the error will be one at the mean's least
+    significant figure decimal place. Ints and floats are rounded with integer
+    arithmetic on their decimal digits, other types fallback to Decimal. No global
+    state is changed, therefore it can be used from many threads.
+
+    Args:
+        mean (object): The mean to be rounded.
+        uncertainty (object): The uncertainty to be rounded.
+        p (int, optional): The number of decimals to use when rounding. Defaults to 0.
+
+    Returns:
+        Tuple[object]: The rounded mean and uncertainty, with their original types.
+
+    """
+    if (
+        type(mean) is float
+        and type(uncertainty) is float
+        and isfinite(mean)
+        and isfinite(uncertainty)
+    ):
+        return _round_float(mean, uncertainty, p)
+
+    ud = _digits(uncertainty)
+    md = _digits(mean)
+    if ud is None or md is None:
+        return _round_decimal(mean, uncertainty, p)
+
+    ucoef, uexp = ud
+    r = p or -_adjusted(ucoef, uexp)
+
+    ucoef, uexp = _quantize(ucoef, uexp, r), -r
+
+    if not p:
+        r = -_adjusted(ucoef, uexp)
+
+    if not ucoef:
+        ucoef, uexp = 1, -r
+
+    mcoef, mexp = md
+    mcoef, mexp = _quantize(mcoef, mexp, r), -r
+
+    return _compose(mean, mcoef, mexp), _compose(uncertainty, ucoef, uexp)
+
+
+def _half_up(x: np.ndarray, r: np.ndarray) -> Tuple[np.ndarray]:
+    """Round abs(x) * 10**r half up to integers, with a mask of the results that are not certain.
+
+    The scaling is not exact, so the results whose fraction is too close to a tie, or
+    that are too large to have a fraction, may differ from rounding the decimal digits.
+
+    """
+    a = np.abs(x) * _powers[np.clip(r, -_limit, _limit) + _limit + 1]
+    n = np.floor(a)
+    fraction = a - n
+    unsure = (np.abs(fraction - 0.5) <= 1e-12 * (a + 1)) | ~(a < 1e12)
+    return n + (fraction > 0.5), unsure
+
+
+def _round_arrays(means: np.ndarray, uncertainties: np.ndarray, p: int) -> Tuple[list]:
+    """Round float64 arrays as round_pair does, a whole column at a time.
+
+    The position of the error's most significant figure and the rounded digits are
+    calculated with numpy, only the values near a tie, non finite or too large or small
+    for exact float arithmetic are rounded with round_pair.
+
+    """
+    m, u = np.broadcast_arrays(means, uncertainties)
+    with np.errstate(all="ignore"):
+        slow = ~(np.isfinite(m) & np.isfinite(u)) | np.signbit(u)
+        if p:
+            r = np.full(u.shape, p)
+        else:
+            # exponent of the most significant figure of str(u), zero has 0.0's
+            v = np.where(slow | (u == 0), 0.1, u)
+            e = np.clip(np.floor(np.log10(v)), -_limit, _limit).astype(int)
+            e -= _powers[e + _limit + 1] > v
+            e += _powers[e + _limit + 2] <= v
+            r = -e
+        nu, unsure = _half_up(u, r)
+        slow |= unsure
+        if not p:
+            ten = nu == 10
+            nu[ten] = 1
+            r = r - ten
+        nu[nu == 0] = 1
+        nm, unsure = _half_up(m, r)
+        slow |= unsure | (np.abs(r) > _limit)
+
+        scale = _powers[np.clip(np.abs(r), 0, _limit) + _limit + 1]
+        positive = r > 0
+        rm = np.copysign(np.where(positive, nm / scale, nm * scale), m)
+        ru = np.where(positive, nu / scale, nu * scale)
+
+    rm, ru = rm.tolist(), ru.tolist()
+    for i in np.flatnonzero(slow).tolist():
+        rm[i], ru[i] = round_pair(float(m[i]), float(u[i]), p)
+    return rm, ru
+
+
+def _floats(values: Iterable) -> Union[np.ndarray, None]:
+    """Get a flat float64 array of a numpy array or list of floats, or None."""
+    if isinstance(values, np.ndarray):
+        return np.ravel(values) if values.dtype == np.float64 else None
+    if all(type(x) is float for x in values):
+        return np.array(values, dtype=np.float64)
+    return None
+
+
+def _columns(
+    means: Iterable, uncertainties: Union[Iterable, None]
+) -> Tuple[Iterable, Iterable]:
+    """Get means and uncertainties iterables from a sequence of labfloats or a vectorized container."""
+    if uncertainties is not None:
+        return means, uncertainties
+    if hasattr(means, "mean") and hasattr(means, "uncertainty"):
+        means, uncertainties = means.mean, means.uncertainty
+        if hasattr(means, "tolist"):
+            return np.ravel(means), np.ravel(uncertainties)
+        return [means], [uncertainties]
+    means = list(means)
+    return [x.mean for x in means], [x.uncertainty for x in means]
+
+
+def round_many(
+    means: Iterable, uncertainties: Iterable = None, p: int = 0
+) -> List[Tuple[object]]:
+    """Round whole columns of means and uncertainties.
+
+    Columns of floats, like a labarray's, are rounded with numpy, a column at a time,
+    with the same results as round_pair. Other types are rounded one pair at a time.
+
+    Args:
+        means (Iterable): The means, a sequence of labfloats or a labarray.
+        uncertainties (Iterable, optional): The uncertainties, if means are only numbers. Defaults to None.
+        p (int, optional): The number of decimals to use when rounding. Defaults to 0.
+
+    Returns:
+        List[Tuple[object]]: The rounded mean and uncertainty pairs.
+
+    """
+    means, uncertainties = _columns(means, uncertainties)
+    if not isinstance(means, np.ndarray):
+        means = list(means)
+    if not isinstance(uncertainties, np.ndarray):
+        uncertainties = list(uncertainties)
+    m, u = _floats(means), _floats(uncertainties)
+    if m is not None and u is not None and 0 <= p <= _limit:
+        return list(zip(*_round_arrays(m, u, p)))
+    if isinstance(means, np.ndarray):
+        means = np.ravel(means).tolist()
+    if isinstance(uncertainties, np.ndarray):
+        uncertainties = np.ravel(uncertainties).tolist()
+    return [round_pair(m, u, p) for m, u in zip(means, uncertainties)]
+
+
+def format_many(
+    means: Iterable, uncertainties: Iterable = None, p: int = 0
+) -> List[str]:
+    """Format whole columns of means and uncertainties as labfloat's string representation.
+
+    The columns are rounded with round_many, so columns of floats are rounded with numpy.
+
+    Args:
+        means (Iterable): The means, a sequence of labfloats or a labarray.
+        uncertainties (Iterable, optional): The uncertainties, if means are only numbers. Defaults to None.
+        p (int, optional): The number of decimals to use when rounding. Defaults to 0.
+
+    Returns:
+        List[str]: The "(mean ± error)" strings.
+
+    """
+    fmt = "({0:g} ± {1:g})".format
+    return [fmt(m, u) for m, u in round_many(means, uncertainties, p)]
@@ -0,0 +1,332 @@
+from __future__ import annotations
+import logging
+from collections import deque
+from collections.abc import Iterable
+from typing import Union, Tuple
+from math import fsum
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.array import labarray
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(values: Iterable) -> Tuple[object]:
+    """Get the means and errors of a labarray or labfloat as flat arrays, or None."""
+    if isinstance(values, (labarray, labfloat)):
+        means, errors = labarray.parts(values)
+        return np.ravel(means), np.ravel(errors)
+    return None
+
+
+def _sums(values: Iterable) -> Tuple[object]:
+    """Count and sum the means and variances in a single pass, with compensated summation.
+
+    Args:
+        values (Iterable): labfloats or numbers, or a labarray.
+
+    Returns:
+        Tuple[object]: Number of values, sum of the means and sum of the variances.
+
+    """
+    columns = _columns(values)
+    if columns is not None:
+        means, errors = columns
+        return means.size, fsum(means), fsum(errors ** 2)
+
+    # Neumaier's compensated summation of the means and of the variances
+    n = 0
+    m, mc = 0.0, 0.0
+    v, vc = 0.0, 0.0
+    for x in values:
+        if isinstance(x, labfloat):
+            xm, xv = x.mean, x.uncertainty ** 2
+        else:
+            xm, xv = x, 0.0
+        t = m + xm
+        if abs(m) >= abs(xm):
+            mc += (m - t) + xm
+        else:
+            mc += (xm - t) + m
+        m = t
+        t = v + xv
+        if v >= xv:
+            vc += (v - t) + xv
+        else:
+            vc += (xv - t) + v
+        v = t
+        n += 1
+    return n, m + mc, v + vc
+
+
+def lsum(values: Iterable) -> labfloat:
+    """Sum labfloats in a single pass.
+
+    The variances are accumulated instead of the errors, and the sum is compensated,
+    so it is faster and more accurate than the builtin sum.
+
+    Args:
+        values (Iterable): labfloats or numbers, or a labarray.
+
+    Returns:
+        labfloat: The sum.
+
+    """
+    _, m, v = _sums(values)
+    return labfloat._new(m, v ** 0.5)
+
+
+def lmean(values: Iterable) -> labfloat:
+    """Calculate the mean of labfloats in a single pass.
+
+    The error is propagated from the values' errors, see sample_mean for the error
+    estimated from the values' scatter.
+
+    Args:
+        values (Iterable): labfloats or numbers, or a labarray.
+
+    Raises:
+        LabFloatError: No values were passed.
+
+    Returns:
+        labfloat: The mean.
+
+    """
+    n, m, v = _sums(values)
+    if not n:
+        raise LabFloatError("Mean of an empty sequence.")
+    return labfloat._new(m / n, v ** 0.5 / n)
+
+
+def weighted_mean(values: Iterable) -> labfloat:
+    """Calculate the inverse-variance weighted mean of labfloats in a single pass.
+
+    Args:
+        values (Iterable): labfloats or a labarray.
+
+    Raises:
+        LabFloatError: A value has zero uncertainty, like a number, or no values were passed.
+
+    Returns:
+        labfloat: The weighted mean, with uncertainty 1/sqrt(sum(1/error**2)).
+
+    """
+    columns = _columns(values)
+    if columns is not None:
+        means, errors = columns
+        if not errors.all():
+            raise LabFloatError(
+                "Weighted mean of a value with zero uncertainty: %s",
+                labfloat(means[errors == 0][0]),
+            )
+        weights = errors ** -2.0
+        w, wm = fsum(weights), fsum(weights * means)
+    else:
+        # Neumaier's compensated summation of the weights and of the weighted means
+        w, wc = 0.0, 0.0
+        wm, wmc = 0.0, 0.0
+        for x in values:
+            xm, xe = (x.mean, x.uncertainty) if isinstance(x, labfloat) else (x, 0)
+            if not xe:
+                raise LabFloatError(
+                    "Weighted mean of a value with zero uncertainty: %s", x
+                )
+            weight = xe ** -2
+            t = w + weight
+            if w >= weight:
+                wc += (w - t) + weight
+            else:
+                wc += (weight - t) + w
+            w = t
+            xw = weight * xm
+            t = wm + xw
+            if abs(wm) >= abs(xw):
+                wmc += (wm - t) + xw
+            else:
+                wmc += (xw - t) + wm
+            wm = t
+        w, wm = w + wc, wm + wmc
+    if not w:
+        raise LabFloatError("Mean of an empty sequence.")
+    return labfloat._new(wm / w, w ** -0.5)
+
+
+def sample_mean(values: Iterable) -> labfloat:
+    """Calculate the mean of repeated measures and its standard error from their scatter.
+
+    Uses Welford's single pass algorithm. The uncertainty is the sample standard
+    deviation divided by sqrt(n), the errors of the values are not used.
+
+    Args:
+        values (Iterable): numbers or labfloats, or a labarray.
+
+    Raises:
+        LabFloatError: Less than two values were passed.
+
+    Returns:
+        labfloat: The mean and its standard error.
+
+    """
+    columns = _columns(values)
+    if columns is not None:
+        means = columns[0]
+        n = means.size
+        if n < 2:
+            raise LabFloatError("Standard error of less than two values.")
+        return labfloat._new(float(means.mean()), float(means.std(ddof=1)) / n ** 0.5)
+
+    n, mean, m2 = 0, 0.0, 0.0
+    for x in values:
+        if isinstance(x, labfloat):
+            x = x.mean
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    if n < 2:
+        raise LabFloatError("Standard error of less than two values.")
+    return labfloat._new(mean, (m2 / (n - 1) / n) ** 0.5)
+
+
+class accumulator:
+    """Online accumulator of repeated measures, using Welford's algorithm.
+
+    Samples are added one by one or in arrays, and only the count, the mean and the sum
+    of squared deviations are stored, so the memory used does not depend on the number
+    of samples. Accumulators filled in different threads or processes can be merged
+    with Chan's parallel algorithm. If a window is given only the last window samples
+    are used, and those are stored.
+
+    Examples:
+        >>> acc = accumulator()
+        >>> for reading in stream:
+        ...     acc.add(reading)
+        >>> acc.value
+        >>> accumulator().add(batch1).merge(accumulator().add(batch2)).value
+
+    """
+
+    __slots__ = ("_count", "_mean", "_m2", "_window")
+
+    def __init__(self, window: int = None):
+        """Create an empty accumulator.
+
+        Args:
+            window (int, optional): Number of latest samples used, all if None. Defaults to None.
+
+        """
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._window = deque(maxlen=window) if window else None
+
+    def _push(self, x: float):
+        self._count += 1
+        delta = x - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (x - self._mean)
+
+    def _pop(self, x: float):
+        if self._count == 1:
+            self._count, self._mean, self._m2 = 0, 0.0, 0.0
+            return
+        mean = (self._count * self._mean - x) / (self._count - 1)
+        self._m2 = max(self._m2 - (x - self._mean) * (x - mean), 0.0)
+        self._mean = mean
+        self._count -= 1
+
+    def _combine(self, count: int, mean: float, m2: float):
+        total = self._count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta ** 2 * self._count * count / total
+        self._count = total
+
+    def add(self, values: Union[Number, labfloat, Iterable]) -> accumulator:
+        """Add a sample, or many samples at once.
+
+        Args:
+            values (Union[Number, labfloat, Iterable]): A number, a labfloat's mean, or a sequence, array or labarray of them.
+
+        Returns:
+            accumulator: The accumulator itself.
+
+        """
+        if isinstance(values, labfloat):
+            values = values.mean
+        if isinstance(values, Number):
+            values = float(values)
+            if self._window is not None:
+                if len(self._window) == self._window.maxlen:
+                    self._pop(self._window[0])
+                self._window.append(values)
+            self._push(values)
+            return self
+
+        columns = _columns(values)
+        if columns is not None:
+            values = columns[0]
+        else:
+            values = np.array(
+                [labarray.parts(x)[0] for x in values],
+                dtype=np.float64,
+            ).ravel()
+        if self._window is not None:
+            for x in values[-self._window.maxlen :].tolist():
+                self.add(x)
+        elif values.size:
+            mean = values.mean()
+            self._combine(values.size, float(mean), float(((values - mean) ** 2).sum()))
+        return self
+
+    def merge(self, other: accumulator) -> accumulator:
+        """Merge the samples of another accumulator into this one.
+
+        Args:
+            other (accumulator): Accumulator without window.
+
+        Raises:
+            LabFloatError: Any of the accumulators has a window.
+
+        Returns:
+            accumulator: The accumulator itself.
+
+        """
+        if self._window is not None or other._window is not None:
+            raise LabFloatError("Can't merge accumulators with window.")
+        if other._count:
+            self._combine(other._count, other._mean, other._m2)
+        return self
+
+    def __add__(self, other: accumulator) -> accumulator:
+        if not isinstance(other, accumulator):
+            return NotImplemented
+        return accumulator().merge(self).merge(other)
+
+    @property
+    def count(self) -> int:
+        """int: Number of samples."""
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        """float: Samples' mean."""
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """float: Samples' variance, with n - 1 degrees of freedom."""
+        if self._count < 2:
+            raise LabFloatError("Standard error of less than two values.")
+        return self._m2 / (self._count - 1)
+
+    @property
+    def value(self) -> labfloat:
+        """labfloat: The samples' mean and its standard error."""
+        return labfloat._new(self._mean, (self.variance / self._count) ** 0.5)
+
+    def __repr__(self) -> str:
+        return "accumulator(count={0}, mean={1})".format(self._count, self._mean)
@@ -0,0 +1,310 @@
+from __future__ import annotations
+import inspect
+import logging
+from collections.abc import Iterable, Callable
+from itertools import count
+from typing import Union, List, Dict
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.array import labarray
+from labfis.rounding import format_many
+
+logger = logging.getLogger(__name__)
+
+_clock = count(1)
+"""count: Source of the versions of the columns, increasing for every change."""
+
+
+def _column(values: Union[labarray, Iterable]) -> Union[labarray, np.ndarray]:
+    """Convert a column to a one dimensional labarray, or a numpy array if it has no labfloats."""
+    if isinstance(values, labarray):
+        return np.ravel(values) if values.mean.ndim != 1 else values
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+        if any(isinstance(x, labfloat) for x in values):
+            return labarray(values)
+    return np.ravel(np.asarray(values))
+
+
+def _sum(index, groups, counts, means, errors):
+    return (
+        np.bincount(index, means, groups),
+        np.sqrt(np.bincount(index, errors ** 2, groups)),
+    )
+
+
+def _mean(index, groups, counts, means, errors):
+    total, error = _sum(index, groups, counts, means, errors)
+    return total / counts, error / counts
+
+
+def _weighted_mean(index, groups, counts, means, errors):
+    if not errors.all():
+        raise LabFloatError(
+            "Weighted mean of a value with zero uncertainty: %s",
+            labfloat(means[errors == 0][0]),
+        )
+    weights = errors ** -2.0
+    w = np.bincount(index, weights, groups)
+    return np.bincount(index, weights * means, groups) / w, w ** -0.5
+
+
+def _sample_mean(index, groups, counts, means, errors):
+    if (counts < 2).any():
+        raise LabFloatError("Standard error of less than two values.")
+    mean = np.bincount(index, means, groups) / counts
+    squares = np.bincount(index, (means - mean[index]) ** 2, groups)
+    return mean, np.sqrt(squares / (counts - 1) / counts)
+
+
+_reductions = {
+    "sum": _sum,
+    "mean": _mean,
+    "weighted_mean": _weighted_mean,
+    "sample_mean": _sample_mean,
+}
+"""dict: Reductions of the groups of labtable.groupby, as in lsum, lmean, weighted_mean and sample_mean.
+
+Each is a function of the rows' group index, the number of groups, the groups' sizes
+and the rows' means and errors, returning the means and errors of the groups.
+"""
+
+
+class labtable:
+    """A table of named columns of measures.
+
+    The columns are stored as labarrays, one contiguous array of means and one of errors
+    for each column, or as plain numpy arrays for columns without errors, like labels.
+    Indexing by name returns the column, while masks, slices and index arrays select
+    rows and return a new table.
+
+    Derived columns are defined by a function of other columns, they are calculated
+    only when used and cached until one of their inputs changes. groupby reduces the
+    rows with the same key with the reductions of labfis.stats, over whole columns.
+
+    Examples:
+        >>> data = labtable(t=labarray(t, 0.01), x=labarray(x, dx), run=runs)
+        >>> data.derive("v", lambda x, t: x / t)
+        >>> data[data["t"].mean > 1]["v"]
+        >>> data.groupby("run", "weighted_mean")
+
+    """
+
+    __slots__ = ("_data", "_derived", "_cache", "_versions")
+
+    def __init__(
+        self,
+        columns: Dict[str, Union[labarray, Iterable]] = None,
+        **named: Union[labarray, Iterable],
+    ):
+        """Create a table from its columns.
+
+        Args:
+            columns (Dict[str, Union[labarray, Iterable]], optional): The columns by name. Defaults to None.
+            **named (Union[labarray, Iterable]): More columns, by name.
+
+        Raises:
+            LabFloatError: The columns do not have the same length.
+
+        """
+        self._data = {}
+        self._derived = {}
+        self._cache = {}
+        self._versions = {}
+        for name, values in dict(columns or {}, **named).items():
+            self[name] = values
+
+    @classmethod
+    def frommeasures(cls, names: List[str], *args: Iterable) -> labtable:
+        """Create a table from lists of means and errors, as passed to labfloat.list.
+
+        Args:
+            names (List[str]): The names of the columns.
+            *args (Iterable): The means and errors of each column, [val1,...],[err1,...],[val2,...],...
+
+        Raises:
+            LabFloatError: A list of errors is missing, or the number of names is wrong.
+
+        Returns:
+            labtable: The new table.
+
+        Example:
+            >>> labtable.frommeasures(["t", "x"], [1, 2, 3], [0.1] * 3, [4, 5, 6], [0.2] * 3)
+
+        """
+        if len(args) % 2 != 0:
+            raise LabFloatError(3, args)
+        if len(names) != len(args) // 2:
+            raise LabFloatError(
+                "Expected %s column names, got: %s", len(args) // 2, names
+            )
+        return cls(
+            {
+                name: labarray(args[2 * i], args[2 * i + 1])
+                for i, name in enumerate(names)
+            }
+        )
+
+    @property
+    def columns(self) -> List[str]:
+        """List[str]: Names of the columns, stored and derived."""
+        return list(self._data) + [n for n in self._derived if n not in self._data]
+
+    def __len__(self) -> int:
+        for values in self._data.values():
+            return len(values)
+        return 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._data or name in self._derived
+
+    def __setitem__(self, name: str, values: Union[labarray, Iterable]):
+        """Set a stored column, the derived columns that use it are calculated again when used."""
+        values = _column(values)
+        rows = [len(v) for n, v in self._data.items() if n != name]
+        if rows and rows[0] != len(values):
+            raise LabFloatError(
+                "Column %s has %s rows, expected %s.", name, len(values), rows[0]
+            )
+        self._derived.pop(name, None)
+        self._cache.pop(name, None)
+        self._data[name] = values
+        self._versions[name] = next(_clock)
+
+    def derive(self, name: str, function: Callable, *inputs: str) -> labtable:
+        """Define a column calculated from other columns.
+
+        The column is calculated when it is first used, over whole columns, and cached
+        until one of its inputs is set again.
+
+        Args:
+            name (str): The name of the new column.
+            function (Callable): Function of the input columns, returning the new column.
+            *inputs (str): Names of the input columns. Defaults to the names of the function's parameters.
+
+        Raises:
+            LabFloatError: An input is not a column of the table.
+
+        Returns:
+            labtable: The table itself.
+
+        """
+        if not inputs:
+            inputs = tuple(inspect.signature(function).parameters)
+        for i in inputs:
+            if i not in self or i == name:
+                raise LabFloatError("Unknown column: %s", i)
+        self._data.pop(name, None)
+        self._cache.pop(name, None)
+        self._derived[name] = (function, inputs)
+        return self
+
+    def _get(self, name: str) -> Union[labarray, np.ndarray]:
+        """Get a column, calculating the derived columns whose inputs changed."""
+        if name in self._data:
+            return self._data[name]
+        if name not in self._derived:
+            raise LabFloatError("Unknown column: %s", name)
+        function, inputs = self._derived[name]
+        values = [self._get(i) for i in inputs]
+        stamp = tuple(self._versions[i] for i in inputs)
+        cached = self._cache.get(name)
+        if cached is None or cached[1] != stamp:
+            logger.debug("Calculating column %s", name)
+            result = function(*values)
+            if isinstance(result, Number):
+                result = np.full(len(self), result, dtype=np.float64)
+            cached = self._cache[name] = (_column(result), stamp)
+            self._versions[name] = next(_clock)
+        return cached[0]
+
+    def __getitem__(
+        self, idx: Union[str, slice, np.ndarray, Iterable]
+    ) -> Union[labarray, np.ndarray, labtable]:
+        """Get a column by name, or select rows.
+
+        Args:
+            idx (Union[str, slice, np.ndarray, Iterable]): A column name, or a boolean mask, slice or index array of the rows.
+
+        Returns:
+            Union[labarray, np.ndarray, labtable]: The column, or a new table with the selected rows and the same derived columns.
+
+        """
+        if isinstance(idx, str):
+            return self._get(idx)
+        if isinstance(idx, (int, np.integer)):
+            idx = [idx]
+        table = labtable({name: values[idx] for name, values in self._data.items()})
+        for name, (function, inputs) in self._derived.items():
+            table.derive(name, function, *inputs)
+        return table
+
+    def todict(self) -> Dict[str, Union[labarray, np.ndarray]]:
+        """Get all the columns, calculating the derived ones.
+
+        Returns:
+            Dict[str, Union[labarray, np.ndarray]]: The columns by name.
+
+        """
+        return {name: self._get(name) for name in self.columns}
+
+    def groupby(self, key: str, reduction: str = "mean", **reductions: str) -> labtable:
+        """Reduce the rows with the same key.
+
+        The reductions are "sum", "mean", "weighted_mean" and "sample_mean", with the
+        errors of lsum, lmean, weighted_mean and sample_mean, respectively. All groups
+        of a column are reduced at once.
+
+        Args:
+            key (str): Name of the column whose values define the groups, the means of a labarray column are used.
+            reduction (str, optional): Reduction of the columns with errors. Defaults to "mean".
+            **reductions (str): Reduction of specific columns.
+
+        Raises:
+            LabFloatError: Unknown reduction, or the reduction is not defined for a group.
+
+        Returns:
+            labtable: One row for each key, sorted, with the key and the reduced columns.
+
+        """
+        keys = self._get(key)
+        if isinstance(keys, labarray):
+            keys = keys.mean
+        labels, index, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        index = index.ravel()
+
+        table = labtable({key: labels})
+        for name in self.columns:
+            values = self._get(name)
+            if name == key or not isinstance(values, labarray):
+                continue
+            how = reductions.get(name, reduction)
+            if how not in _reductions:
+                raise LabFloatError("Unknown reduction: %s", how)
+            table[name] = labarray._new(
+                *_reductions[how](
+                    index, labels.size, counts, values.mean, values.uncertainty
+                )
+            )
+        return table
+
+    def __str__(self) -> str:
+        columns = self.todict()
+        cells = [
+            format_many(v) if isinstance(v, labarray) else [str(x) for x in v]
+            for v in columns.values()
+        ]
+        widths = [
+            max([len(name)] + [len(c) for c in column])
+            for name, column in zip(columns, cells)
+        ]
+        rows = ["  ".join(n.rjust(w) for n, w in zip(columns, widths))]
+        for row in zip(*cells):
+            rows.append("  ".join(c.rjust(w) for c, w in zip(row, widths)))
+        return "\n".join(rows)
+
+    def __repr__(self) -> str:
+        return "labtable({0} rows, columns={1})".format(len(self), self.columns)
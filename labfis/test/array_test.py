@@ -0,0 +1,107 @@
+import numpy
+from pytest import approx, raises
+from labfis import labfloat, labarray
+
+rng = numpy.random.default_rng()
+
+means = rng.random(50) + 0.5
+errors = rng.random(50) * 0.1
+others = rng.random(50) + 0.5
+
+
+def check(array, floats):
+    assert len(array) == len(floats)
+    for x, y in zip(array, floats):
+        assert x.mean == approx(y.mean) and x.uncertainty == approx(y.uncertainty)
+
+
+def test_construction():
+    x = labarray(means, errors)
+    assert x.shape == (50,)
+    assert isinstance(x[0], labfloat)
+    assert isinstance(x[1:3], labarray)
+    assert list(labarray([1, 2], 0.5).uncertainty) == [0.5, 0.5]
+    check(labarray(labfloat(list(means), list(errors))), x)
+
+
+def test_operations():
+    x = labarray(means, errors)
+    y = labarray(others, errors[::-1])
+    xf, yf = list(x), list(y)
+    c = labfloat(1.5, 0.2)
+
+    check(x + y, [a + b for a, b in zip(xf, yf)])
+    check(x - y, [a - b for a, b in zip(xf, yf)])
+    check(x * y, [a * b for a, b in zip(xf, yf)])
+    check(x / y, [a / b for a, b in zip(xf, yf)])
+    check(x ** y, [a ** b for a, b in zip(xf, yf)])
+    check(c - x, [c - a for a in xf])
+    check(c / x, [c / a for a in xf])
+    check(c ** x, [c ** a for a in xf])
+    check(2 ** x, [2 ** a for a in xf])
+    check(x * 3, [a * 3 for a in xf])
+    check(x ** 2, [a ** 2 for a in xf])
+
+
+def test_functions():
+    x = labarray(means / 2, errors)
+    xf = list(x)
+
+    for f in ["sqrt", "cos", "sin", "tan", "arcsin", "arccos", "arctan"]:
+        check(getattr(x, f)(), [getattr(a, f)() for a in xf])
+
+
+def test_numpy_protocol():
+    x = labarray(means, errors)
+    floats = labfloat(list(means), list(errors))
+    check(numpy.sin(x), [f.sin() for f in floats])
+    check(numpy.sqrt(x), [f.sqrt() for f in floats])
+    check(numpy.multiply(others, x), [o * f for o, f in zip(others, floats)])
+    check(others ** x, [o ** f for o, f in zip(others, floats)])
+    check(numpy.abs(-x), floats)
+    assert list(numpy.less(x, others)) == [f < o for f, o in zip(floats, others)]
+
+    total = numpy.sum(x)
+    assert isinstance(total, labfloat)
+    assert total.mean == approx(sum(floats).mean)
+    assert total.uncertainty == approx(sum(floats).uncertainty)
+    assert numpy.mean(x).mean == approx(means.mean())
+    assert numpy.add.reduce(x).uncertainty == approx(total.uncertainty)
+    grid = numpy.reshape(x, (5, 10))
+    check(numpy.sum(grid, axis=1), [sum(floats[i : i + 10]) for i in range(0, 50, 10)])
+    assert numpy.concatenate([x, x]).shape == (100,)
+
+    y = numpy.cos(floats[0])
+    assert isinstance(y, labfloat) and y.mean == approx(floats[0].cos().mean)
+    check(numpy.arange(3.0) + floats[0], [floats[0] + i for i in range(3)])
+
+
+def test_mixed_construction():
+    a = labarray([2.0, labfloat(1, 0.1)])
+    assert list(a.mean) == [2, 1] and list(a.uncertainty) == [0, 0.1]
+    b = labarray([labfloat(1, 0.1), 2.0])
+    assert list(b.mean) == [1, 2] and list(b.uncertainty) == [0.1, 0]
+    c = labarray(labfloat([1, 2], [0.1, 0.2], [3, 4], [0.3, 0.4]))
+    assert c.shape == (2, 2)
+    assert c.uncertainty.tolist() == [[0.1, 0.2], [0.3, 0.4]]
+    assert list(labarray(range(3)).uncertainty) == [0, 0, 0]
+
+
+def test_zero_dimensional():
+    a = labarray(5, 0.1)
+    assert str(a) == str(labfloat(5, 0.1)) and repr(a) == "labarray((5 ± 0.1))"
+    assert a.tolist() == labfloat(5, 0.1) and a.shape == ()
+    with raises(TypeError):
+        len(a)
+    with raises(TypeError):
+        list(a)
+
+
+def test_object_arrays():
+    objects = numpy.array([labfloat(1, 0.3), labfloat(2, 0.4)], dtype=object)
+    x, a = labfloat(1, 0.1), labarray([1, 2], 0.1)
+    for other, pairs in [(x, [x, x]), (a, list(a))]:
+        check(objects + other, [f + o for f, o in zip(objects, pairs)])
+        check(other + objects, [o + f for f, o in zip(objects, pairs)])
+        check(objects * other, [f * o for f, o in zip(objects, pairs)])
+        check(other * objects, [o * f for f, o in zip(objects, pairs)])
@@ -0,0 +1,59 @@
+import numpy
+from math import exp as mexp
+from pytest import approx
+from labfis import labfloat, labarray, propagate
+from labfis.autodiff import gradient, exp, log, hypot, arctan2, erf
+
+a, b = labfloat(0.7, 0.05), labfloat(1.3, 0.1)
+
+
+def test_operators():
+    for f in [
+        lambda x, y: x * y,
+        lambda x, y: x / y - 3,
+        lambda x, y: x ** y,
+        lambda x, y: 2 ** x + y,
+        lambda x, y: (x + y).sqrt(),
+        lambda x, y: x.sin() / y.cos(),
+        lambda x, y: x.arcsin() + y.tan(),
+        lambda x, y: x.arccos() * y.arctan(),
+    ]:
+        result = propagate(f, a, b)
+        assert result.mean == approx(f(a, b).mean)
+        assert result.uncertainty == approx(f(a, b).uncertainty)
+
+
+def test_functions():
+    value, grad = gradient(lambda x, y: exp(x) * log(y) + hypot(x, y), 0.5, 2.0)
+    assert value == approx(mexp(0.5) * numpy.log(2) + numpy.hypot(0.5, 2))
+    assert grad[0] == approx(mexp(0.5) * numpy.log(2) + 0.5 / numpy.hypot(0.5, 2))
+    assert grad[1] == approx(mexp(0.5) / 2 + 2 / numpy.hypot(0.5, 2))
+
+    value, grad = gradient(arctan2, 1.0, -1.0)
+    assert value == approx(3 * numpy.pi / 4)
+    assert list(grad) == approx([-0.5, -0.5])
+
+
+def test_correlated():
+    assert propagate(lambda x: x - x, a).uncertainty == 0
+    assert propagate(lambda x: x * x, a).uncertainty == approx((a ** 2).uncertainty)
+
+
+def test_vectorized():
+    x = labarray([0.1, 0.2, 0.3], [0.01, 0.02, 0.03])
+    result = propagate(lambda x, y: x * y - y / x, x, b)
+    assert isinstance(result, labarray)
+    for r, x0 in zip(result, x):
+        assert r.uncertainty == approx(
+            propagate(lambda x, y: x * y - y / x, x0, b).uncertainty
+        )
+
+
+def test_erf():
+    from math import erf as merf, pi, sqrt
+
+    assert type(erf(0.5)) is float and erf(0.5) == merf(0.5)
+    y = propagate(erf, labfloat(0.5, 0.1))
+    assert isinstance(y, labfloat) and str(y)
+    assert y.uncertainty == approx(2 / sqrt(pi) * mexp(-0.25) * 0.1)
+    assert list(erf(numpy.array([0.0, 0.5]))) == approx([0, merf(0.5)])
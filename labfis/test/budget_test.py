@@ -0,0 +1,31 @@
+import numpy
+from pytest import approx
+from labfis import labfloat, labarray, corrfloat
+from labfis.budget import budget
+
+
+def test_corrfloat_budget():
+    x, y = corrfloat(10, 1, name="x"), corrfloat(2, 0.1, name="y")
+    result = budget(x * y + x)
+    assert [s.name for s in result.inputs] == ["x", "y"]
+    assert list(result.variances) == approx([9, 1])
+    assert list(result.fractions) == approx([0.9, 0.1])
+    assert result.variances.sum() == approx(result.value.uncertainty ** 2)
+    assert "90.00" in str(result)
+
+
+def test_function_budget():
+    v, t = labarray([1.0, 2.0, 3.0], 0.1), labfloat(2, 0.1)
+    result = budget(lambda v, t, c: v * t + c, v, t, 5)
+    assert result.inputs == ["v", "t", "c"]
+    assert result.variances.shape == (3, 3)
+    assert list(result.variances[0]) == approx([0.04] * 3)
+    assert list(result.variances[1]) == approx(list((v.mean * 0.1) ** 2))
+    assert not result.variances[2].any()
+    assert list(result.variances.sum(axis=0)) == approx(
+        list(result.value.uncertainty ** 2)
+    )
+
+    scalar = budget(lambda a, b: a / b, labfloat(1, 0.1), labfloat(2, 0.2))
+    assert scalar.fractions.sum() == approx(1)
+    assert numpy.ndim(scalar.variances) == 1
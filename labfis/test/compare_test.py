@@ -0,0 +1,76 @@
+import operator
+import numpy
+from pytest import approx
+from labfis import labfloat, labarray
+from labfis.stats import weighted_mean
+from labfis.compare import (
+    equal,
+    different,
+    less,
+    greater,
+    compatibility_matrix,
+    compatible_pairs,
+    group_compatible,
+)
+
+rng = numpy.random.default_rng()
+means = rng.random(300) * 10
+errors = rng.random(300) * 0.2
+values = labarray(means, errors)
+
+
+def test_operators():
+    x = labfloat(5, 0.5)
+    for op in ["eq", "ne", "lt", "gt", "le", "ge"]:
+        op = getattr(operator, op)
+        assert list(op(values, x)) == [op(v, x) for v in values]
+        assert list(op(x, values)) == [op(x, v) for v in values]
+    assert list(values == 5) == [v == 5 for v in values]
+    assert list(x < values) == [x < v for v in values]
+    assert list(equal(values.tolist(), values)) == [True] * 300
+    assert list(different(values, values)) == [False] * 300
+    assert less([labfloat(1, 0.1)], 2)[0] and greater([3], labfloat(1, 0.1))[0]
+
+
+def test_array_operands():
+    x = labfloat(2, 0.5)
+    for other in [1.4, 2.2, 2.6, 3]:
+        for op in ["eq", "ne", "lt", "gt", "le", "ge"]:
+            op = getattr(operator, op)
+            expected = op(x, other)
+            assert list(op(x, numpy.array([other]))) == [expected]
+            assert list(op(x, labarray([other]))) == [expected]
+
+
+def test_compatibility():
+    matrix = compatibility_matrix(values, block=64)
+    expected = numpy.array([[a == b for b in values] for a in values])
+    assert (matrix == expected).all()
+
+    i, j = compatible_pairs(values, block=64)
+    assert (i < j).all()
+    found = numpy.zeros_like(matrix)
+    found[i, j] = found[j, i] = True
+    numpy.fill_diagonal(found, True)
+    assert (found == (matrix | numpy.eye(300, dtype=bool))).all()
+    assert compatibility_matrix(values, [labfloat(5, 0.5)]).shape == (300, 1)
+
+
+def test_group_compatible():
+    runs = [labfloat(1, 0.1), labfloat(5, 0.1), labfloat(1.2, 0.1), labfloat(9, 1)]
+    labels, combined, counts = group_compatible(runs)
+    assert list(labels) == [0, 1, 0, 2]
+    assert list(counts) == [2, 1, 1]
+    assert combined[0].mean == approx(weighted_mean(runs[::2]).mean)
+    assert combined[0].uncertainty == approx(weighted_mean(runs[::2]).uncertainty)
+
+    labels, combined, counts = group_compatible(values)
+    assert counts.sum() == 300 and len(combined) == labels.max() + 1
+    for g in range(len(combined)):
+        members = values[labels == g]
+        assert combined[g].mean == approx(weighted_mean(members).mean)
+        if g:
+            previous = values[labels == g - 1]
+            assert (previous.mean + 2 * previous.uncertainty).max() <= (
+                members.mean - 2 * members.uncertainty
+            ).min()
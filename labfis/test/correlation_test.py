@@ -0,0 +1,58 @@
+from pytest import approx
+from labfis import labfloat
+from labfis.correlation import corrfloat, covariance, correlation
+
+
+def test_same_measure():
+    x = corrfloat(10, 1)
+    assert (x - x).uncertainty == 0
+    assert (x / x).uncertainty == approx(0)
+    assert (x * x).uncertainty == approx((x ** 2).uncertainty)
+    assert (x + x).uncertainty == approx((2 * x).uncertainty)
+    assert (x.sin() ** 2 + x.cos() ** 2).uncertainty == approx(0)
+
+
+def test_independent():
+    a, b = labfloat(3, 0.2), labfloat(4, 0.3)
+    x, y = corrfloat(3, 0.2), corrfloat(4, 0.3)
+    for f in [
+        lambda p, q: p + q,
+        lambda p, q: p - q,
+        lambda p, q: p * q,
+        lambda p, q: p / q,
+        lambda p, q: p ** q,
+        lambda p, q: q.sin() / p.arctan(),
+    ]:
+        assert f(x, y).uncertainty == approx(f(a, b).uncertainty)
+        assert isinstance(f(x, b), corrfloat) and isinstance(f(a, y), corrfloat)
+
+
+def test_covariance():
+    x, y = corrfloat(10, 1, name="x"), corrfloat(3, 0.5, name="y")
+    z = x + y
+    assert (z - y).uncertainty == approx(x.uncertainty)
+    assert covariance(z, x) == approx(1)
+    assert correlation(z, z) == approx(1)
+    assert correlation(x, y) == 0
+    assert {s.name: d for s, d in (2 * x * y).derivatives.items()} == {
+        "x": 6,
+        "y": 20,
+    }
+
+
+def test_numpy_scalars():
+    import numpy
+    from labfis.reverse import tape, tracked
+
+    c = corrfloat(2, 0.5)
+    k = numpy.float64(3.0)
+    for value in [k * c, c * k, numpy.multiply(k, c), numpy.sin(c), numpy.exp(c)]:
+        assert isinstance(value, corrfloat)
+    assert (k * c - 3 * c).uncertainty == 0
+    assert (numpy.sin(c) - numpy.sin(c)).uncertainty == 0
+
+    t = tape()
+    x = t.input(2, 0.5)
+    y = numpy.float64(2.0) * x
+    assert isinstance(y, tracked) and len(t) == 1
+    assert (y - 2 * x).uncertainty == 0
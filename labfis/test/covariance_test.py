@@ -0,0 +1,43 @@
+import numpy
+from pytest import approx
+from labfis import labfloat, labarray, propagate
+from labfis.autodiff import sin, cos
+from labfis.covariance import propagate_covariance
+
+rng = numpy.random.default_rng()
+
+
+def polar(r, t):
+    return r * cos(t), r * sin(t)
+
+
+def test_single():
+    r, t = labfloat(2, 0.1), labfloat(0.5, 0.02)
+    result = propagate_covariance(polar, [r, t])
+    x, y = propagate(polar, r, t)
+    assert list(result.mean) == approx([x.mean, y.mean])
+    assert list(result.uncertainty) == approx([x.uncertainty, y.uncertainty])
+    j = numpy.array([[cos(0.5), -2 * sin(0.5)], [sin(0.5), 2 * cos(0.5)]])
+    expected = j @ numpy.diag([0.01, 0.0004]) @ j.T
+    assert result.covariance == approx(expected)
+    assert result.correlation[0, 0] == approx(1)
+
+    correlated = propagate_covariance(lambda a, b: a + b, [1, 2], [[1, 0.5], [0.5, 1]])
+    assert correlated.covariance[0, 0] == approx(3)
+
+
+def test_batched():
+    means = numpy.column_stack([rng.random(100) + 1, rng.random(100)])
+    errors = rng.random((100, 2)) * 0.1
+    result = propagate_covariance(polar, labarray(means, errors))
+    assert result.covariance.shape == (100, 2, 2)
+    for i in [0, 50, 99]:
+        single = propagate_covariance(polar, labarray(means[i], errors[i]))
+        assert result.mean[i] == approx(single.mean)
+        assert result.covariance[i] == approx(single.covariance)
+
+    shared = numpy.array([[0.01, 0.001], [0.001, 0.02]])
+    result = propagate_covariance(polar, means, shared)
+    single = propagate_covariance(polar, means[7], shared)
+    assert result.covariance[7] == approx(single.covariance)
+    assert result.values.shape == (100, 2)
@@ -0,0 +1,52 @@
+import numpy
+from pytest import approx
+from labfis import labfloat, labarray
+from labfis.autodiff import exp
+from labfis.fit import linear_fit, polyfit, curve_fit
+
+rng = numpy.random.default_rng(0)
+x = numpy.linspace(0, 10, 200)
+ey = numpy.full_like(x, 0.1)
+
+
+def test_linear():
+    y = labarray(2 + 3 * x + rng.normal(0, 0.1, x.size), ey)
+    (a, b), cov, chi2, ndof, residuals = linear_fit(x, y)
+
+    w = 1 / ey ** 2
+    delta = w.sum() * (w * x ** 2).sum() - (w * x).sum() ** 2
+    assert b.uncertainty == approx((w.sum() / delta) ** 0.5)
+    assert a.uncertainty == approx(((w * x ** 2).sum() / delta) ** 0.5)
+    assert a == 2 and b == 3
+    assert ndof == 198 and chi2 == approx(((residuals / ey) ** 2).sum())
+
+
+def test_polynomial():
+    y = [labfloat(1 - 2 * t + 0.5 * t ** 2, 0.01) for t in x]
+    result = polyfit(x, y, 2)
+    assert list(result.parameters.mean) == approx([1, -2, 0.5])
+    assert result.chi2 == approx(0, abs=1e-12)
+
+
+def test_curve():
+    y = labarray(5 * numpy.exp(-0.3 * x) + rng.normal(0, 0.01, x.size), 0.01)
+
+    result = curve_fit(lambda t, a, k: a * exp(-k * t), x, y, [1, 1])
+    numeric = curve_fit(lambda t, a, k: a * numpy.exp(-k * t), x, y, [1, 1])
+    assert result.parameters[0] == 5 and result.parameters[1] == 0.3
+    assert list(result.parameters.mean) == approx(list(numeric.parameters.mean))
+    assert result.covariance == approx(numeric.covariance, rel=1e-4)
+
+    line = curve_fit(lambda t, a, b: a + b * t, x, y, [0, 0])
+    assert line.covariance == approx(linear_fit(x, y).covariance)
+
+
+def test_x_uncertainty():
+    xs = labarray(x + rng.normal(0, 0.05, x.size), 0.05)
+    y = labarray(1 + 2 * x + rng.normal(0, 0.1, x.size), 0.1)
+    result = polyfit(xs, y)
+    assert result.chi2 / result.ndof == approx(1, abs=0.3)
+    assert (
+        result.parameters[1].uncertainty
+        > linear_fit(xs.mean, y).parameters[1].uncertainty
+    )
@@ -1,5 +1,8 @@
+import numpy
 from random import uniform
-from labfis import u, labfloat
+from pytest import raises
+from labfis import u, labfloat, labarray
+from labfis.uncertainty import LabFloatError
 
 
 def test_infix():
@@ -11,3 +14,37 @@ def test_infix():
 def test_attrs():
     x = labfloat(10, 1)
     assert x.mean == 10 and x.uncertainty == 1
+
+
+def test_bulk_infix():
+    x = numpy.arange(5.0)
+    for values in [x | u | 0.1, list(x) << u >> 0.1, x | u | numpy.full(5, -0.1)]:
+        assert isinstance(values, labarray)
+        assert list(values.mean) == list(x)
+        assert list(values.uncertainty) == [0.1] * 5
+    assert (2 | u | [0.1, 0.2]).shape == (2,)
+    with raises(LabFloatError):
+        [1, 2] | u | [0.1, 0.2, 0.3]
+
+
+def test_pickle_copy():
+    import copy
+    import pickle
+    from labfis import corrfloat
+
+    x = labfloat(1.5, 0.25)
+    for y in [pickle.loads(pickle.dumps(x)), copy.copy(x), copy.deepcopy(x)]:
+        assert isinstance(y, labfloat)
+        assert (y.mean, y.uncertainty) == (1.5, 0.25)
+    values = [labfloat(i, 0.1) for i in range(100)]
+    assert len(pickle.dumps(values)) < 25 * len(values)
+
+    c = pickle.loads(pickle.dumps(corrfloat(2, 0.5, name="c")))
+    assert isinstance(c, corrfloat) and (c - c).uncertainty == 0
+
+    a = labarray([1.0, 2.0], 0.1)
+    for b in [pickle.loads(pickle.dumps(a)), copy.copy(a), copy.deepcopy(a)]:
+        assert list(b.mean) == [1, 2] and list(b.uncertainty) == [0.1, 0.1]
+    b = copy.copy(a)
+    b.mean[0] = 5
+    assert a.mean[0] == 1
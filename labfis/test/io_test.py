@@ -0,0 +1,115 @@
+import io
+import numpy
+from pytest import approx, raises
+from labfis import labfloat, labarray
+from labfis.uncertainty import LabFloatError
+from labfis.io import parse, read_chunks, read_rows, save, load, pack, unpack
+
+
+def test_parse():
+    assert parse("1.5") == (1.5, 0.0)
+    assert parse(str(labfloat(1e20, 3))) == (1e20, 3.0)
+    assert parse(" 2 +/- 0.1 ") == (2, 0.1)
+    assert parse("1e+05+-3") == (1e5, 3)
+    with raises(LabFloatError):
+        parse("x")
+
+
+def test_read_chunks():
+    text = "x,dx,y\n" + "".join(
+        "{0},0.1,{1}\n".format(i, labfloat(2 * i, 0.2)) for i in range(10)
+    )
+    chunks = list(read_chunks(io.StringIO(text), [("x", "dx"), "y"], chunksize=4))
+    assert [len(x) for x, y in chunks] == [4, 4, 2]
+    x, y = chunks[-1]
+    assert isinstance(x, labarray)
+    assert list(x.mean) == [8, 9] and list(x.uncertainty) == approx([0.1, 0.1])
+    assert list(y.mean) == [16, 18] and list(y.uncertainty) == approx([0.2, 0.2])
+
+    numbers = io.StringIO("1 0.5\n2 0.5\n\n3 0.5\n")
+    (x,) = next(read_chunks(numbers, [(0, 1)], delimiter=None, header=False))
+    assert list(x.mean) == [1, 2, 3]
+
+
+def test_read_rows():
+    text = "a,b\n1,(2 ± 1)\n3,(4 ± 1)\n"
+    rows = list(read_rows(io.StringIO(text)))
+    assert len(rows) == 2
+    a, b = rows[1]
+    assert isinstance(b, labfloat)
+    assert (a.mean, b.mean, b.uncertainty) == (3, 4, 1)
+    with raises(LabFloatError):
+        list(read_rows(io.StringIO(text), ["c"]))
+
+
+def test_binary(tmp_path):
+    path = str(tmp_path / "data.lab")
+    t = labarray(numpy.arange(1000.0), 0.5)
+    grid = labarray(numpy.ones((3, 4)), numpy.full((3, 4), 0.1))
+    save(path, {"t": t, "grid": grid, "v": [labfloat(1, 0.1)]}, {"unit": "s"})
+
+    for mmap in (True, False):
+        data = load(path, mmap)
+        assert list(data.columns) == ["t", "grid", "v"]
+        assert data.metadata == {"unit": "s"}
+        assert numpy.array_equal(data.columns["t"].mean, t.mean)
+        assert numpy.array_equal(data.columns["grid"].uncertainty, grid.uncertainty)
+        part = data.columns["t"][10:20] * 2
+        assert part[0].mean == 20 and part[0].uncertainty == 1
+        assert data.columns["v"][0].uncertainty == approx(0.1)
+
+    buffer = io.BytesIO()
+    save(buffer, {"t": t, "grid": grid})
+    buffer.seek(0)
+    assert numpy.array_equal(load(buffer).columns["grid"].mean, grid.mean)
+    with open(path, "rb") as f:
+        assert load(f).columns["t"][999].mean == 999
+    with raises(LabFloatError):
+        load(io.BytesIO(buffer.getvalue()[:-8]))
+
+    (tmp_path / "other").write_bytes(b"not labfis")
+    with raises(LabFloatError):
+        load(str(tmp_path / "other"))
+
+
+def test_pack():
+    values = [labfloat(i * 0.5, 0.1 * i) for i in range(1000)]
+    data = pack(values)
+    assert len(data) == 16 + 16 * len(values)
+    assert [(x.mean, x.uncertainty) for x in unpack(data)] == [
+        (x.mean, x.uncertainty) for x in values
+    ]
+    array = unpack(pack(labarray([[1, 2], [3, 4]], 0.5)), array=True)
+    assert list(array.mean) == [1, 2, 3, 4] and list(array.uncertainty) == [0.5] * 4
+    assert unpack(pack([])) == []
+    with raises(LabFloatError):
+        unpack(b"not packed")
+
+
+def test_comments():
+    plain = "t,x\n# calibration run\n1,2  # first\n\n2,3\n"
+    mixed = "t,x\n# calibration run\n1,2 ± 0.1  # first\n\n2,3 ± 0.2\n"
+    for text, errors in [(plain, [0, 0]), (mixed, [0.1, 0.2])]:
+        for chunksize in [1, 100]:
+            chunks = list(read_chunks(io.StringIO(text), chunksize=chunksize))
+            t = numpy.concatenate([c[0].mean for c in chunks])
+            x = numpy.concatenate([c[1].uncertainty for c in chunks])
+            assert list(t) == [1, 2] and list(x) == approx(errors)
+
+
+def test_layout():
+    text = "# units: s, m\n\na,b\n1,(2 ± 1)\n"
+    ((a, b),) = read_rows(io.StringIO(text))
+    assert (a.mean, b.mean, b.uncertainty) == (1, 2, 1)
+
+    values = [labfloat(1.5, 0.1), labfloat(2, 0.2)]
+    text = "".join("{0} {1} 7\n".format(i, x) for i, x in enumerate(values))
+    rows = list(read_rows(io.StringIO(text), delimiter=None, header=False))
+    assert [(r[1].mean, r[1].uncertainty, r[2].mean) for r in rows] == [
+        (1.5, 0.1, 7),
+        (2, 0.2, 7),
+    ]
+    with raises(LabFloatError, match="Line 3"):
+        list(read_chunks(io.StringIO("a b\n1 2\n3\n"), [1], delimiter=None))
+    with raises(LabFloatError, match="Line 2"):
+        list(read_chunks(io.StringIO("a,b\n(1 ± 2)\n"), ["b"]))
@@ -0,0 +1,37 @@
+from io import StringIO
+from pytest import raises
+from labfis import labfloat, labarray, textable
+from labfis.uncertainty import LabFloatError
+from labfis.latex import texrows
+
+
+def test_tex():
+    x = labfloat(1.23456, 0.0123)
+    assert x.tex() == r"(1.23\, \pm \,0.01)"
+    assert x.tex(2) == r"(1.23\cdot 10^{+00}\, \pm \,1.00\cdot 10^{-02})"
+    assert x.tex((1, 2), 3) == r"(1.2\cdot 10^{+00}\, \pm \,1.20\cdot 10^{-02})"
+    assert labfloat(1e20, 3e18).tex() == r"(1\cdot 10^{+20}\, \pm \,3\cdot 10^{+18})"
+    assert labfloat(2.345).tex() == "2.3"
+
+
+def test_table():
+    x = labarray([1.234, 2.345], [0.01, 0.02])
+    y = [labfloat(10, 1), labfloat(20, 2)]
+    rows = list(texrows(x, y, [1, 2]))
+    assert (
+        rows[0]
+        == " & ".join([x[0].tex(), y[0].tex(), labfloat(1).tex()]) + r" \\" + "\n"
+    )
+
+    f = StringIO()
+    textable(f, x, y, header=["$x$", "$y$"])
+    lines = f.getvalue().splitlines()
+    assert lines[0] == r"\begin{tabular}{cc}"
+    assert lines[2] == r"$x$ & $y$ \\"
+    assert lines[4] == r"(1.23\, \pm \,0.01) & (10\, \pm \,1) \\"
+    assert lines[-1] == r"\end{tabular}"
+
+    rows = list(texrows(x, y, precision=[1, 2]))
+    assert rows[0] == " & ".join([x[0].tex(1), y[0].tex(2)]) + r" \\" + "\n"
+    with raises(LabFloatError):
+        list(texrows(x, x, precision=[2]))
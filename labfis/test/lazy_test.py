@@ -0,0 +1,55 @@
+import numpy
+from pytest import approx, raises
+from labfis import labfloat, labarray, propagate
+from labfis.uncertainty import LabFloatError
+from labfis import umath
+from labfis.lazy import lazy, graph
+
+
+def check(x, y):
+    assert x.mean == approx(y.mean) and x.uncertainty == approx(y.uncertainty)
+
+
+def test_scalar():
+    a, b, c, d = [labfloat(m, e) for m, e in [(2, 0.1), (3, 0.2), (5, 0.3), (7, 0.4)]]
+    la, lb, lc, ld = lazy(a, "a"), lazy(b, "b"), lazy(c, "c"), lazy(d, "d")
+    expr = (la * lb + lc / ld) ** 2
+    check(expr.evaluate(), (a * b + c / d) ** 2)
+    check((la.sin() * 2 - lb.exp()).evaluate(), a.sin() * 2 - umath.exp(b))
+
+    assert (la - la).evaluate().uncertainty == 0
+    check((la * la).evaluate(), propagate(lambda x: x * x, a))
+
+    check(expr.evaluate(a=labfloat(4, 0.1)), (labfloat(4, 0.1) * b + c / d) ** 2)
+    check(expr.evaluate(1, 2, 3, 4), labfloat((1 * 2 + 3 / 4) ** 2))
+    assert expr.compile() is expr.compile()
+    with raises(LabFloatError):
+        expr.evaluate(e=1)
+
+
+def test_vectorized():
+    x = labarray(numpy.linspace(1, 2, 10), 0.1)
+    t = labfloat(2, 0.1)
+    lx, lt = lazy(x), lazy(t)
+    result = (lx * lt + lx ** 2 / lt).evaluate()
+    check(result[3], propagate(lambda x, t: x * t + x ** 2 / t, x[3], t))
+
+    c = labfloat(0.5, 0.01)
+    first, second = graph(lx * c, lx.cos())()
+    check(second[0], x[0].cos())
+    check(first[9], x[9] * c)
+
+    deep = lazy(labfloat(1, 0.1))
+    for _ in range(5000):
+        deep = deep + 1
+    check(deep.evaluate(), labfloat(5001, 0.1))
+
+
+def test_many_inputs():
+    values = [labfloat(i, 0.1) for i in range(6000)]
+    total = lazy(values[0])
+    for v in values[1:]:
+        total = total + lazy(v)
+    result = total.evaluate()
+    assert result.mean == approx(sum(range(6000)))
+    assert result.uncertainty == approx(0.1 * 6000 ** 0.5)
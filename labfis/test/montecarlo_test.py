@@ -0,0 +1,26 @@
+import numpy
+from pytest import approx
+from labfis import labfloat, propagate
+from labfis.autodiff import sin
+from labfis.montecarlo import montecarlo
+
+
+def model(x, y):
+    return x * y + numpy.sin(x)
+
+
+def test_linear():
+    a, b = labfloat(3, 0.01), labfloat(2, 0.02)
+    result = montecarlo(model, a, b, samples=200000, chunksize=30000, seed=1)
+    expected = propagate(lambda x, y: x * y + sin(x), a, b)
+    assert result.samples == 200000
+    assert result.value.mean == approx(expected.mean, rel=1e-3)
+    assert result.value.uncertainty == approx(expected.uncertainty, rel=2e-2)
+    assert result.percentiles[2.5] < result.percentiles[50] < result.percentiles[97.5]
+
+
+def test_reproducible():
+    a = labfloat(1, 0.5)
+    r1 = montecarlo(model, a, 2, samples=50000, chunksize=10000, seed=7)
+    r2 = montecarlo(model, a, 2, samples=50000, chunksize=10000, seed=7, processes=2)
+    assert r1 == r2
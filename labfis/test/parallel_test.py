@@ -0,0 +1,39 @@
+import numpy
+from pytest import approx, raises
+from labfis import labfloat, labarray
+from labfis.uncertainty import LabFloatError
+from labfis.parallel import parallel_map
+
+
+def model(x, k, y):
+    return (x * k).sin() / y
+
+
+def polar(r, t):
+    return r * t.cos(), r * t.sin()
+
+
+def check(a, b):
+    assert list(a.mean) == approx(list(b.mean))
+    assert list(a.uncertainty) == approx(list(b.uncertainty))
+
+
+def test_parallel_map():
+    x = labarray(numpy.linspace(0, 3, 1001), 0.01)
+    y = labarray(numpy.linspace(1, 2, 1001), numpy.linspace(0.1, 0.2, 1001))
+    k = labfloat(2, 0.1)
+    for processes in [1, 2]:
+        result = parallel_map(model, x, k, y, processes=processes, chunksize=100)
+        assert isinstance(result, labarray)
+        check(result, model(x, k, y))
+
+    r, t = parallel_map(polar, y, x, processes=2)
+    check(r, polar(y, x)[0])
+    check(t, polar(y, x)[1])
+
+
+def test_errors():
+    with raises(LabFloatError):
+        parallel_map(model, labfloat(1, 0.1), 2, 3)
+    with raises(LabFloatError):
+        parallel_map(polar, labarray([1, 2], 0.1), labarray([1], 0.1))
@@ -0,0 +1,101 @@
+import numpy
+from pytest import approx, raises
+from labfis import labfloat, corrfloat, propagate
+from labfis.uncertainty import LabFloatError
+from labfis.reverse import tape
+
+
+def test_operations():
+    t = tape()
+    x, y = t.input(3, 0.2, name="x"), t.input(labfloat(4, 0.3))
+    cx, cy = corrfloat(3, 0.2), corrfloat(4, 0.3)
+    for f in [
+        lambda p, q: p + q * 2,
+        lambda p, q: 1 - p - q,
+        lambda p, q: p * q / (2 + p),
+        lambda p, q: 2 / p - q ** 2,
+        lambda p, q: p ** q + 2 ** p,
+        lambda p, q: q.sin() / p.arctan() + p.cos() * q.tan(),
+        lambda p, q: (p * q).sqrt() - abs(-p),
+    ]:
+        r, c = f(x, y), f(cx, cy)
+        assert r.mean == approx(c.mean)
+        assert r.uncertainty == approx(c.uncertainty)
+
+    assert (x - x).uncertainty == 0
+    assert (x.sin() ** 2 + x.cos() ** 2).uncertainty == approx(0)
+    z = x.exp() * y.log()
+    assert list(t.gradient(z)) == approx(
+        [numpy.exp(3) * numpy.log(4), numpy.exp(3) / 4]
+    )
+    assert str(z) == str(propagate(lambda p, q: p.exp() * q.log(), x, y))
+
+
+def test_mixed():
+    t = tape()
+    x = t.input(3, 0.2)
+    y = x * labfloat(4, 0.3) + labfloat(1)
+    assert len(t.inputs) == 2
+    assert y.uncertainty == approx((labfloat(3, 0.2) * labfloat(4, 0.3)).uncertainty)
+    assert numpy.diag(t.covariance(x, y)) == approx([0.04, y.uncertainty ** 2])
+    with raises(LabFloatError):
+        x + tape().input(1, 0.1)
+
+
+def test_many_inputs():
+    t = tape()
+    errors = numpy.linspace(0.1, 1, 2000)
+    x = [t.input(i, e) for i, e in enumerate(errors)]
+    total = sum(x)
+    assert len(t) == 2000
+    assert total.uncertainty == approx(numpy.sqrt(numpy.sum(errors ** 2)))
+    assert t.gradient(total) == approx(numpy.ones(2000))
+
+
+def test_checkpoint():
+    def step(p, q):
+        return (p * 0.9 + q.sin() * 0.1, q * 1.01 - p * 0.01)
+
+    t, reference = tape(limit=50), tape()
+    a, b = t.input(1, 0.1), t.input(2, 0.2)
+    ra, rb = reference.input(1, 0.1), reference.input(2, 0.2)
+    for _ in range(100):
+        if len(t) > 40:
+            old = a
+            a, b = t.checkpoint(a, b)
+            assert len(t) == 2
+        a, b = step(a, b)
+        ra, rb = step(ra, rb)
+    assert a.mean == approx(ra.mean) and b.mean == approx(rb.mean)
+    assert t.gradient(a) == approx(reference.gradient(ra))
+    assert t.covariance(a, b) == approx(reference.covariance(ra, rb))
+    with raises(LabFloatError):
+        old + 1
+    with raises(LabFloatError):
+        for _ in range(100):
+            a, b = step(a, b)
+
+
+def test_umath():
+    from labfis import umath
+
+    t = tape()
+    x, y = t.input(3, 0.2), t.input(4, 0.3)
+    assert (umath.exp(x) - x.exp()).uncertainty == 0
+    z = umath.hypot(x, y) + umath.arctan2(2.0, x) + umath.log(y)
+    r = umath.hypot(x, x)
+    assert len(t) == 9
+    assert list(t.gradient(z)) == approx([3 / 5 - 2 / 13, 4 / 5 + 1 / 4])
+    assert t.gradient(r) == approx([numpy.sqrt(2), 0])
+
+
+def test_pickle():
+    import copy
+    import pickle
+
+    t = tape()
+    x = t.input(3, 0.2)
+    y = x * 2
+    for value in [pickle.loads(pickle.dumps(y)), copy.deepcopy(y), copy.copy(y)]:
+        assert value.mean == 6 and value.uncertainty == approx(0.4)
+    assert type(pickle.loads(pickle.dumps(y))) is labfloat
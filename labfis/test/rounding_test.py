@@ -0,0 +1,84 @@
+from random import uniform, randint, choice
+from threading import Thread
+import numpy
+from decimal import Decimal, getcontext, setcontext, Context, ROUND_HALF_UP
+from labfis import labfloat, labarray, round_many, format_many
+from labfis.rounding import round_pair
+
+
+def decimal_round(mean, uncertainty, p=0):
+    current_contex = getcontext()
+    setcontext(Context(rounding=ROUND_HALF_UP))
+
+    u = Decimal(str(uncertainty))
+    m = Decimal(str(mean))
+    r = p - u.adjusted() * (not p)
+    u = round(u, r)
+    r = p - u.adjusted() * (not p)
+    u += Decimal("1e{}".format(-r)) * (not u)
+    m = round(m, r)
+
+    setcontext(current_contex)
+    return type(mean)(m), type(uncertainty)(u)
+
+
+def random_pair():
+    m = uniform(-1, 1) * 10 ** randint(-10, 10)
+    u = abs(m) * 10 ** uniform(-6, 1)
+    return choice([(m, u), (round(m, 2), round(u, 2)), (randint(-999, 999), u)])
+
+
+def test_round_pair():
+    for _ in range(5000):
+        m, u = random_pair()
+        p = choice([0, 0, 1, 3])
+        assert round_pair(m, u, p) == decimal_round(m, u, p)
+
+
+def test_ties():
+    assert str(labfloat(0.15, 0.15)) == "(0.2 ± 0.2)"
+    assert str(labfloat(2.5, 0.25)) == "(2.5 ± 0.3)"
+    assert str(labfloat(-2.45, 0.05)) == "(-2.45 ± 0.05)"
+    assert str(labfloat(1.0, 0.96)) == "(1 ± 1)"
+    assert str(labfloat(1234, 56)) == "(1230 ± 60)"
+    assert str(labfloat(5.0)) == "(5 ± 0.1)"
+
+
+def test_many():
+    values = [labfloat(*random_pair()) for _ in range(100)]
+    assert format_many(values) == [str(x) for x in values]
+    assert round_many(values, p=2) == [tuple(round(x, 2)) for x in values]
+
+    array = labarray(values)
+    assert format_many(array) == format_many(array.mean, array.uncertainty)
+
+
+def test_vectorized():
+    pairs = [random_pair() for _ in range(5000)]
+    pairs += [(0.15, 0.15), (2.5, 0.25), (-2.45, 0.05), (1.0, 0.96), (5.0, 0.0)]
+    pairs += [(-0.0, 0.3), (1e30, 1e28), (3.0, 1e-300), (0.5, -0.0)]
+    means = numpy.array([float(m) for m, u in pairs])
+    errors = numpy.array([float(u) for m, u in pairs])
+    for p in [0, 1, 3]:
+        expected = [
+            round_pair(m, u, p) for m, u in zip(means.tolist(), errors.tolist())
+        ]
+        assert [str(x) for x in round_many(means, errors, p)] == [
+            str(x) for x in expected
+        ]
+
+
+def test_threads():
+    values = [random_pair() for _ in range(2000)]
+    expected = [decimal_round(m, u) for m, u in values]
+    results = {}
+
+    def worker(i):
+        results[i] = [round_pair(m, u) for m, u in values]
+
+    threads = [Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(r == expected for r in results.values())
@@ -0,0 +1,71 @@
+import numpy
+from pytest import approx, raises
+from labfis import labfloat, labarray
+from labfis.uncertainty import LabFloatError
+from labfis.stats import lsum, lmean, weighted_mean, sample_mean, accumulator
+
+rng = numpy.random.default_rng()
+means = rng.random(100) * 10
+errors = rng.random(100) + 0.1
+
+
+def test_sum():
+    values = labfloat(list(means), list(errors))
+    expected = sum(values)
+    for result in [lsum(values), lsum(iter(values)), lsum(labarray(values))]:
+        assert result.mean == approx(expected.mean)
+        assert result.uncertainty == approx(expected.uncertainty)
+    assert lsum([1e16, labfloat(1, 1), -1e16]).mean == 1
+    assert lmean(values).uncertainty == approx(expected.uncertainty / 100)
+
+
+def test_weighted_mean():
+    x = weighted_mean([labfloat(1, 1), labfloat(2, 1), labfloat(4, 2)])
+    assert x.mean == approx((1 + 2 + 1) / 2.25)
+    assert x.uncertainty == approx(2.25 ** -0.5)
+    assert weighted_mean(labarray(means, errors)).mean == approx(
+        weighted_mean(labarray(means, errors).tolist()).mean
+    )
+    y = weighted_mean(iter(labarray(means, errors).tolist()))
+    assert y.uncertainty == approx(weighted_mean(labarray(means, errors)).uncertainty)
+    with raises(LabFloatError):
+        weighted_mean([labfloat(1, 1), labfloat(2)])
+    with raises(LabFloatError):
+        weighted_mean([labfloat(1, 1), 2.0])
+
+
+def test_sample_mean():
+    x = sample_mean(list(means))
+    assert x.mean == approx(means.mean())
+    assert x.uncertainty == approx(means.std(ddof=1) / 10)
+    assert sample_mean(labarray(means, errors)).uncertainty == approx(x.uncertainty)
+    with raises(LabFloatError):
+        sample_mean([1])
+
+
+def test_accumulator():
+    expected = sample_mean(means)
+    for acc in [
+        accumulator().add(means),
+        accumulator().add(means[:30]).merge(accumulator().add(labarray(means[30:]))),
+        accumulator().add(list(means[:50])) + accumulator().add(iter(means[50:])),
+    ]:
+        assert acc.count == 100
+        assert acc.value.mean == approx(expected.mean)
+        assert acc.value.uncertainty == approx(expected.uncertainty)
+
+    acc = accumulator()
+    for x in means:
+        acc.add(labfloat(x, 1))
+    assert acc.value.uncertainty == approx(expected.uncertainty)
+
+    window = accumulator(window=10).add(means[:50])
+    for x in means[50:]:
+        window.add(x)
+    assert window.count == 10
+    assert window.value.mean == approx(sample_mean(means[-10:]).mean)
+    assert window.value.uncertainty == approx(sample_mean(means[-10:]).uncertainty)
+    with raises(LabFloatError):
+        window.merge(accumulator())
+    with raises(LabFloatError):
+        accumulator().add(1).value
@@ -0,0 +1,69 @@
+import numpy
+from pytest import approx, raises
+from labfis import labfloat, labarray, weighted_mean, lmean, sample_mean
+from labfis.uncertainty import LabFloatError
+from labfis.table import labtable
+
+
+def test_columns():
+    table = labtable.frommeasures(
+        ["t", "x"], [1, 2, 4], [0.1] * 3, [3, 5, 6], [0.2] * 3
+    )
+    table["run"] = [0, 1, 0]
+    assert table.columns == ["t", "x", "run"] and len(table) == 3
+    assert isinstance(table["x"], labarray) and table["x"][1] == labfloat(5, 0.2)
+    assert isinstance(table["run"], numpy.ndarray)
+
+    selected = table[table["t"].mean > 1]
+    assert len(selected) == 2 and list(selected["x"].mean) == [5, 6]
+    assert list(table[::2]["t"].mean) == [1, 4] and len(table[1]) == 1
+    with raises(LabFloatError):
+        table["y"] = [1, 2]
+    with raises(LabFloatError):
+        table["y"]
+    with raises(LabFloatError):
+        labtable.frommeasures(["t"], [1], [0.1], [2])
+
+
+def test_derived():
+    calls = []
+
+    def speed(x, t):
+        calls.append(1)
+        return x / t
+
+    table = labtable(t=labarray([1, 2, 4], 0.1), x=labarray([3, 5, 6], 0.2))
+    table.derive("v", speed).derive("v2", lambda v: v ** 2)
+    assert not calls
+    assert table["v2"][0].mean == approx(9)
+    assert table["v"] is table["v"] and len(calls) == 1
+    assert table["v"][2].uncertainty == approx(
+        (labfloat(6, 0.2) / labfloat(4, 0.1)).uncertainty
+    )
+
+    table["t"] = labarray([1, 1, 1], 0.1)
+    assert list(table["v2"].mean) == approx([9, 25, 36]) and len(calls) == 2
+    assert list(table[table["x"].mean > 4]["v"].mean) == approx([5, 6])
+    with raises(LabFloatError):
+        table.derive("w", lambda y: y)
+
+
+def test_groupby():
+    runs = numpy.array([2, 1, 2, 1, 1])
+    x = labarray([1.0, 2.0, 3.0, 4.0, 5.0], [0.1, 0.2, 0.3, 0.4, 0.5])
+    table = labtable(run=runs, x=x, y=x * 2)
+    for how, reference in [
+        ("mean", lmean),
+        ("weighted_mean", weighted_mean),
+        ("sample_mean", sample_mean),
+    ]:
+        grouped = table.groupby("run", how, y="sum")
+        assert list(grouped["run"]) == [1, 2]
+        for i, key in enumerate([1, 2]):
+            expected = reference(x[runs == key])
+            assert grouped["x"][i].mean == approx(expected.mean)
+            assert grouped["x"][i].uncertainty == approx(expected.uncertainty)
+            total = numpy.sum((x * 2)[runs == key])
+            assert grouped["y"][i].uncertainty == approx(total.uncertainty)
+    with raises(LabFloatError):
+        table.groupby("run", "median")
@@ -0,0 +1,42 @@
+import numpy
+from pytest import approx
+from labfis import labfloat, labarray, corrfloat, propagate
+from labfis import umath
+
+unary = ["sqrt", "exp", "log", "log10", "sinh", "cosh", "tanh", "erf", "arctan"]
+
+
+def test_unary():
+    x = labfloat(0.4, 0.01)
+    array = labarray([0.2, 0.4, 0.6], 0.01)
+    for name in unary:
+        f = getattr(umath, name)
+        result = f(x)
+        step = 1e-7
+        derivative = (f(0.4 + step) - f(0.4 - step)) / (2 * step)
+        assert result.mean == approx(f(0.4))
+        assert result.uncertainty == approx(abs(derivative) * 0.01, rel=1e-5)
+        assert f(array)[1].uncertainty == approx(result.uncertainty)
+        assert propagate(f, x).uncertainty == approx(result.uncertainty)
+
+    y = corrfloat(0.4, 0.01, name="y")
+    assert (umath.exp(y) - umath.exp(y)).uncertainty == 0
+    assert numpy.exp(array)[1].mean == approx(numpy.exp(0.4))
+    assert isinstance(numpy.log(x), labfloat)
+
+
+def test_binary():
+    x, y = labfloat(3, 0.1), labfloat(4, 0.2)
+    h = umath.hypot(x, y)
+    assert h.mean == 5
+    assert h.uncertainty == approx(((0.6 * 0.1) ** 2 + (0.8 * 0.2) ** 2) ** 0.5)
+    a = umath.arctan2(y, x)
+    expected = propagate(lambda y, x: umath.arctan2(y, x), y, x)
+    assert a.mean == approx(expected.mean)
+    assert a.uncertainty == approx(expected.uncertainty)
+    xs = labarray([3.0, 6.0], 0.1)
+    assert numpy.hypot(xs, y)[0].uncertainty == approx(h.uncertainty)
+
+    c = corrfloat(3, 0.1, name="c")
+    assert umath.arctan2(c, c).uncertainty == approx(0, abs=1e-15)
+    assert umath.hypot(3, 4) == 5
@@ -0,0 +1,179 @@
+from __future__ import annotations
+import logging
+import math
+from collections.abc import Callable
+from typing import Union
+from numbers import Number
+
+import numpy as np
+
+from labfis.uncertainty import labfloat, LabFloatError
+from labfis.array import labarray
+from labfis.correlation import corrfloat
+
+logger = logging.getLogger(__name__)
+
+_verf = np.vectorize(math.erf, otypes=[np.float64])
+
+
+def _erf(x: object) -> object:
+    """Error function of numbers or numpy arrays, numbers are not converted to arrays."""
+    if np.ndim(x):
+        return _verf(x)
+    return math.erf(x)
+
+
+_unary = {
+    "sqrt": (math.sqrt, np.sqrt, lambda x, fx, m: 0.5 / fx),
+    "exp": (math.exp, np.exp, lambda x, fx, m: fx),
+    "log": (math.log, np.log, lambda x, fx, m: 1 / x),
+    "log10": (math.log10, np.log10, lambda x, fx, m: 1 / (x * math.log(10))),
+    "cos": (math.cos, np.cos, lambda x, fx, m: -m.sin(x)),
+    "sin": (math.sin, np.sin, lambda x, fx, m: m.cos(x)),
+    "tan": (math.tan, np.tan, lambda x, fx, m: 1 + fx ** 2),
+    "arcsin": (math.asin, np.arcsin, lambda x, fx, m: (1 - x ** 2) ** -0.5),
+    "arccos": (math.acos, np.arccos, lambda x, fx, m: -((1 - x ** 2) ** -0.5)),
+    "arctan": (math.atan, np.arctan, lambda x, fx, m: 1 / (1 + x ** 2)),
+    "sinh": (math.sinh, np.sinh, lambda x, fx, m: m.cosh(x)),
+    "cosh": (math.cosh, np.cosh, lambda x, fx, m: m.sinh(x)),
+    "tanh": (math.tanh, np.tanh, lambda x, fx, m: 1 - fx ** 2),
+    "erf": (math.erf, _erf, lambda x, fx, m: 2 / math.sqrt(math.pi) * m.exp(-(x ** 2))),
+}
+"""dict: Scalar function, vectorized function and derivative of the unary functions.
+
+The derivative is a function of x, f(x) and the module used for the scalar (math) or
+vectorized (numpy) evaluation.
+"""
+
+_binary = {
+    "hypot": (
+        math.hypot,
+        np.hypot,
+        lambda x, y, fxy: (x / fxy, y / fxy),
+    ),
+    "arctan2": (
+        math.atan2,
+        np.arctan2,
+        lambda y, x, fxy: (x / (x ** 2 + y ** 2), -y / (x ** 2 + y ** 2)),
+    ),
+}
+"""dict: Scalar function, vectorized function and partial derivatives of the binary functions."""
+
+
+def _tracked(value: object) -> bool:
+    """If the value is recorded in a reverse-mode tape, see labfis.reverse."""
+    if type(value) is labfloat or not isinstance(value, labfloat):
+        return False
+    # NOTE: imported here because labfis.reverse depends on this module.
+    from labfis.reverse import tracked
+
+    return isinstance(value, tracked)
+
+
+def _unary_function(name: str) -> Callable:
+    f, vf, df = _unary[name]
+
+    def function(
+        x: Union[labfloat, labarray, Number, np.ndarray]
+    ) -> Union[labfloat, labarray, Number, np.ndarray]:
+        if isinstance(x, corrfloat):
+            fx = f(x.mean)
+            return x._chain(fx, df(x.mean, fx, math))
+        if _tracked(x):
+            return getattr(x, name)()
+        if isinstance(x, labfloat):
+            m = x.mean
+            fx = f(m)
+            return labfloat._new(fx, abs(df(m, fx, math)) * x.uncertainty)
+        if isinstance(x, labarray):
+            m = x.mean
+            fx = vf(m)
+            return labarray._new(fx, np.abs(df(m, fx, np)) * x.uncertainty)
+        if isinstance(x, Number):
+            return f(x)
+        if isinstance(x, np.ndarray):
+            return vf(x)
+        method = getattr(x, name, None)
+        if method is None:
+            raise LabFloatError("%s of %s is not supported.", name, type(x).__name__)
+        return method()
+
+    function.__name__ = name
+    function.__doc__ = (
+        "{0} of a labfloat, labarray or number, propagating the error.".format(name)
+    )
+    return function
+
+
+_supported = (labfloat, labarray, Number, np.ndarray)
+"""tuple: Types of the binary functions' arguments, others are passed to labfis.autodiff."""
+
+
+def _binary_function(name: str) -> Callable:
+    f, vf, df = _binary[name]
+
+    def function(
+        a: Union[labfloat, labarray, Number, np.ndarray],
+        b: Union[labfloat, labarray, Number, np.ndarray],
+    ) -> Union[labfloat, labarray, Number, np.ndarray]:
+        if _tracked(a):
+            return a._function(name, b)
+        if _tracked(b):
+            return b._function(name, a, True)
+        if not isinstance(a, _supported) or not isinstance(b, _supported):
+            # NOTE: imported here because labfis.autodiff depends on this module.
+            from labfis import autodiff
+
+            return getattr(autodiff, name)(a, b)
+        (am, au), (bm, bu) = labarray.parts(a), labarray.parts(b)
+        if isinstance(a, labarray) or isinstance(b, labarray):
+            fab = vf(am, bm)
+            da, db = df(am, bm, fab)
+            return labarray._new(fab, np.hypot(da * au, db * bu))
+        if not isinstance(a, labfloat) and not isinstance(b, labfloat):
+            if isinstance(a, Number) and isinstance(b, Number):
+                return f(a, b)
+            return vf(a, b)
+        fab = f(am, bm)
+        da, db = df(am, bm, fab)
+        if isinstance(a, corrfloat) or isinstance(b, corrfloat):
+            return corrfloat._new(
+                fab, corrfloat._combine(corrfloat._map(a), da, corrfloat._map(b), db)
+            )
+        return labfloat._new(fab, math.hypot(da * au, db * bu))
+
+    function.__name__ = name
+    return function
+
+
+sqrt = _unary_function("sqrt")
+exp = _unary_function("exp")
+log = _unary_function("log")
+log10 = _unary_function("log10")
+cos = _unary_function("cos")
+sin = _unary_function("sin")
+tan = _unary_function("tan")
+arcsin = _unary_function("arcsin")
+arccos = _unary_function("arccos")
+arctan = _unary_function("arctan")
+sinh = _unary_function("sinh")
+cosh = _unary_function("cosh")
+tanh = _unary_function("tanh")
+erf = _unary_function("erf")
+
+hypot = _binary_function("hypot")
+hypot.__doc__ = """Euclidean norm sqrt(x**2 + y**2) of labfloats, labarrays or numbers, propagating the errors."""
+arctan2 = _binary_function("arctan2")
+arctan2.__doc__ = """Arc tangent of y/x in the correct quadrant of labfloats, labarrays or numbers, propagating the errors."""
+
+_ufuncs = {
+    np.exp: exp,
+    np.log: log,
+    np.log10: log10,
+    np.sinh: sinh,
+    np.cosh: cosh,
+    np.tanh: tanh,
+    np.hypot: hypot,
+    np.arctan2: arctan2,
+}
+"""dict: numpy ufuncs applied to labfloats and labarrays by the functions of this module."""
@@ -4,10 +4,15 @@ from collections.abc import Iterable
 from typing import Union, Tuple, List
 from math import floor, ceil, trunc, log, cos, sin, tan, asin, acos, atan
 from numbers import Number
-from decimal import Decimal, getcontext, setcontext, Context, ROUND_HALF_UP
+
+import numpy as np
+
+from labfis.rounding import round_pair, context as _context
 
 logger = logging.getLogger(__name__)
 
+_object_new = object.__new__
+
 
 class Infix:
     """definition of an Infix type operator class
@@ -17,6 +22,11 @@ class Infix:
     or:
     x <<infix>> y"""
 
+    __slots__ = ("function",)
+
+    __array_ufunc__ = None
+    """None: Make numpy arrays defer the operators to Infix, instead of applying it to each element."""
+
     def __init__(self, function):
         self.function = function
 
@@ -33,6 +43,10 @@ class Infix:
         return self.rbind(self.function, other)
 
     class rbind:
+        __slots__ = ("function", "binded")
+
+        __array_ufunc__ = None
+
         def __init__(self, function, binded):
             self.function = function
             self.binded = binded
@@ -47,6 +61,10 @@ class Infix:
             return self.function(other, self.binded)
 
     class lbind:
+        __slots__ = ("function", "binded")
+
+        __array_ufunc__ = None
+
         def __init__(self, function, binded):
             self.function = function
             self.binded = binded
@@ -61,6 +79,11 @@ class Infix:
             return self.function(self.binded, other)
 
 
+def _restore(mean: object, uncertainty: object) -> labfloat:
+    """Create a labfloat from a pickle, see labfloat.__reduce_ex__."""
+    return labfloat._new(mean, uncertainty)
+
+
 class LabFloatError(Exception):
     def __init__(self, *args):
         if args:
@@ -113,8 +136,10 @@ class labfloat:
 
     """
 
-    context = Context(rounding=ROUND_HALF_UP)
-    """Context: Set ROUND_HALF_UP for the decimals used in __round__ method."""
+    __slots__ = ("_mean", "_uncertainty")
+
+    context = _context
+    """Context: ROUND_HALF_UP context used in __round__ method for means and errors that are not int or float."""
 
     def __new__(cls, *args, **kwargs) -> Union[object, Iterable]:
         """Create an instance of labfloat or a nested list of labfloat.
@@ -182,6 +207,42 @@ class labfloat:
         self._mean = mean
         self._uncertainty = abs(uncertainty)
 
+    @classmethod
+    def _new(cls, mean: object, uncertainty: object) -> labfloat:
+        """Create a labfloat without parsing the arguments.
+
+        Trusted constructor used by the arithmetic methods, the uncertainty must already
+        be non negative.
+
+        Args:
+            mean (object): labfloat's mean.
+            uncertainty (object): labfloat's non negative error.
+
+        Returns:
+            labfloat: New labfloat object.
+
+        """
+        obj = _object_new(cls)
+        obj._mean = mean
+        obj._uncertainty = uncertainty
+        return obj
+
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        """Pickle labfloat as its mean and error, restored with the trusted constructor.
+
+        Subclasses that store more than the mean and error use the default protocol.
+        """
+        if type(self) is labfloat:
+            return _restore, (self._mean, self._uncertainty)
+        return super().__reduce_ex__(protocol)
+
+    def __copy__(self) -> labfloat:
+        # NOTE: labfloats are immutable, operations always return a new object.
+        return self
+
+    def __deepcopy__(self, memo: dict) -> labfloat:
+        return self
+
     @classmethod
     def list(cls, listargs: Iterable) -> Iterable:
         """Convert nested list of means and errors to nested list of labfloat.
@@ -226,25 +287,7 @@ class labfloat:
             labfloat: New labfloat with the rounded mean and error.
 
         """
-        current_contex = getcontext()
-        setcontext(self.context)
-
-        u = Decimal(str(self._uncertainty))
-        m = Decimal(str(self._mean))
-
-        r = p - u.adjusted() * (not p)
-
-        u = round(u, r)
-
-        r = p - u.adjusted() * (not p)
-
-        u += Decimal("1e{}".format(-r)) * (not u)
-
-        m = round(m, r)
-
-        setcontext(current_contex)
-
-        return labfloat(type(self._mean)(m), type(self._uncertainty)(u))
+        return labfloat._new(*round_pair(self._mean, self._uncertainty, p))
 
     def split(self) -> List[str]:
         """Split the string representation of labfloat.
@@ -258,16 +301,14 @@ class labfloat:
         m, u = self.__round__()
         return ["{:g}".format(m), "{:g}".format(u)]
 
-    def tex(
-        self, precision: Union[Tuple[float], float] = None, round_p: int = 0
-    ) -> str:
+    def tex(self, precision: Union[Tuple[int], int] = None, round_p: int = 0) -> str:
         """Convert labfloat to string representation in LaTex format.
 
         The arguments precision and round_p are used to configure the display precision and round
-        decimal places. The precision is a float in "0.0" format.
+        decimal places. The precision is the number of decimal places in scientific notation.
 
         Args:
-            precision (Union[Tuple[float], float], optional): A tuple containing the mean's and error's precision or only one string for both precisions. If no value are passed the default precision. Defaults to None.
+            precision (Union[Tuple[int], int], optional): A tuple containing the mean's and error's precision or only one for both precisions. If no value are passed the default precision. Defaults to None.
             round_p (int, optional): Number of decimals to use when rounding. Defaults to 0.
 
         Raises:
@@ -277,44 +318,10 @@ class labfloat:
             str: labfloat's strig representation in LaTex format.
 
         """
-        if isinstance(precision, tuple):
-            if len(precision) > 2:
-                raise LabFloatError(4, precision)
-            precision = (float(precision[0]), float(precision[1]))
-        elif precision:
-            precision = (float(precision), float(precision))
-
-        if self._uncertainty == 0:
-            if precision:
-                precision[0] = str(precision[0])
-                m = eval("'{:." + precision[0] + "e}'.format(self._mean)")
-            else:
-                m = self.split()[0]
-            m = m.split("e")
-            if len(m) > 1:
-                m = m[0] + r"\cdot 10^{" + m[1] + "}"
-            else:
-                m = m[0]
-            return "{0}".format(m)
-
-        if precision:
-            m, u = self.__round__(round_p)
-            precision = (str(precision[0]), str(precision[1]))
-            m = eval("'{:." + precision[0] + "e}'.format(m)")
-            u = eval("'{:." + precision[1] + "e}'.format(u)")
-        else:
-            m, u = self.split()
-        m = m.split("e")
-        u = u.split("e")
-        if len(m) > 1:
-            m = m[0] + r"\cdot 10^{" + m[1] + "}"
-        else:
-            m = m[0]
-        if len(u) > 1:
-            u = u[0] + r"\cdot 10^{" + u[1] + "}"
-        else:
-            u = u[0]
-        return r"({0}\, \pm \,{1})".format(m, u)
+        # NOTE: imported here because labfis.latex depends on this module.
+        from labfis.latex import texformatter
+
+        return texformatter(precision, round_p)(self._mean, self._uncertainty)
 
     def __str__(self) -> str:
         """Convert the labfloat to it's string representation.
@@ -372,19 +379,47 @@ class labfloat:
         return self
 
     def __neg__(self) -> labfloat:
-        return labfloat(-self._mean, self._uncertainty)
+        return labfloat._new(-self._mean, self._uncertainty)
 
     def __abs__(self) -> labfloat:
-        return labfloat(abs(self._mean), self._uncertainty)
+        return labfloat._new(abs(self._mean), self._uncertainty)
 
     def __floor__(self) -> labfloat:
-        return labfloat(floor(self._mean), floor(self._uncertainty))
+        return labfloat._new(floor(self._mean), floor(self._uncertainty))
 
     def __ceil__(self) -> labfloat:
-        return labfloat(ceil(self._mean), ceil(self._uncertainty))
+        return labfloat._new(ceil(self._mean), ceil(self._uncertainty))
 
     def __trunc__(self) -> labfloat:
-        return labfloat(trunc(self._mean), trunc(self._uncertainty))
+        return labfloat._new(trunc(self._mean), trunc(self._uncertainty))
+
+    def __array_ufunc__(self, ufunc, method: str, *inputs, **kwargs) -> object:
+        """Apply numpy ufuncs with error propagation, as labarray does.
+
+        A ufunc of labfloats and numbers returns a labfloat, and with numpy arrays returns
+        a labarray, so a labfloat never becomes an element of an object array.
+
+        """
+        # NOTE: imported here because labfis.array depends on this module.
+        from labfis.array import _ufunc
+
+        return _ufunc(ufunc, method, inputs, kwargs)
+
+    def _compare_array(self, other: object, name: str) -> object:
+        """Compare with a labarray or numpy array element-wise, with the same test as the operator.
+
+        Reflecting the operator to the array would swap the test, as a <= b is not
+        b >= a for labfloats, so the labfloat is compared as a 0-d labarray.
+
+        """
+        # NOTE: imported here because labfis.array depends on this module.
+        from labfis.array import labarray
+
+        if isinstance(other, np.ndarray):
+            other = labarray(other)
+        if isinstance(other, labarray):
+            return getattr(labarray(self._mean, self._uncertainty), name)(other)
+        return NotImplemented
 
     def __eq__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
@@ -394,7 +429,7 @@ class labfloat:
         if isinstance(other, Number):
             return abs(self._mean - other) < 2 * self._uncertainty
 
-        return None
+        return self._compare_array(other, "__eq__")
 
     def __ne__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
@@ -404,7 +439,7 @@ class labfloat:
         if isinstance(other, Number):
             return abs(self._mean - other) > 3 * self._uncertainty
 
-        return None
+        return self._compare_array(other, "__ne__")
 
     def __lt__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
@@ -412,7 +447,7 @@ class labfloat:
         if isinstance(other, Number):
             return self._mean + self._uncertainty < other
 
-        return None
+        return self._compare_array(other, "__lt__")
 
     def __gt__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
@@ -420,7 +455,7 @@ class labfloat:
         if isinstance(other, Number):
             return self._mean - self._uncertainty > other
 
-        return None
+        return self._compare_array(other, "__gt__")
 
     def __le__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
@@ -428,7 +463,7 @@ class labfloat:
         if isinstance(other, Number):
             return self._mean + self._uncertainty <= other
 
-        return None
+        return self._compare_array(other, "__le__")
 
     def __ge__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
@@ -436,18 +471,18 @@ class labfloat:
         if isinstance(other, Number):
             return self._mean - self._uncertainty >= other
 
-        return None
+        return self._compare_array(other, "__ge__")
 
     def __add__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
-            return labfloat(
+            return labfloat._new(
                 self._mean + other.mean,
                 (self._uncertainty ** 2 + other.uncertainty ** 2) ** 0.5,
             )
         if isinstance(other, Number):
-            return labfloat(self._mean + other, self._uncertainty)
+            return labfloat._new(self._mean + other, self._uncertainty)
 
-        return None
+        return NotImplemented
 
     def __radd__(self, other: Union[labfloat, Number]) -> labfloat:
         return self.__add__(other)
@@ -457,32 +492,32 @@ class labfloat:
 
     def __sub__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
-            return labfloat(
+            return labfloat._new(
                 self._mean - other.mean,
                 (self._uncertainty ** 2 + other.uncertainty ** 2) ** 0.5,
             )
         if isinstance(other, Number):
-            return labfloat(self._mean - other, self._uncertainty)
+            return labfloat._new(self._mean - other, self._uncertainty)
 
-        return None
+        return NotImplemented
 
     def __rsub__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
-            return labfloat(
+            return labfloat._new(
                 other.mean - self._mean,
                 (other.uncertainty ** 2 + self._uncertainty ** 2) ** 0.5,
             )
         if isinstance(other, Number):
-            return labfloat(other - self._mean, self._uncertainty)
+            return labfloat._new(other - self._mean, self._uncertainty)
 
-        return None
+        return NotImplemented
 
     def __isub__(self, other: Union[labfloat, Number]) -> labfloat:
         return self.__sub__(other)
 
     def __mul__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
-            return labfloat(
+            return labfloat._new(
                 self._mean * other.mean,
                 (
                     (other.mean * self._uncertainty) ** 2
@@ -491,9 +526,9 @@ class labfloat:
                 ** 0.5,
             )
         if isinstance(other, Number):
-            return labfloat(self._mean * other, abs(other * self._uncertainty))
+            return labfloat._new(self._mean * other, abs(other * self._uncertainty))
 
-        return None
+        return NotImplemented
 
     def __rmul__(self, other: Union[labfloat, Number]) -> labfloat:
         return self.__mul__(other)
@@ -503,7 +538,7 @@ class labfloat:
 
     def __div__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
-            return labfloat(
+            return labfloat._new(
                 self._mean / other.mean,
                 (
                     (self._uncertainty / other.mean) ** 2
@@ -512,9 +547,9 @@ class labfloat:
                 ** 0.5,
             )
         if isinstance(other, Number):
-            return labfloat(self._mean / other, abs(self._uncertainty / other))
+            return labfloat._new(self._mean / other, abs(self._uncertainty / other))
 
-        return None
+        return NotImplemented
 
     def __truediv__(self, other: Union[labfloat, Number]) -> labfloat:
         return self.__div__(other)
@@ -527,7 +562,7 @@ class labfloat:
 
     def __rdiv__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
-            return labfloat(
+            return labfloat._new(
                 other.mean / self._mean,
                 (
                     (other.uncertainty / self._mean) ** 2
@@ -536,18 +571,18 @@ class labfloat:
                 ** 0.5,
             )
         if isinstance(other, Number):
-            return labfloat(
+            return labfloat._new(
                 other / self._mean, abs(other * self._uncertainty / self._mean ** 2)
             )
 
-        return None
+        return NotImplemented
 
     def __rtruediv__(self, other: Union[labfloat, Number]) -> labfloat:
         return self.__rdiv__(other)
 
     def __pow__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
-            return labfloat(
+            return labfloat._new(
                 self._mean ** other.mean,
                 (
                     (other.mean * self._mean ** (other.mean - 1) * self._uncertainty)
@@ -562,16 +597,16 @@ class labfloat:
                 ** 0.5,
             )
         if isinstance(other, Number):
-            return labfloat(
+            return labfloat._new(
                 self._mean ** other,
                 abs(other * self._mean ** (other - 1) * self._uncertainty),
             )
 
-        return None
+        return NotImplemented
 
     def __rpow__(self, other: Union[labfloat, Number]) -> labfloat:
         if isinstance(other, labfloat):
-            return labfloat(
+            return labfloat._new(
                 other.mean ** self._mean,
                 (
                     (self._mean * other.mean ** (self._mean - 1) * other.uncertainty)
@@ -586,12 +621,12 @@ class labfloat:
                 ** 0.5,
             )
         if isinstance(other, Number):
-            return labfloat(
+            return labfloat._new(
                 other ** self._mean,
                 abs(other ** self._mean * log(abs(other)) * self._uncertainty),
             )
 
-        return None
+        return NotImplemented
 
     def __ipow__(self, other: Union[labfloat, Number]) -> labfloat:
         return self.__pow__(other)
@@ -600,26 +635,32 @@ class labfloat:
         return self.__pow__(0.5)
 
     def cos(self) -> labfloat:
-        return labfloat(cos(self._mean), abs(-(sin(self._mean)) * self._uncertainty))
+        return labfloat._new(
+            cos(self._mean), abs(-(sin(self._mean)) * self._uncertainty)
+        )
 
     def sin(self) -> labfloat:
-        return labfloat(sin(self._mean), abs(cos(self._mean) * self._uncertainty))
+        return labfloat._new(sin(self._mean), abs(cos(self._mean) * self._uncertainty))
 
     def tan(self) -> labfloat:
-        return labfloat(
+        return labfloat._new(
             tan(self._mean), ((cos(self._mean) ** -4) * self._uncertainty ** 2) ** 0.5
         )
 
     def arcsin(self) -> labfloat:
-        return labfloat(asin(self._mean), self._uncertainty / (1 - self._mean ** 2))
+        return labfloat._new(
+            asin(self._mean), self._uncertainty / (1 - self._mean ** 2) ** 0.5
+        )
 
     def arccos(self) -> labfloat:
-        return labfloat(
-            acos(self._mean), abs(-self._uncertainty / (1 - self._mean ** 2)) ** 0.5
+        return labfloat._new(
+            acos(self._mean), self._uncertainty / (1 - self._mean ** 2) ** 0.5
         )
 
     def arctan(self) -> labfloat:
-        return labfloat(atan(self._mean), self._uncertainty / (1 + self._mean ** 2))
+        return labfloat._new(
+            atan(self._mean), self._uncertainty / (1 + self._mean ** 2)
+        )
 
     def __int__(self) -> int:
         return int(self._mean)
@@ -62,7 +62,7 @@ classifiers = [
     "Programming Language :: Python :: 3.8",
 ]
 
-# requirements = ['numpy']
+requirements = ["numpy"]
 
 python_ver = ">=3.7"
 
@@ -79,6 +79,6 @@ setup(
     long_description_content_type="text/markdown",
     packages=find_packages(),
     classifiers=classifiers,
-    #    install_requires=requirements,
+    install_requires=requirements,
     python_requires=python_ver,
 )